@@ -2,8 +2,12 @@
 이미지 생성 API 엔드포인트
 화면 2: 이미지 생성 (메인 화면)
 """
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import json
+import time
 import uuid
 import logging
 from pathlib import Path
@@ -11,11 +15,24 @@ from pathlib import Path
 from models.generation import (
     ImageGenerationRequest,
     ImageGenerationResponse,
-    GeneratedImage
+    GeneratedImage,
+    ImagePreview,
+    FailedImageSlot
 )
 from services.session_manager import session_manager
 from services.prompt_engine import prompt_engine
-from services.image_generator_google_ai import image_generator  # Google AI Studio Nano Banana
+from services.provider_router import provider_router  # 설정된 공급자 간 자동 전환
+from services.job_queue import generation_queue, QueueFullError
+from services.image_store import image_store
+from services.result_cache import result_cache
+from services.single_flight import generation_flight
+from services.image_generator_base import build_image_result
+from services.image_processing import (
+    OUTPUT_FORMATS,
+    MEDIA_TYPES,
+    image_processor,
+    is_format_supported
+)
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -24,7 +41,7 @@ router = APIRouter(prefix="/api", tags=["generate"])
 
 
 @router.post("/generate", response_model=ImageGenerationResponse)
-async def generate_images(request: ImageGenerationRequest):
+async def generate_images(request: ImageGenerationRequest, background_tasks: BackgroundTasks):
     """
     이미지 4개 생성 (핵심 API)
     
@@ -34,13 +51,490 @@ async def generate_images(request: ImageGenerationRequest):
     Returns:
         생성된 이미지 4개의 URL 및 메타데이터
     """
+    # 1~3. 세션 검증, API 토큰 검증, 프롬프트 생성
+    positive_prompt, negative_prompt, width, height = await _prepare_prompts(request)
+    
+    # 4~6. 이미지 생성, 히스토리 저장, 응답 생성
+    generation_id = str(uuid.uuid4())
+    response = await _run_generation(
+        request, generation_id, positive_prompt, negative_prompt, width, height
+    )
+    
+    # 실패한 슬롯은 응답 후 백그라운드에서 재생성
+    if response.failed_slots and request.backfill_failed:
+        background_tasks.add_task(
+            _backfill_failed_slots,
+            generation_id=generation_id,
+            failed_slots=[slot.model_dump(exclude={"backfill_pending"}) for slot in response.failed_slots],
+            positive_prompt=positive_prompt,
+            negative_prompt=negative_prompt,
+            width=width,
+            height=height,
+            output_format=request.output_format,
+            quality=request.quality
+        )
+    
+    return response
+
+
+@router.post("/generate/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_generation_job(request: ImageGenerationRequest):
+    """
+    이미지 생성 작업 등록 (비동기 작업 모드)
+    
+    요청을 검증하고 프롬프트를 만든 뒤 즉시 generation_id를 반환합니다.
+    실제 생성은 작업 큐의 워커가 처리하며, 클라이언트는
+    GET /api/generation/{generation_id}로 상태(queued/running/completed/failed)와 결과를 조회합니다.
+    """
+    positive_prompt, negative_prompt, width, height = await _prepare_prompts(request)
+    generation_id = str(uuid.uuid4())
+    
+    await session_manager.save_generation(
+        generation_id=generation_id,
+        session_id=request.session_id,
+        metadata={"request": request.model_dump()},
+        status="queued"
+    )
+    
+    async def job():
+        await session_manager.update_generation(generation_id, {"status": "running"})
+        try:
+            # 결과는 히스토리에 저장되므로 이미지는 URL로 (base64는 저장소 한도를 금방 채움)
+            response = await _run_generation(
+                request, generation_id, positive_prompt, negative_prompt, width, height,
+                response_mode="url", status="running"
+            )
+        except Exception as e:
+            error = e.detail if isinstance(e, HTTPException) else "이미지 생성 중 오류가 발생했습니다."
+            await session_manager.update_generation(generation_id, {"status": "failed", "error": error})
+            raise
+        
+        await session_manager.update_generation(generation_id, {
+            "status": "completed",
+            "result": _history_result(response)
+        })
+        
+        if response.failed_slots and request.backfill_failed:
+            await _backfill_failed_slots(
+                generation_id=generation_id,
+                failed_slots=[slot.model_dump(exclude={"backfill_pending"}) for slot in response.failed_slots],
+                positive_prompt=positive_prompt,
+                negative_prompt=negative_prompt,
+                width=width,
+                height=height,
+                output_format=request.output_format,
+                quality=request.quality
+            )
+    
+    try:
+        queue_position = generation_queue.submit(generation_id, job)
+    except QueueFullError as e:
+        await session_manager.update_generation(generation_id, {"status": "failed", "error": str(e)})
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "10"}
+        )
+    
+    logger.info(f"📥 생성 작업 등록: {generation_id} (대기열 {queue_position}번째)")
+    
+    return {
+        "generation_id": generation_id,
+        "session_id": request.session_id,
+        "status": "queued",
+        "queue_position": queue_position,
+        "poll_url": f"/api/generation/{generation_id}"
+    }
+
+
+@router.post("/generate/stream")
+async def generate_images_stream(request: ImageGenerationRequest):
+    """
+    이미지 4개 생성 (스트리밍)
+    
+    /api/generate와 같은 요청을 받아 NDJSON(한 줄에 JSON 하나)으로 응답합니다.
+    프롬프트 정보를 먼저 보내고, 각 이미지는 완성되는 즉시 전송합니다.
+    
+    이벤트:
+        {"event": "prompt", ...}  프롬프트/크기 정보
+        {"event": "preview", "preview": {...}}  미리보기 썸네일 (include_previews=true, 원본보다 먼저)
+        {"event": "image", "image": {...}}  완성된 이미지
+        {"event": "failed", "slot": {...}}  실패한 이미지 슬롯 (생성/변환 실패)
+        {"event": "done", "status": ..., "metadata": {...}}  전체 완료 (오류가 나도 항상 마지막에 전송)
+    
+    이미지는 완성되는 즉시 보내므로 allow_partial=false면 실패한 슬롯이 있을 때
+    done 이벤트의 status가 failed이고 히스토리에 저장하지 않습니다.
+    use_cache, backfill_failed는 지원하지 않습니다 (422).
+    """
+    # 스트림 시작 전에 검증/프롬프트 오류는 일반 HTTP 오류로 응답
+    unsupported = [name for name in ("use_cache", "backfill_failed") if getattr(request, name)]
+    if unsupported:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"스트리밍 생성은 {', '.join(unsupported)} 옵션을 지원하지 않습니다. /api/generate를 사용해주세요."
+        )
+    
+    positive_prompt, negative_prompt, width, height = await _prepare_prompts(request)
+    generation_id = str(uuid.uuid4())
+    
+    response_mode = "url" if request.include_previews else request.response_mode
+    
+    async def event_stream():
+        start_time = time.time()
+        seeds = provider_router.new_seeds()
+        failed_slots = []
+        num_images = 0
+        error: Optional[str] = None
+        
+        yield _ndjson({
+            "event": "prompt",
+            "generation_id": generation_id,
+            "session_id": request.session_id,
+            "prompts": {
+                "positive": positive_prompt,
+                "negative": negative_prompt
+            },
+            "metadata": {
+                "width": width,
+                "height": height
+            }
+        })
+        
+        try:
+            async for index, seed, image, failed in provider_router.iter_image_slots(
+                positive_prompt=positive_prompt,
+                negative_prompt=negative_prompt,
+                width=width,
+                height=height,
+                generation_id=generation_id,
+                seeds=seeds
+            ):
+                if image:
+                    # 후처리(썸네일/형식 변환)가 실패하면 해당 슬롯만 실패로 전송
+                    try:
+                        preview = (await _make_previews([image]))[0] if request.include_previews else None
+                        image = (await _convert_images([image], request.output_format, request.quality))[0]
+                    except Exception as e:
+                        logger.error(f"❌ 이미지 {index+1} 후처리 실패: {str(e)}")
+                        failed = provider_router.failed_slot_info(index, seed, e)
+                    else:
+                        num_images += 1
+                        # 미리보기를 먼저 보내고 원본은 URL만 전송
+                        if preview is not None:
+                            yield _ndjson({"event": "preview", "preview": _to_image_preview(preview).model_dump()})
+                        yield _ndjson({"event": "image", "image": _to_generated_image(image, response_mode).model_dump()})
+                        continue
+                failed_slots.append(failed)
+                yield _ndjson({"event": "failed", "slot": FailedImageSlot(**failed).model_dump()})
+        except Exception as e:
+            logger.error(f"❌ 스트리밍 이미지 생성 실패: {str(e)}")
+            error = str(e)[:300] if settings.DEBUG else "이미지 생성 중 오류가 발생했습니다."
+        
+        elapsed_time = time.time() - start_time
+        logger.info(f"✅ 스트리밍 이미지 생성 완료: {num_images}개, {elapsed_time:.2f}초")
+        
+        if error is None and num_images == 0:
+            error = "이미지 생성에 실패했습니다. 잠시 후 다시 시도해주세요."
+        elif error is None and failed_slots and not request.allow_partial:
+            error = failed_slots[0]["error"]
+        
+        # /api/generate와 같이 실패한 생성은 히스토리에 저장하지 않음
+        if error is None:
+            try:
+                await _save_generation(
+                    request, generation_id, positive_prompt, negative_prompt,
+                    width, height, seeds, elapsed_time, failed_slots
+                )
+            except Exception as e:
+                logger.error(f"❌ 생성 히스토리 저장 실패: {str(e)}")
+        
+        done = {
+            "event": "done",
+            "generation_id": generation_id,
+            "status": "failed" if error else "completed",
+            "metadata": {
+                "width": width,
+                "height": height,
+                "num_images": num_images,
+                "num_failed": len(failed_slots),
+                "generation_time": round(elapsed_time, 2),
+                "location": request.location,
+                "persona": request.persona,
+                "layout": request.layout
+            }
+        }
+        if error:
+            done["error"] = error
+        yield _ndjson(done)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _run_generation(
+    request: ImageGenerationRequest,
+    generation_id: str,
+    positive_prompt: str,
+    negative_prompt: str,
+    width: int,
+    height: int,
+    response_mode: Optional[str] = None,
+    status: Optional[str] = None
+) -> ImageGenerationResponse:
+    """
+    이미지 생성, 히스토리 저장 후 응답 모델 반환
+    
+    Args:
+        response_mode: 이미지 응답 형식 (None이면 요청의 response_mode, 미리보기 요청 시 url)
+        status: 히스토리에 함께 저장할 작업 상태 (작업 모드, 다시 저장해도 상태가 사라지지 않도록)
+    
+    Raises:
+        HTTPException: 이미지를 하나도 생성하지 못한 경우 (또는 allow_partial=false에서 일부 실패)
+    """
+    # 4. 이미지 생성 (use_cache면 결과 캐시를 먼저 조회)
+    # 프롬프트/크기가 같은 동시 요청은 하나의 생성 작업을 공유
+    async def generate():
+        if request.use_cache:
+            return await _generate_with_cache(
+                generation_id, positive_prompt, negative_prompt, width, height
+            )
+        images, failed, seeds, elapsed = await provider_router.generate_image_slots(
+            positive_prompt=positive_prompt,
+            negative_prompt=negative_prompt,
+            width=width,
+            height=height,
+            generation_id=generation_id
+        )
+        return images, failed, seeds, elapsed, 0
+    
+    flight_key = (
+        provider_router.provider_name, provider_router.model,
+        positive_prompt, negative_prompt, width, height, request.use_cache
+    )
+    try:
+        images_data, failed_slots, seeds, elapsed_time, cache_hits = \
+            await generation_flight.run(flight_key, generate)
+        
+        # 다른 요청이 시작한 작업을 공유한 경우 이미지 ID를 이 요청 기준으로 변경
+        images_data = [
+            {**img, "image_id": f"{generation_id}_{img['index']}"} for img in images_data
+        ]
+        
+        # 생성/캐시/공유는 PNG 원본 기준, 요청 형식 변환과 썸네일 생성은 마지막에 수행
+        convert = _convert_images(images_data, request.output_format, request.quality)
+        if request.include_previews:
+            previews_data, images_data = await asyncio.gather(_make_previews(images_data), convert)
+        else:
+            previews_data, images_data = [], await convert
+        
+        if not images_data:
+            logger.error(f"❌ 이미지 생성 실패: images_data가 비어있습니다. seeds={seeds}")
+            raise Exception(
+                "이미지 생성에 실패했습니다. "
+                "이미지 생성 API가 응답하지 않았거나 할당량을 초과했을 수 있습니다. "
+                "잠시 후 다시 시도해주세요."
+            )
+        
+        if failed_slots and not request.allow_partial:
+            raise Exception(failed_slots[0]["error"])
+        
+        logger.info(f"✅ 이미지 생성 완료: {len(images_data)}개, {elapsed_time:.2f}초")
+    
+    except Exception as e:
+        import traceback
+        error_traceback = traceback.format_exc()
+        logger.error(f"❌ 이미지 생성 실패: {str(e)}")
+        logger.error(f"   상세 에러:\n{error_traceback}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"이미지 생성 중 오류가 발생했습니다: {str(e)}" if settings.DEBUG else "이미지 생성 중 오류가 발생했습니다."
+        )
+    
+    # 5. 생성 히스토리 저장
+    await _save_generation(
+        request, generation_id, positive_prompt, negative_prompt,
+        width, height, seeds, elapsed_time, failed_slots, status=status
+    )
+    
+    # 실패한 슬롯 재생성 예정 표시 (재생성은 호출 측에서 예약)
+    backfill_pending = bool(failed_slots and request.backfill_failed)
+    if backfill_pending:
+        await session_manager.update_generation(generation_id, {
+            "backfill": {"status": "pending", "images": [], "failed_slots": []}
+        })
+    
+    # 6. 응답 생성 (미리보기를 요청하면 원본은 URL만 포함하여 필요할 때 다운로드)
+    if response_mode is None:
+        response_mode = "url" if request.include_previews else request.response_mode
+    generated_images = [_to_generated_image(img, response_mode) for img in images_data]
+    
+    return ImageGenerationResponse(
+        generation_id=generation_id,
+        session_id=request.session_id,
+        previews=[_to_image_preview(preview) for preview in previews_data],
+        images=generated_images,
+        failed_slots=[
+            FailedImageSlot(**slot, backfill_pending=backfill_pending)
+            for slot in failed_slots
+        ],
+        prompts={
+            "positive": positive_prompt,
+            "negative": negative_prompt
+        },
+        metadata={
+            "width": width,
+            "height": height,
+            "num_images": len(generated_images),
+            "num_failed": len(failed_slots),
+            "cache_hits": cache_hits,
+            "generation_time": round(elapsed_time, 2),
+            "location": request.location,
+            "persona": request.persona,
+            "layout": request.layout
+        }
+    )
+
+
+async def _generate_with_cache(
+    generation_id: str,
+    positive_prompt: str,
+    negative_prompt: str,
+    width: int,
+    height: int
+) -> Tuple[List[Dict], List[Dict], List[int], float, int]:
+    """
+    결과 캐시를 조회하고 캐시에 없는 슬롯만 생성
+    시드는 입력에서 결정되므로 같은 요청은 같은 캐시 키를 사용
+    
+    Returns:
+        (성공한 이미지 리스트, 실패한 슬롯 리스트, 사용된 seed 리스트, 소요 시간, 캐시 적중 수)
+    """
+    start_time = time.time()
+    provider, model = provider_router.provider_name, provider_router.model
+    seeds = result_cache.seeds_for(
+        provider, model, positive_prompt, negative_prompt, width, height,
+        settings.DEFAULT_NUM_IMAGES
+    )
+    keys = [
+        result_cache.make_key(provider, model, positive_prompt, negative_prompt, width, height, seed)
+        for seed in seeds
+    ]
+    
+    images_by_index: Dict[int, Dict] = {}
+    for index, key in enumerate(keys):
+        cached = result_cache.get(key)
+        if cached is None:
+            continue
+        # 저장소에서 파일이 삭제된 경우 다시 생성
+        if image_store.get_path(cached["filename"]) is None:
+            result_cache.invalidate(key)
+            continue
+        images_by_index[index] = {**cached, "image_id": f"{generation_id}_{index}"}
+    
+    cache_hits = len(images_by_index)
+    missing = [index for index in range(len(seeds)) if index not in images_by_index]
+    failed_slots: List[Dict] = []
+    
+    if missing:
+        new_images, failed_slots, _, _ = await provider_router.generate_image_slots(
+            positive_prompt=positive_prompt,
+            negative_prompt=negative_prompt,
+            width=width,
+            height=height,
+            generation_id=generation_id,
+            seeds=[seeds[index] for index in missing],
+            indexes=missing
+        )
+        for image in new_images:
+            images_by_index[image["index"]] = image
+            result_cache.set(keys[image["index"]], image)
+    
+    if cache_hits:
+        logger.info(f"♻️ 결과 캐시 적중: {cache_hits}/{len(seeds)}개")
+    
+    images = [images_by_index[index] for index in sorted(images_by_index)]
+    return images, failed_slots, seeds, time.time() - start_time, cache_hits
+
+
+async def _convert_images(images: List[Dict], output_format: str, quality: str) -> List[Dict]:
+    """
+    저장소의 PNG 원본을 요청한 형식으로 변환하여 저장 (png면 그대로 반환)
+    인코딩은 이미지 후처리 프로세스 풀에서 병렬 실행
+    
+    Returns:
+        변환된 이미지 결과 리스트 (index, seed, image_id는 유지)
+    """
+    if output_format == "png" or not images:
+        return images
+    
+    extension = OUTPUT_FORMATS[output_format]["extension"]
+    
+    async def convert(image: Dict) -> Dict:
+        master_path = image_store.get_path(image["filename"])
+        if master_path is None:
+            raise Exception(f"원본 이미지를 찾을 수 없습니다: {image['filename']}")
+        data = await image_processor.convert_file(str(master_path), output_format, quality)
+        generation_id = image["image_id"].rsplit("_", 1)[0]
+        converted = await asyncio.to_thread(
+            build_image_result, data, generation_id, image["index"], image["seed"], None, extension
+        )
+        logger.info(
+            f"🖼️ 이미지 {image['index']} {output_format} 변환: "
+            f"{image['size']} -> {converted['size']} bytes ({quality})"
+        )
+        return converted
+    
+    return list(await asyncio.gather(*(convert(image) for image in images)))
+
+
+async def _make_previews(images: List[Dict]) -> List[Dict]:
+    """
+    저장소의 PNG 원본으로 미리보기 썸네일 생성 (PREVIEW_MAX_SIZE, PREVIEW_FORMAT)
+    
+    Returns:
+        썸네일 결과 리스트 (image_id는 원본 이미지와 같음)
+    """
+    extension = OUTPUT_FORMATS[settings.PREVIEW_FORMAT]["extension"]
+    
+    async def make(image: Dict) -> Dict:
+        master_path = image_store.get_path(image["filename"])
+        if master_path is None:
+            raise Exception(f"원본 이미지를 찾을 수 없습니다: {image['filename']}")
+        data = await image_processor.thumbnail_file(
+            str(master_path), settings.PREVIEW_MAX_SIZE, settings.PREVIEW_FORMAT
+        )
+        generation_id = image["image_id"].rsplit("_", 1)[0]
+        return await asyncio.to_thread(
+            build_image_result, data, generation_id, image["index"], image["seed"], None, extension
+        )
+    
+    return list(await asyncio.gather(*(make(image) for image in images)))
+
+
+async def _prepare_prompts(request: ImageGenerationRequest) -> Tuple[str, str, int, int]:
+    """
+    세션 검증, API 토큰 검증 후 최종 프롬프트 생성
+    
+    Returns:
+        (positive_prompt, negative_prompt, width, height)
+    """
     logger.info(f"🎨 이미지 생성 요청 시작")
     logger.info(f"   session_id: {request.session_id}")
     logger.info(f"   location: {request.location}")
     logger.info(f"   persona: {request.persona}")
     
+    # 출력 형식 지원 여부 확인 (AVIF는 Pillow 빌드에 따라 없을 수 있음)
+    if not is_format_supported(request.output_format):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"지원하지 않는 이미지 형식입니다: {request.output_format}"
+        )
+    
     # 1. 세션 검증 및 프리셋 조회
-    preset = session_manager.get_preset(request.session_id)
+    preset = await session_manager.get_preset(request.session_id)
     
     # 프리셋 정보 로깅 (인종 다양성 확인용)
     if preset:
@@ -54,9 +548,10 @@ async def generate_images(request: ImageGenerationRequest):
             detail="세션을 찾을 수 없습니다. 프리셋을 다시 생성해주세요."
         )
     
-    # 2. API 토큰 검증
-    if not image_generator.validate_api_token():
-        logger.error("❌ Google AI API 키가 설정되지 않았습니다!")
+    # 2. API 토큰 검증 (사용 가능한 공급자가 하나 이상 있어야 함)
+    if not provider_router.validate_api_token():
+        logger.error("❌ 이미지 생성 API 키가 설정되지 않았습니다!")
+        logger.error(f"   IMAGE_PROVIDERS: {settings.IMAGE_PROVIDERS}")
         logger.error(f"   GOOGLE_AI_API_KEY: {'설정됨' if settings.GOOGLE_AI_API_KEY else '미설정'}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -79,39 +574,22 @@ async def generate_images(request: ImageGenerationRequest):
             detail=f"프롬프트 생성 중 오류가 발생했습니다: {str(e)}"
         )
     
-    # 4. 이미지 생성
-    generation_id = str(uuid.uuid4())
-    
-    try:
-        images_data, seeds, elapsed_time = await image_generator.generate_images(
-            positive_prompt=positive_prompt,
-            negative_prompt=negative_prompt,
-            width=width,
-            height=height,
-            generation_id=generation_id
-        )
-        
-        if not images_data:
-            logger.error(f"❌ 이미지 생성 실패: images_data가 비어있습니다. seeds={seeds}")
-            raise Exception(
-                "이미지 생성에 실패했습니다. "
-                "Google AI Studio API가 응답하지 않았거나 할당량을 초과했을 수 있습니다. "
-                "잠시 후 다시 시도해주세요."
-            )
-        
-        logger.info(f"✅ 이미지 생성 완료: {len(images_data)}개, {elapsed_time:.2f}초")
-    
-    except Exception as e:
-        import traceback
-        error_traceback = traceback.format_exc()
-        logger.error(f"❌ 이미지 생성 실패: {str(e)}")
-        logger.error(f"   상세 에러:\n{error_traceback}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"이미지 생성 중 오류가 발생했습니다: {str(e)}" if settings.DEBUG else "이미지 생성 중 오류가 발생했습니다."
-        )
-    
-    # 5. 생성 히스토리 저장
+    return positive_prompt, negative_prompt, width, height
+
+
+async def _save_generation(
+    request: ImageGenerationRequest,
+    generation_id: str,
+    positive_prompt: str,
+    negative_prompt: str,
+    width: int,
+    height: int,
+    seeds: List[int],
+    elapsed_time: float,
+    failed_slots: List[Dict],
+    status: Optional[str] = None
+):
+    """생성 히스토리 저장 (status는 작업 모드의 진행 상태)"""
     metadata = {
         "positive_prompt": positive_prompt,
         "negative_prompt": negative_prompt,
@@ -121,48 +599,123 @@ async def generate_images(request: ImageGenerationRequest):
         "guidance_scale": settings.DEFAULT_GUIDANCE_SCALE,
         "seeds": seeds,
         "generation_time": elapsed_time,
+        "failed_slots": failed_slots,
         "request": request.model_dump()
     }
     
-    session_manager.save_generation(
+    await session_manager.save_generation(
         generation_id=generation_id,
         session_id=request.session_id,
-        metadata=metadata
+        metadata=metadata,
+        status=status
     )
+
+
+def _to_generated_image(img: Dict, response_mode: str = "base64") -> GeneratedImage:
+    """
+    생성기 결과를 응답 모델로 변환
     
-    # 6. 응답 생성
-    generated_images = [
-        GeneratedImage(
+    response_mode가 url이면 base64 대신 다운로드 URL/ETag/크기만 담아
+    수 MB 문자열의 검증/직렬화/전송 비용을 없앰
+    """
+    if response_mode == "url":
+        return GeneratedImage(
             image_id=img["image_id"],
             filename=img["filename"],
-            base64=img["base64"],
+            url=f"/api/images/{img['filename']}",
+            etag=f'"{img["digest"]}"',
+            size=img["size"],
+            content_type=_media_type(img["filename"]),
             seed=img["seed"]
         )
-        for img in images_data
-    ]
     
-    return ImageGenerationResponse(
-        generation_id=generation_id,
-        session_id=request.session_id,
-        images=generated_images,
-        prompts={
-            "positive": positive_prompt,
-            "negative": negative_prompt
-        },
-        metadata={
-            "width": width,
-            "height": height,
-            "num_images": len(generated_images),
-            "generation_time": round(elapsed_time, 2),
-            "location": request.location,
-            "persona": request.persona,
-            "layout": request.layout
-        }
+    return GeneratedImage(
+        image_id=img["image_id"],
+        filename=img["filename"],
+        base64=img["base64"],
+        content_type=_media_type(img["filename"]),
+        seed=img["seed"]
     )
 
 
+def _history_result(response: ImageGenerationResponse) -> Dict:
+    """
+    생성 히스토리 저장용 결과 (작업 모드)
+    이미지는 URL/ETag/크기만, 미리보기도 base64 없이 URL만 저장
+    (base64는 항목당 수 MB라 메모리/SQLite/Redis 저장소와 바이트 한도를 금방 채움)
+    """
+    result = response.model_dump(exclude_none=True)
+    for preview in result["previews"]:
+        preview.pop("base64", None)
+    return result
+
+
+def _to_image_preview(preview: Dict) -> ImagePreview:
+    """썸네일 결과를 응답 모델로 변환"""
+    return ImagePreview(
+        image_id=preview["image_id"],
+        filename=preview["filename"],
+        base64=preview["base64"],
+        url=f"/api/images/{preview['filename']}",
+        content_type=_media_type(preview["filename"]),
+        size=preview["size"]
+    )
+
+
+def _media_type(filename: str) -> str:
+    """파일 확장자 -> media type"""
+    return MEDIA_TYPES.get(filename.rsplit(".", 1)[-1], "application/octet-stream")
+
+
+def _ndjson(event: Dict) -> str:
+    """NDJSON 한 줄 직렬화"""
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+
+async def _backfill_failed_slots(
+    generation_id: str,
+    failed_slots: List[Dict],
+    positive_prompt: str,
+    negative_prompt: str,
+    width: int,
+    height: int,
+    output_format: str = "png",
+    quality: str = "standard"
+):
+    """
+    실패한 이미지 슬롯을 백그라운드에서 재생성하고 생성 히스토리에 저장
+    (결과는 /api/generation/{generation_id}의 backfill 필드로 조회)
+    """
+    logger.info(f"🔁 실패 이미지 백그라운드 재생성 시작: {generation_id} ({len(failed_slots)}개)")
+    
+    images = []
+    still_failed = []
+    for slot in failed_slots:
+        try:
+            image = await provider_router.generate_admitted_image(
+                positive_prompt=positive_prompt,
+                negative_prompt=negative_prompt,
+                width=width,
+                height=height,
+                seed=slot["seed"],
+                generation_id=generation_id,
+                index=slot["index"]
+            )
+            image = (await _convert_images([image], output_format, quality))[0]
+            # 히스토리에는 이미지 저장소 URL/ETag만 저장
+            images.append(_to_generated_image(image, "url").model_dump(exclude_none=True))
+        except Exception as e:
+            logger.error(f"❌ 이미지 {slot['index']+1} 재생성 실패: {str(e)}")
+            still_failed.append(provider_router.failed_slot_info(slot["index"], slot["seed"], e))
+    
+    await session_manager.update_generation(generation_id, {
+        "backfill": {"status": "completed", "images": images, "failed_slots": still_failed}
+    })
+    logger.info(f"✅ 백그라운드 재생성 완료: {generation_id} (성공 {len(images)}개, 실패 {len(still_failed)}개)")
+
+
 @router.get("/images/{filename}")
-async def get_image(filename: str):
+async def get_image(filename: str, if_none_match: Optional[str] = Header(default=None)):
     """
     생성된 이미지 다운로드
     
@@ -176,7 +729,7 @@ async def get_image(filename: str):
     # 파일명만 추출 (경로 문자 제거)
     safe_filename = Path(filename).name
     
-    # 파일명 검증: UUID 형식 (예: generation_id_0.png)만 허용
+    # 파일명 검증: 내용 해시 형식 (예: <sha256>.png, <sha256>.webp)만 허용
     # 허용된 문자: 영문자, 숫자, 언더스코어, 하이픈, 점
     if not all(c.isalnum() or c in ('_', '-', '.') for c in safe_filename):
         raise HTTPException(
@@ -184,19 +737,27 @@ async def get_image(filename: str):
             detail="Invalid filename"
         )
     
-    # .png 확장자만 허용
-    if not safe_filename.endswith('.png'):
+    # 이미지 확장자만 허용 (png, webp, jpg, avif)
+    extension = safe_filename.rsplit('.', 1)[-1]
+    if '.' not in safe_filename or extension not in MEDIA_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only PNG files are allowed"
+            detail="Only image files (png, webp, jpg, avif) are allowed"
         )
     
-    filepath = settings.GENERATED_IMAGES_DIR / safe_filename
+    # 내용 해시 저장소에서 조회 (파일명 형식: <sha256>.<확장자>)
+    filepath = image_store.get_path(safe_filename)
+    
+    if filepath is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="이미지를 찾을 수 없습니다."
+        )
     
     # 절대 경로로 변환 후 디렉토리 이탈 방지 검증
     try:
         filepath = filepath.resolve()
-        base_path = settings.GENERATED_IMAGES_DIR.resolve()
+        base_path = image_store.root.resolve()
         
         # base_path 내부에 있는지 확인
         if not str(filepath).startswith(str(base_path)):
@@ -210,16 +771,23 @@ async def get_image(filename: str):
             detail="Invalid file path"
         )
     
-    if not filepath.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="이미지를 찾을 수 없습니다."
-        )
+    # 파일을 메모리에 올리지 않고 디스크에서 바로 스트리밍
+    # 내용이 바뀌지 않는 주소이므로 장기 캐시 허용, ETag는 내용 해시
+    digest = safe_filename.split('.')[0]
+    cache_headers = {
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "ETag": f'"{digest}"'
+    }
+    
+    # 클라이언트가 이미 가진 이미지면 본문 없이 304 응답
+    if if_none_match and f'"{digest}"' in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
     
     return FileResponse(
         path=filepath,
-        media_type="image/png",
-        filename=safe_filename
+        media_type=MEDIA_TYPES[extension],
+        filename=safe_filename,
+        headers=cache_headers
     )
 
 
@@ -243,7 +811,7 @@ async def get_generation_info(generation_id: str):
             detail="Invalid generation ID format"
         )
     
-    generation = session_manager.get_generation(generation_id)
+    generation = await session_manager.get_generation(generation_id)
     
     if not generation:
         raise HTTPException(
@@ -251,10 +819,17 @@ async def get_generation_info(generation_id: str):
             detail="생성 정보를 찾을 수 없습니다."
         )
     
-    return {
+    response = {
         "generation_id": generation_id,
         "session_id": generation["session_id"],
+        # 동기 생성은 저장 시점에 이미 완료됨, 작업 모드는 queued/running/completed/failed
+        "status": generation.get("status", "completed"),
         "metadata": generation["metadata"],
         "created_at": generation["created_at"]
     }
+    for key in ("result", "error", "backfill"):
+        if key in generation:
+            response[key] = generation[key]
+    
+    return response
 
@@ -0,0 +1,35 @@
+"""
+장소 자동완성 API 엔드포인트
+화면 2: 장소 입력창 자동완성
+"""
+from fastapi import APIRouter, Query
+import logging
+
+from models.location import LocationSuggestResponse
+from services.location_suggester import location_suggester, MAX_SUGGESTIONS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["location"])
+
+
+@router.get("/locations/suggest", response_model=LocationSuggestResponse)
+async def suggest_locations(
+    q: str = Query(..., min_length=1, max_length=100, description="입력 중인 장소명 (접두어)"),
+    limit: int = Query(default=8, ge=1, le=MAX_SUGGESTIONS, description="최대 결과 수")
+):
+    """
+    장소 자동완성
+    
+    사용자가 장소를 입력하는 동안 키 입력마다 호출됩니다.
+    메모리 내 정렬 색인만 조회하므로 이미지 생성 작업과 무관하게 즉시 응답합니다.
+    
+    Returns:
+        priority 순으로 정렬된 장소 후보 목록
+    """
+    suggestions = location_suggester.suggest(q, limit=limit)
+    
+    return LocationSuggestResponse(
+        query=q,
+        suggestions=suggestions
+    )
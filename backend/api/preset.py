@@ -12,6 +12,7 @@ from models.preset import (
     BrandPreset
 )
 from data.mappings import BRAND_PRESETS
+from services.preset_registry import preset_registry
 from services.session_manager import session_manager
 
 logger = logging.getLogger(__name__)
@@ -42,23 +43,13 @@ async def create_preset(request: PresetCreateRequest):
             detail=detail
         )
     
-    # 브랜드 프리셋 데이터 가져오기
-    preset_data = BRAND_PRESETS[request.tone_manner]
-    
-    # BrandPreset 모델 생성
-    brand_preset = BrandPreset(
-        tone_manner=request.tone_manner,
-        nationality=request.nationality,
-        age_group=request.age_group,
-        style_tone=preset_data["style_tone"],
-        color_grade=preset_data["color_grade"],
-        default_lighting=preset_data["default_lighting"],
-        preset_name=preset_data["name"],
-        preset_description=preset_data["description"]
-    )
+    # 조합별로 공유하는 BrandPreset 조회 (세션에는 프리셋 키만 저장)
+    brand_preset = preset_registry.get(
+        request.tone_manner, request.nationality, request.age_group
+    ).preset
     
     # 세션 생성
-    session_id = session_manager.create_session(brand_preset)
+    session_id = await session_manager.create_session(brand_preset)
     
     logger.info(f"✅ 프리셋 저장 완료: session_id={session_id}")
     
@@ -67,7 +58,7 @@ async def create_preset(request: PresetCreateRequest):
         message="프리셋이 저장되었습니다. 이제 이미지를 생성할 수 있습니다.",
         preset_info={
             "tone_manner": request.tone_manner,
-            "preset_name": preset_data["name"],
+            "preset_name": brand_preset.preset_name,
             "nationality": request.nationality,
             "age_group": request.age_group
         }
@@ -94,7 +85,7 @@ async def get_preset(session_id: str):
             detail="Invalid session ID format"
         )
     
-    session = session_manager.get_session(session_id)
+    session = await session_manager.get_session(session_id)
     
     if not session:
         raise HTTPException(
@@ -102,7 +93,7 @@ async def get_preset(session_id: str):
             detail="세션을 찾을 수 없습니다. 프리셋을 다시 생성해주세요."
         )
     
-    preset: BrandPreset = session["preset"]
+    preset: BrandPreset = session.preset
     
     return {
         "session_id": session_id,
@@ -111,7 +102,7 @@ async def get_preset(session_id: str):
             "preset_name": preset.preset_name,
             "nationality": preset.nationality,
             "age_group": preset.age_group,
-            "created_at": session["created_at"]
+            "created_at": session.created_at
         }
     }
 
@@ -4,7 +4,7 @@
 """
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import List
+from typing import Dict, List
 import os
 from pathlib import Path
 
@@ -58,16 +58,95 @@ class Settings(BaseSettings):
     # Replicate API 설정 (권장)
     REPLICATE_MODEL: str = "stability-ai/sdxl:39ed52f2a78e934b3ba6e2a89f5b1c712de7dfea535525255b1aa35c5565e08b"
     
-    # 이미지 저장 경로
+    # 이미지 생성 공급자 (앞에 있을수록 우선, API 키가 없는 공급자는 건너뜀)
+    # 사용 가능: google_ai, replicate, huggingface, gradio
+    # 기본은 google_ai만 사용, 장애 시 전환할 공급자는 직접 추가 (예: ["google_ai", "replicate"])
+    IMAGE_PROVIDERS: List[str] = ["google_ai"]
+    
+    # 공급자 서킷 브레이커 (상태가 나빠진 공급자는 잠시 제외하고 다음 공급자로 전환)
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # 연속 실패 횟수
+    CIRCUIT_ERROR_RATE_THRESHOLD: float = 0.5  # 오류율(EWMA) 기준
+    CIRCUIT_MIN_SAMPLES: int = 10  # 오류율 판단에 필요한 최소 요청 수
+    CIRCUIT_OPEN_SECONDS: float = 30.0  # 서킷을 연 뒤 시험 요청까지 대기 시간
+    
+    # Gradio Space Client 풀 (앱 시작 시 연결해 두고 재사용)
+    GRADIO_CLIENT_POOL_SIZE: int = 2
+    
+    # 헤징: 이미지가 최근 p90 시간 안에 끝나지 않으면 중복 요청 후 먼저 끝난 결과 사용
+    HEDGE_ENABLED: bool = False
+    HEDGE_PERCENTILE: float = 0.9
+    HEDGE_MIN_SAMPLES: int = 20  # 백분위 계산에 필요한 최소 기록 수
+    HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    HEDGE_LATENCY_WINDOW: int = 200  # 최근 몇 개의 소요 시간으로 계산할지
+    HEDGE_BUDGET_RATIO: float = 0.1  # 중복 요청은 전체 요청의 10% 이하
+    HEDGE_BUDGET_BURST: float = 4.0  # 순간적으로 허용하는 중복 요청 수
+    
+    # 외부 API HTTP 커넥션 풀 설정 (이미지 생성 API 호출)
+    HTTP_POOL_MAX_CONNECTIONS: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 120.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    HTTP2_ENABLED: bool = True  # h2 패키지가 설치된 경우에만 적용
+    
+    # 이미지 생성 API 호출 제한 (공급자/모델별, 초과 요청은 순서대로 대기)
+    PROVIDER_MAX_CONCURRENCY: int = 8  # 동시 호출 수
+    # 분당 요청 제한은 기본으로 끔, 사용하는 공급자/요금제의 할당량에 맞춰 설정
+    PROVIDER_REQUESTS_PER_MINUTE: int = 0  # 분당 요청 수 (0이면 제한 없음)
+    PROVIDER_RATE_BURST: int = 0  # 순간적으로 허용하는 요청 수 (분당 제한을 켤 때 함께 설정, 최소 1)
+    # 개별 설정 (예: {"google_ai": {"max_concurrency": 4, "requests_per_minute": 10}})
+    # 키는 "공급자" 또는 "공급자:모델", 환경 변수에는 JSON으로 지정
+    PROVIDER_LIMITS: Dict[str, Dict[str, int]] = {}
+    
+    # 이미지 생성 API 재시도 (429/5xx/네트워크 오류만, 지수 백오프 + 지터)
+    RETRY_MAX_ATTEMPTS: int = 3  # 최초 시도 포함
+    RETRY_BASE_DELAY_SECONDS: float = 1.0
+    RETRY_MAX_DELAY_SECONDS: float = 20.0
+    RETRY_DEADLINE_SECONDS: float = 180.0  # 이미지 1장당 재시도 포함 전체 제한 시간
+    
+    # 이미지 저장 경로 (내용 해시 기반 저장소)
     GENERATED_IMAGES_DIR: Path = Path(__file__).parent / "generated_images"
+    IMAGE_STORE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 2GB 초과 시 오래된 이미지부터 삭제
+    
+    # 이미지 후처리(리사이즈/크롭/인코딩) 프로세스 수 (-1: CPU 수 기준 최대 4, 0: 스레드에서 실행)
+    IMAGE_PROCESS_WORKERS: int = -1
+    
+    # 미리보기 썸네일 (선택 화면용, 원본은 /api/images/{filename}으로 필요할 때 다운로드)
+    PREVIEW_MAX_SIZE: int = 256  # 긴 변 길이 (px)
+    PREVIEW_FORMAT: str = "webp"  # png, webp, jpeg, avif
     
     # 생성 파라미터
     DEFAULT_NUM_INFERENCE_STEPS: int = 28  # 최신 PRD 기준
     DEFAULT_GUIDANCE_SCALE: float = 5.0  # 자연스러운 톤 유지
     DEFAULT_NUM_IMAGES: int = 4
     
+    # 비동기 생성 작업 큐 (/api/generate/jobs)
+    GENERATION_WORKERS: int = 4  # 동시에 실행하는 생성 작업 수
+    GENERATION_QUEUE_MAXSIZE: int = 100  # 대기 가능한 최대 작업 수 (초과 시 503)
+    
+    # 생성 결과 캐시 (요청에서 use_cache=true일 때만 사용)
+    RESULT_CACHE_TTL_SECONDS: int = 24 * 3600  # 24시간
+    RESULT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 256MB (0이면 비활성화)
+    
     # 세션 설정
     SESSION_EXPIRY_SECONDS: int = 3600  # 1시간
+    SESSION_SWEEP_INTERVAL_SECONDS: float = 60.0  # 만료 세션 정리 주기
+    
+    # 세션/생성 히스토리 저장소
+    # memory: 프로세스 메모리 (워커 1개), sqlite: 같은 호스트의 여러 워커가 공유, redis: 여러 서버가 공유
+    SESSION_BACKEND: str = "memory"
+    SESSION_SQLITE_PATH: Path = Path(__file__).parent / "session_data" / "sessions.db"
+    SESSION_SQLITE_POOL_SIZE: int = 4  # 워커 프로세스당 SQLite 연결 수
+    SESSION_SQLITE_TOUCH_INTERVAL_SECONDS: float = 60.0  # 생성 히스토리 조회 시각(LRU) 갱신 최소 간격
+    SESSION_REDIS_URL: str = ""  # 예: redis://localhost:6379/0 (redis 패키지 필요)
+    
+    # 생성 히스토리 한도 (초과 시 오래 조회되지 않은 항목부터 삭제, 세션 만료 시 함께 삭제)
+    GENERATION_HISTORY_MAX_ENTRIES: int = 5000
+    GENERATION_HISTORY_MAX_BYTES: int = 128 * 1024 * 1024  # 128MB (base64 이미지 포함 대략적인 크기)
+    PROMPT_INTERN_CACHE_SIZE: int = 4096  # 히스토리에서 재사용하는 프롬프트 조각 구성 수
+    
+    # 장소 프롬프트 캐시 (정규화된 장소 입력 -> 최종 장소 프롬프트, 0이면 비활성화)
+    LOCATION_PROMPT_CACHE_SIZE: int = 1024
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,89 @@
+"""
+한글 자모 분해 유틸리티
+장소 검색에서 초성("ㅍㄹ")이나 조합 중인 음절("팔" -> "파리")을 매칭하기 위해 사용
+"""
+
+# 한글 음절 범위 (가 ~ 힣)
+HANGUL_SYLLABLE_START = 0xAC00
+HANGUL_SYLLABLE_END = 0xD7A3
+
+CHOSEONG = [
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+
+JUNGSEONG = [
+    "ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅘ",
+    "ㅙ", "ㅚ", "ㅛ", "ㅜ", "ㅝ", "ㅞ", "ㅟ", "ㅠ", "ㅡ", "ㅢ", "ㅣ",
+]
+
+JONGSEONG = [
+    "", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ",
+    "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ",
+    "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+
+# 겹자음/겹모음은 입력 순서대로 분해 (타이핑 중인 접두어와 매칭되도록)
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ",
+    "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ",
+    "ㅄ": "ㅂㅅ", "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ",
+    "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+_CHOSEONG_SET = frozenset(CHOSEONG)
+
+
+def is_hangul_syllable(char: str) -> bool:
+    """완성형 한글 음절 여부"""
+    return HANGUL_SYLLABLE_START <= ord(char) <= HANGUL_SYLLABLE_END
+
+
+def is_hangul_jamo(char: str) -> bool:
+    """호환용 한글 자모 (ㄱ ~ ㅣ) 여부"""
+    return 0x3131 <= ord(char) <= 0x3163
+
+
+def has_hangul(text: str) -> bool:
+    """한글 음절 또는 자모 포함 여부"""
+    return any(is_hangul_syllable(c) or is_hangul_jamo(c) for c in text)
+
+
+def is_choseong_only(text: str) -> bool:
+    """공백을 제외한 모든 글자가 초성(자음)인지 여부 (예: "ㅍㄹ")"""
+    chars = [c for c in text if not c.isspace()]
+    return bool(chars) and all(c in _CHOSEONG_SET for c in chars)
+
+
+def decompose(text: str) -> str:
+    """
+    한글을 자모 단위로 분해 (겹자음/겹모음도 분해, 그 외 문자는 그대로)
+
+    예: "파리" -> "ㅍㅏㄹㅣ", "팔" -> "ㅍㅏㄹ"
+    """
+    result = []
+    for char in text:
+        if is_hangul_syllable(char):
+            offset = ord(char) - HANGUL_SYLLABLE_START
+            jamo = (
+                CHOSEONG[offset // 588],
+                JUNGSEONG[(offset % 588) // 28],
+                JONGSEONG[offset % 28],
+            )
+            for j in jamo:
+                result.append(COMPOUND_JAMO.get(j, j))
+        else:
+            result.append(COMPOUND_JAMO.get(char, char))
+    return "".join(result)
+
+
+def choseong(text: str) -> str:
+    """
+    한글 음절을 초성으로 변환 (그 외 문자는 그대로)
+
+    예: "파리" -> "ㅍㄹ", "성산일출봉" -> "ㅅㅅㅇㅊㅂ"
+    """
+    return "".join(
+        CHOSEONG[(ord(char) - HANGUL_SYLLABLE_START) // 588] if is_hangul_syllable(char) else char
+        for char in text
+    )
@@ -2,6 +2,10 @@
 Travel-Fit AI 데이터 매핑
 기획서의 모든 브랜드 프리셋, 인물, 레이아웃, 시간대 등의 매핑 데이터
 """
+from bisect import bisect_left
+from typing import Optional
+
+from data.hangul import has_hangul, is_choseong_only, decompose, choseong
 
 # ============================================
 # 브랜드 프리셋
@@ -824,10 +828,278 @@ LOCATION_DATA = {
 }
 
 
+# ============================================
+# 한글 장소 힌트 (LOCATION_DATA에 매칭되지 않는 한글 입력을 영어로 치환)
+# ============================================
+# 장소명 (자동완성에서 LOCATION_DATA의 장소로 연결)
+LOCATION_HINTS_KR = {
+    "파리": "Paris",
+    "에펠탑": "Eiffel Tower",
+    "제주": "Jeju Island",
+    "성산일출봉": "Seongsan Ilchulbong",
+    "뉴욕": "New York",
+    "센트럴파크": "Central Park",
+    "런던": "London",
+    "빅벤": "Big Ben",
+    "도쿄": "Tokyo",
+    "후지산": "Mt. Fuji",
+}
+
+# 일반 장소 유형 (프롬프트 치환에만 사용, 한글 검색 인덱스에 넣지 않아 특정 장소로 연결하지 않음)
+LOCATION_CATEGORY_HINTS_KR = {
+    "해변": "beach",
+    "바다": "ocean",
+    "산": "mountain",
+    "도시": "city",
+    "거리": "street",
+}
+
+# 한글 장소 입력 끝에 붙는 조사 (예: "파리에서" -> "파리", 긴 것부터 확인)
+KOREAN_PARTICLES = ("에서", "으로", "에", "의", "로", "은", "는", "이", "가", "을", "를", "와", "과", "도")
+
+# 자모 접두어 매칭에 필요한 최소 자모 수 ("팔" -> "파리"는 허용, "파", "도" 같은 한 음절은 제외)
+KOREAN_PREFIX_MIN_JAMO = 3
+
+
+# ============================================
+# 장소 검색 인덱스
+# import 시점에 한 번 구축하여 search_locations가 전체 스캔 없이 후보만 검사하도록 함
+# ============================================
+
+# n-gram 토큰 길이 (질의가 이보다 짧으면 질의 전체를 토큰으로 사용)
+_LOCATION_NGRAM_SIZE = 3
+
+
+def _iter_ngrams(text: str, max_n: int = _LOCATION_NGRAM_SIZE):
+    """길이 1~max_n의 모든 부분 문자열 (인덱스 키)"""
+    length = len(text)
+    for n in range(1, max_n + 1):
+        for i in range(length - n + 1):
+            yield text[i:i + n]
+
+
+def _query_ngrams(query_lower: str) -> set:
+    """질의를 덮는 n-gram 집합 (모두 포함하는 레코드만 후보가 됨)"""
+    n = min(len(query_lower), _LOCATION_NGRAM_SIZE)
+    return {query_lower[i:i + n] for i in range(len(query_lower) - n + 1)}
+
+
+def build_location_index(location_data: dict) -> dict:
+    """
+    장소 검색 인덱스 구축
+
+    - records: 소문자 변환된 필드와 우선순위 보정값을 미리 계산한 레코드 (LOCATION_DATA 순서 유지)
+    - postings: 정규화된 n-gram 토큰 -> 레코드 번호 집합
+
+    Args:
+        location_data: LOCATION_DATA 형식의 딕셔너리
+
+    Returns:
+        {"records": list, "postings": dict}
+    """
+    records = []
+    postings = {}
+
+    for ordinal, location in enumerate(location_data.values()):
+        keywords_lower = tuple(keyword.lower() for keyword in location["search_keywords"])
+        records.append({
+            "data": location,
+            "type": location["type"],
+            "country_en": location["country_en"].lower(),
+            "country_kr": location["country_kr"],
+            "city_en": location["city_en"].lower(),
+            "city_kr": location["city_kr"],
+            "keywords": keywords_lower,
+            "display_name_en": location["display_name_en"].lower(),
+            "display_name_kr": location["display_name_kr"],
+            # 우선순위 보정 (priority가 낮을수록 높은 점수)
+            "priority_bonus": (2 - location["priority"]) * 10,
+        })
+
+        # 매칭 대상이 되는 모든 필드를 소문자로 정규화하여 토큰화
+        searchable = [
+            location["country_en"],
+            location["country_kr"],
+            location["city_en"],
+            location["city_kr"],
+            location["display_name_en"],
+            location["display_name_kr"],
+            *location["search_keywords"],
+        ]
+        tokens = set()
+        for text in searchable:
+            if text:
+                tokens.update(_iter_ngrams(text.lower()))
+        for token in tokens:
+            postings.setdefault(token, set()).add(ordinal)
+
+    return {
+        "records": records,
+        "postings": {token: frozenset(ids) for token, ids in postings.items()},
+    }
+
+
+def build_korean_location_index(location_data: dict, hints: dict) -> dict:
+    """
+    한글 장소명 인덱스 구축 (자모/초성 키 -> 영문 검색어)
+
+    LOCATION_DATA의 한글 필드(display_name_kr, city_kr, country_kr)와 LOCATION_HINTS_KR를
+    자모 분해 키("ㅍㅏㄹㅣ")와 초성 키("ㅍㄹ")로 정렬 배열에 저장하여 접두어 검색에 사용
+
+    Args:
+        location_data: LOCATION_DATA 형식의 딕셔너리
+        hints: 한글 -> 영문 치환 딕셔너리
+
+    Returns:
+        {"names": dict, "keys": list, "entries": list}
+    """
+    # 공백 제거한 한글명 -> 영문 검색어
+    names = {}
+    for location in location_data.values():
+        for kr_field, en_field in (
+            ("display_name_kr", "display_name_en"),
+            ("city_kr", "city_en"),
+            ("country_kr", "country_en"),
+        ):
+            name_kr = "".join(location[kr_field].split())
+            if name_kr and has_hangul(name_kr) and location[en_field]:
+                names.setdefault(name_kr, location[en_field])
+    for name_kr, term_en in hints.items():
+        names.setdefault("".join(name_kr.split()), term_en)
+
+    entries = []
+    for name_kr, term_en in names.items():
+        entries.append((decompose(name_kr), name_kr, term_en))
+        entries.append((choseong(name_kr), name_kr, term_en))
+    entries.sort()
+
+    return {
+        "names": names,
+        "keys": [entry[0] for entry in entries],
+        "entries": entries,
+    }
+
+
+def rebuild_location_index():
+    """
+    LOCATION_DATA 변경 후 검색 인덱스 재구축
+
+    Returns:
+        새 인덱스 버전 (캐시 무효화 등에 사용)
+    """
+    global _location_index, _korean_location_index, _location_index_version
+    _location_index = build_location_index(LOCATION_DATA)
+    _korean_location_index = build_korean_location_index(LOCATION_DATA, LOCATION_HINTS_KR)
+    _location_index_version += 1
+    return _location_index_version
+
+
+def get_location_index_version() -> int:
+    """현재 검색 인덱스 버전"""
+    return _location_index_version
+
+
+_location_index = build_location_index(LOCATION_DATA)
+_korean_location_index = build_korean_location_index(LOCATION_DATA, LOCATION_HINTS_KR)
+_location_index_version = 1
+
+
+def resolve_korean_location(query: str) -> Optional[str]:
+    """
+    한글 장소 입력을 영문 검색어로 변환 (완성형, 조합 중인 음절, 초성 모두 지원)
+
+    예: "파리" -> "Paris", "팔" -> "Paris", "ㅍㄹ" -> "Paris"
+    접두어 매칭은 초성 2자 이상 또는 자모 KOREAN_PREFIX_MIN_JAMO개 이상일 때만 사용
+    ("도", "파", "ㅅ" 같은 짧은 입력이 임의의 장소로 바뀌지 않도록)
+
+    Args:
+        query: 한글 검색어
+
+    Returns:
+        영문 검색어 또는 None
+    """
+    name = "".join(query.split())
+    if not name or not has_hangul(name):
+        return None
+
+    index = _korean_location_index
+    exact = index["names"].get(name)
+    if exact:
+        return exact
+
+    # 자모 접두어 매칭 (초성만 입력한 경우 분해해도 그대로이므로 초성 키와 매칭됨)
+    key = decompose(name)
+    if is_choseong_only(name):
+        if len(key) < 2:
+            return None
+    elif len(key) < KOREAN_PREFIX_MIN_JAMO:
+        return None
+    best = None
+    for entry_key, name_kr, term_en in index["entries"][bisect_left(index["keys"], key):]:
+        if not entry_key.startswith(key):
+            break
+        # 가장 짧은 (입력에 가장 가까운) 이름 우선
+        if best is None or len(name_kr) < len(best[0]):
+            best = (name_kr, term_en)
+
+    return best[1] if best else None
+
+
+def translate_korean_location(location: str) -> str:
+    """
+    장소 입력의 한글 단어를 영어로 치환 (LOCATION_DATA에 매칭되지 않은 경우의 대체 처리)
+
+    단어 단위로 일반 장소 유형(LOCATION_CATEGORY_HINTS_KR)과 한글 인덱스에서 찾고,
+    없으면 끝의 조사를 뗀 이름으로 다시 찾음 (단어 일부만 치환하지 않음: "산책로"는 그대로 유지)
+    """
+    words = []
+    for word in location.split(" "):
+        resolved = None
+        if has_hangul(word):
+            resolved = (
+                LOCATION_CATEGORY_HINTS_KR.get(word)
+                or resolve_korean_location(word)
+                or _resolve_with_particle(word)
+            )
+        words.append(resolved or word)
+    return " ".join(words)
+
+
+def _resolve_with_particle(word: str) -> Optional[str]:
+    """조사가 붙은 한글 장소명/장소 유형 조회 (예: "파리에서" -> "Paris", 이름은 정확히 일치해야 함)"""
+    names = _korean_location_index["names"]
+    for particle in KOREAN_PARTICLES:
+        if word.endswith(particle) and len(word) > len(particle):
+            stem = word[:-len(particle)]
+            term_en = LOCATION_CATEGORY_HINTS_KR.get(stem) or names.get(stem)
+            if term_en:
+                return term_en
+    return None
+
+
+def _candidate_ordinals(query_lower: str) -> list:
+    """질의의 모든 n-gram을 포함하는 레코드 번호 (LOCATION_DATA 순서)"""
+    postings = _location_index["postings"]
+    token_postings = []
+    for token in _query_ngrams(query_lower):
+        ids = postings.get(token)
+        if not ids:
+            return []
+        token_postings.append(ids)
+
+    token_postings.sort(key=len)
+    smallest, rest = token_postings[0], token_postings[1:]
+    return sorted(
+        ordinal for ordinal in smallest
+        if all(ordinal in ids for ids in rest)
+    )
+
+
 def search_locations(query: str, limit: int = 10) -> list:
     """
     장소 검색 함수
     검색 키워드, 국가명, 도시명, 랜드마크명을 매칭하여 우선순위별로 반환
+    (n-gram 인덱스로 후보를 좁힌 뒤 기존과 동일한 규칙으로 점수 계산)
     
     Args:
         query: 검색어 (영문 또는 한글)
@@ -840,49 +1112,49 @@ def search_locations(query: str, limit: int = 10) -> list:
     if not query_lower:
         return []
     
+    records = _location_index["records"]
     results = []
     
-    for location_id, location_data in LOCATION_DATA.items():
+    for ordinal in _candidate_ordinals(query_lower):
+        record = records[ordinal]
         score = 0
         matched_type = None
         
         # 국가명 매칭 (최우선)
-        if location_data["country_en"].lower() == query_lower or \
-           location_data["country_kr"] == query or \
-           query_lower in location_data["country_en"].lower():
-            score = 100 if location_data["type"] == "Country" else 50
+        if record["country_kr"] == query or query_lower in record["country_en"]:
+            score = 100 if record["type"] == "Country" else 50
             matched_type = "country"
         
         # 도시명 매칭
-        elif location_data["city_en"] and \
-             (location_data["city_en"].lower() == query_lower or \
-              location_data["city_kr"] == query or \
-              query_lower in location_data["city_en"].lower()):
-            score = 80 if location_data["type"] == "City" else 40
+        elif record["city_en"] and \
+             (record["city_kr"] == query or query_lower in record["city_en"]):
+            score = 80 if record["type"] == "City" else 40
             matched_type = "city"
         
         # 검색 키워드 매칭
-        elif any(query_lower in keyword.lower() for keyword in location_data["search_keywords"]):
-            score = 60 if location_data["type"] == "Landmark" else 30
+        elif any(query_lower in keyword for keyword in record["keywords"]):
+            score = 60 if record["type"] == "Landmark" else 30
             matched_type = "keyword"
         
         # 랜드마크명 매칭
-        elif query_lower in location_data["display_name_en"].lower() or \
-             query in location_data["display_name_kr"]:
+        elif query_lower in record["display_name_en"] or \
+             query in record["display_name_kr"]:
             score = 70
             matched_type = "landmark"
         
         if score > 0:
-            # 우선순위 보정 (priority가 낮을수록 높은 점수)
-            priority_bonus = (2 - location_data["priority"]) * 10
-            final_score = score + priority_bonus
-            
             results.append({
-                **location_data,
-                "match_score": final_score,
+                **record["data"],
+                "match_score": score + record["priority_bonus"],
                 "matched_type": matched_type
             })
     
+    # 한글(초성/조합 중인 음절 포함) 입력은 한글 인덱스로 영문 검색어를 찾아 재검색
+    if not results and has_hangul(query):
+        term_en = resolve_korean_location(query)
+        if term_en and not has_hangul(term_en):
+            return search_locations(term_en, limit)
+    
     # 점수 내림차순 정렬 후 limit 적용
     results.sort(key=lambda x: x["match_score"], reverse=True)
     return results[:limit]
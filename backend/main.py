@@ -9,8 +9,19 @@ import logging
 import time
 
 from config import settings, validate_settings
-from api import preset, generate
+from api import preset, generate, location
 from services.session_manager import session_manager
+from services.preset_registry import preset_registry
+from services.prompt_engine import prompt_engine
+from services.http_client import http_client
+from services.job_queue import generation_queue
+from services.image_store import image_store
+from services.result_cache import result_cache
+from services.single_flight import generation_flight
+from services.admission import admission_controller
+from services.retry import retry_policy
+from services.provider_router import provider_router
+from services.image_processing import image_processor
 
 # 로깅 설정
 logging.basicConfig(
@@ -72,6 +83,7 @@ async def log_requests(request: Request, call_next):
 # 라우터 등록
 app.include_router(preset.router)
 app.include_router(generate.router)
+app.include_router(location.router)
 
 # 헬스체크 엔드포인트
 @app.get("/")
@@ -87,14 +99,26 @@ async def root():
 @app.get("/health")
 async def health_check():
     """헬스체크"""
-    stats = session_manager.get_stats()
+    stats = await session_manager.get_stats()
     api_token_valid = validate_settings()
     
     return {
         "status": "healthy" if api_token_valid else "degraded",
         "api_token_configured": api_token_valid,
+        "session_backend": stats["backend"],
         "active_sessions": stats["active_sessions"],
-        "total_generations": stats["total_generations"]
+        "total_generations": stats["total_generations"],
+        "expired_sessions": stats["expired_sessions"],
+        "generation_history": stats["generation_history"],
+        "preset_registry": preset_registry.get_stats(),
+        "location_prompt_cache": prompt_engine.get_location_cache_stats(),
+        "generation_queue": generation_queue.get_stats(),
+        "image_store": image_store.get_stats(),
+        "result_cache": result_cache.get_stats(),
+        "generation_coalescing": generation_flight.get_stats(),
+        "provider_admission": admission_controller.get_stats(),
+        "provider_retries": retry_policy.get_stats(),
+        "provider_router": provider_router.get_stats()
     }
 
 # 에러 핸들러
@@ -139,6 +163,18 @@ async def startup_event():
         logger.info(f"🔒 API 문서: 비활성화됨 (프로덕션 모드)")
     logger.info("=" * 60)
     
+    # 외부 API 커넥션 풀 생성
+    await http_client.startup()
+    
+    # 생성 작업 큐 워커 시작
+    await generation_queue.start()
+    
+    # 만료 세션 정리 작업 시작
+    await session_manager.start()
+    
+    # 이미지 생성 공급자 준비 (Gradio Client 풀 등)
+    await provider_router.startup()
+    
     # 설정 검증
     if not validate_settings():
         logger.warning("⚠️  경고: API 토큰이 설정되지 않았습니다!")
@@ -149,12 +185,20 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 실행"""
+    await generation_queue.stop()
+    await provider_router.shutdown()
+    await http_client.shutdown()
+    image_processor.shutdown()
+    
     logger.info("=" * 60)
     logger.info("👋 Travel-Fit AI Backend 종료")
-    stats = session_manager.get_stats()
+    stats = await session_manager.get_stats()
     logger.info(f"   총 세션 수: {stats['active_sessions']}")
     logger.info(f"   총 생성 수: {stats['total_generations']}")
     logger.info("=" * 60)
+    
+    # 세션 정리 작업 종료 및 저장소 연결 정리
+    await session_manager.stop()
 
 
 # 개발 서버 실행 (python main.py로 직접 실행 시)
@@ -61,21 +61,89 @@ class ImageGenerationRequest(BaseModel):
         description="이미지 비율",
         examples=["4:3", "16:9"]
     )
+    
+    # 부분 실패 처리
+    allow_partial: bool = Field(
+        default=False,
+        description="일부 이미지가 실패해도 성공한 이미지를 반환 (기본값 false: 하나라도 실패 시 오류)"
+    )
+    backfill_failed: bool = Field(
+        default=False,
+        description="실패한 이미지를 백그라운드에서 재생성 (allow_partial=true일 때, 결과는 /api/generation/{id}에서 조회)"
+    )
+    
+    # 결과 캐시
+    use_cache: bool = Field(
+        default=False,
+        description="같은 입력의 이전 생성 결과를 재사용 (시드가 입력에서 결정되어 같은 요청은 같은 이미지를 반환)"
+    )
+    
+    # 응답 형식
+    response_mode: str = Field(
+        default="base64",
+        description="이미지 전달 방식 - base64: 응답에 이미지 데이터 포함, url: 다운로드 URL/ETag만 포함",
+        pattern=r'^(base64|url)$',
+        examples=["base64", "url"]
+    )
+    
+    # 출력 형식 (생성 원본은 PNG로 보관하고 요청 형식으로 변환)
+    output_format: str = Field(
+        default="png",
+        description="이미지 형식 - png: 무손실 원본, webp/jpeg/avif: 용량이 작은 미리보기/공유용",
+        pattern=r'^(png|webp|jpeg|avif)$',
+        examples=["png", "webp", "jpeg"]
+    )
+    quality: str = Field(
+        default="standard",
+        description="손실 압축 품질 단계 - master(95), standard(85), preview(70) (png에는 적용되지 않음)",
+        pattern=r'^(master|standard|preview)$',
+        examples=["master", "standard", "preview"]
+    )
+    
+    # 미리보기 썸네일
+    include_previews: bool = Field(
+        default=False,
+        description="작은 미리보기 썸네일(base64)을 먼저 반환하고 원본은 URL만 포함 (원본은 /api/images/{filename}으로 다운로드)"
+    )
 
 
 class GeneratedImage(BaseModel):
     """생성된 단일 이미지 정보"""
     image_id: str = Field(..., description="이미지 고유 ID", max_length=100)
     filename: str = Field(..., description="파일명", max_length=200)
-    base64: str = Field(..., description="base64 인코딩된 이미지 데이터", max_length=15_000_000)  # 약 10MB 이미지 (base64는 약 33% 증가)
+    base64: Optional[str] = Field(default=None, description="base64 인코딩된 이미지 데이터 (response_mode=base64)", max_length=15_000_000)  # 약 10MB 이미지 (base64는 약 33% 증가)
+    url: Optional[str] = Field(default=None, description="이미지 다운로드 URL (response_mode=url)", max_length=300)
+    etag: Optional[str] = Field(default=None, description="이미지 ETag (내용 해시)", max_length=100)
+    size: Optional[int] = Field(default=None, description="이미지 크기 (bytes)")
+    content_type: Optional[str] = Field(default=None, description="이미지 media type (예: image/png, image/webp)", max_length=50)
     seed: int = Field(..., description="사용된 시드값")
 
 
+class ImagePreview(BaseModel):
+    """미리보기 썸네일 (선택 화면용)"""
+    image_id: str = Field(..., description="원본 이미지 ID", max_length=100)
+    filename: str = Field(..., description="썸네일 파일명", max_length=200)
+    base64: str = Field(..., description="base64 인코딩된 썸네일 데이터", max_length=1_000_000)
+    url: str = Field(..., description="썸네일 다운로드 URL", max_length=300)
+    content_type: str = Field(..., description="썸네일 media type (예: image/webp)", max_length=50)
+    size: int = Field(..., description="썸네일 크기 (bytes)")
+
+
+class FailedImageSlot(BaseModel):
+    """생성에 실패한 이미지 슬롯 정보"""
+    index: int = Field(..., description="슬롯 번호 (0~3)")
+    seed: int = Field(..., description="요청한 시드값")
+    error: str = Field(..., description="실패 사유", max_length=500)
+    backfill_pending: bool = Field(default=False, description="백그라운드 재생성 진행 여부")
+
+
 class ImageGenerationResponse(BaseModel):
     """이미지 생성 응답"""
     generation_id: str = Field(..., description="생성 작업 ID")
     session_id: str = Field(..., description="세션 ID")
+    previews: List[ImagePreview] = Field(default_factory=list, description="미리보기 썸네일 목록 (include_previews=true)")
     images: List[GeneratedImage] = Field(..., description="생성된 이미지 목록 (4개)")
+    failed_slots: List[FailedImageSlot] = Field(default_factory=list, description="실패한 이미지 슬롯 목록")
     prompts: dict = Field(..., description="사용된 프롬프트 정보")
     metadata: dict = Field(..., description="생성 메타데이터")
 
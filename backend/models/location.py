@@ -0,0 +1,23 @@
+"""
+장소 자동완성 관련 데이터 모델
+"""
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class LocationSuggestion(BaseModel):
+    """자동완성 단일 결과"""
+    id: str = Field(..., description="Location ID", examples=["FR_PAR"])
+    display_name_en: str = Field(..., description="영문 표시명")
+    display_name_kr: str = Field(..., description="한글 표시명")
+    city_en: str = Field(default="", description="도시명 (영문)")
+    country_en: str = Field(default="", description="국가명 (영문)")
+    type: str = Field(..., description="장소 유형", examples=["Country", "City", "Landmark"])
+    priority: int = Field(..., description="우선순위 (낮을수록 우선)")
+    matched_text: str = Field(..., description="입력과 매칭된 이름/키워드")
+
+
+class LocationSuggestResponse(BaseModel):
+    """장소 자동완성 응답"""
+    query: str = Field(..., description="입력된 검색어")
+    suggestions: List[LocationSuggestion] = Field(..., description="priority 순 자동완성 결과")
@@ -0,0 +1,162 @@
+"""
+세션/생성 히스토리 레코드 메모리 벤치마크
+dict 레코드(기존 방식)와 __slots__ 레코드 + 공유 프롬프트 조각의 레코드당 메모리를 비교
+
+사용법:
+    cd backend
+    python scripts/bench_session_records.py [레코드 수]
+"""
+import asyncio
+import gc
+import itertools
+import logging
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+logging.disable(logging.CRITICAL)
+
+from config import settings
+from data.mappings import BRAND_PRESETS, NATIONALITY_MAP, AGE_GROUP_MAP, PERSONA_GENERATOR, LAYOUT_MAP
+from models.generation import ImageGenerationRequest
+from models.preset import BrandPreset
+from services.prompt_engine import prompt_engine
+from services.preset_registry import preset_registry
+from services.session_backends import MemorySessionBackend
+from services.session_records import SessionRecord
+
+LOCATIONS = ["Paris Eiffel Tower", "Jeju Seongsan Ilchulbong", "New York Central Park", "Kyoto Fushimi Inari", "Santorini Oia"]
+ACTIONS = ["front", "back", "side"]
+
+
+def make_preset(tone: str, nationality: str, age_group: str) -> BrandPreset:
+    """세션마다 새 BrandPreset 생성 (레지스트리 도입 전 방식)"""
+    return BrandPreset(
+        tone_manner=tone,
+        nationality=nationality,
+        age_group=age_group,
+        style_tone=BRAND_PRESETS[tone]["style_tone"],
+        color_grade=BRAND_PRESETS[tone]["color_grade"],
+        default_lighting=BRAND_PRESETS[tone]["default_lighting"],
+        preset_name=BRAND_PRESETS[tone]["name"],
+        preset_description=BRAND_PRESETS[tone]["description"]
+    )
+
+
+def make_presets():
+    """프리셋 조합 목록"""
+    return [
+        make_preset(tone, nationality, age_group)
+        for tone, nationality, age_group in itertools.product(BRAND_PRESETS, NATIONALITY_MAP, AGE_GROUP_MAP)
+    ]
+
+
+async def make_generation(rng: random.Random, presets, session_id: str) -> dict:
+    """api/generate.py의 _save_generation과 같은 형식의 히스토리 항목 생성 (프롬프트는 요청마다 새 문자열)"""
+    request = ImageGenerationRequest(
+        session_id=session_id,
+        location=rng.choice(LOCATIONS),
+        persona=rng.choice(list(PERSONA_GENERATOR)),
+        action=rng.choice(ACTIONS),
+        layout=rng.choice(list(LAYOUT_MAP)),
+        ratio="1:1"
+    )
+    positive_prompt, negative_prompt, width, height = \
+        await prompt_engine.generate_final_prompt(rng.choice(presets), request)
+    return {
+        "positive_prompt": positive_prompt,
+        "negative_prompt": negative_prompt,
+        "width": width,
+        "height": height,
+        "num_inference_steps": settings.DEFAULT_NUM_INFERENCE_STEPS,
+        "guidance_scale": settings.DEFAULT_GUIDANCE_SCALE,
+        "seeds": [rng.randint(0, 999999) for _ in range(4)],
+        "generation_time": rng.random() * 10,
+        "failed_slots": [],
+        "request": request.model_dump()
+    }
+
+
+async def measure(store, count: int, seed: int = 0) -> float:
+    """count개 항목을 저장한 뒤 늘어난 메모리 / count (bytes)"""
+    rng = random.Random(seed)
+    presets = make_presets()
+    session_id = str(uuid.uuid4())
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        metadata = await make_generation(rng, presets, session_id)
+        store(f"generation-{i}", session_id, metadata)
+        del metadata
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def measure_sessions(count: int, compact: bool, seed: int = 0) -> float:
+    """세션 레코드 크기 (기존: dict + 세션마다 BrandPreset, 개선: slots + 공유 프리셋 키)"""
+    rng = random.Random(seed)
+    combos = list(itertools.product(BRAND_PRESETS, NATIONALITY_MAP, AGE_GROUP_MAP))
+    # 레지스트리 초기화 비용 제외 (조합 수만큼 한 번만 발생)
+    for combo in combos:
+        preset_registry.get(*combo)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    if compact:
+        sessions = {
+            str(uuid.uuid4()): SessionRecord(preset_registry.get(*rng.choice(combos)).key, time.time())
+            for _ in range(count)
+        }
+    else:
+        sessions = {
+            str(uuid.uuid4()): {"preset": make_preset(*rng.choice(combos)), "created_at": time.time()}
+            for _ in range(count)
+        }
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del sessions
+    return (after - before) / count
+
+
+async def main(count: int):
+    # 한도에 걸려 삭제되지 않도록 여유 있게 설정
+    settings.GENERATION_HISTORY_MAX_ENTRIES = count * 2
+    settings.GENERATION_HISTORY_MAX_BYTES = 1 << 40
+
+    dict_history = {}
+
+    def store_dict(generation_id, session_id, metadata):
+        dict_history[generation_id] = {"session_id": session_id, "metadata": metadata, "created_at": time.time()}
+
+    backend = MemorySessionBackend()
+
+    def store_compact(generation_id, session_id, metadata):
+        backend.save_generation(generation_id, {"session_id": session_id, "metadata": metadata, "created_at": time.time()})
+
+    # 프롬프트 엔진 캐시 등 공통 초기화 비용 제외
+    await measure(lambda *args: None, 50)
+
+    dict_bytes = await measure(store_dict, count)
+    compact_bytes = await measure(store_compact, count)
+    dict_session = measure_sessions(count, compact=False)
+    compact_session = measure_sessions(count, compact=True)
+
+    print(f"생성 히스토리 {count}개")
+    print(f"  dict 레코드      : {dict_bytes:8.0f} bytes/항목")
+    print(f"  slots + 공유 조각: {compact_bytes:8.0f} bytes/항목 ({(1 - compact_bytes / dict_bytes) * 100:.1f}% 감소)")
+    print(f"세션 레코드 {count}개 (프리셋 포함)")
+    print(f"  dict + BrandPreset: {dict_session:8.0f} bytes/항목")
+    print(f"  slots + 프리셋 키 : {compact_session:8.0f} bytes/항목 ({(1 - compact_session / dict_session) * 100:.1f}% 감소)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
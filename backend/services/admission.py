@@ -0,0 +1,155 @@
+"""
+이미지 생성 API 호출 제어 서비스 (admission control)
+공급자/모델별로 동시 호출 수와 분당 요청 수(토큰 버킷)를 제한하고,
+초과 요청은 실패시키지 않고 도착 순서대로 대기시킴
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Tuple
+import logging
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderLimiter:
+    """동시 호출 제한(세마포어) + 분당 요청 제한(토큰 버킷) (단일 이벤트 루프에서 사용)"""
+
+    def __init__(self, name: str, max_concurrency: int, requests_per_minute: int, burst: int):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests_per_minute = max(0, requests_per_minute)
+        self.burst = max(1, burst)
+
+        # asyncio.Semaphore / Lock은 대기 순서(FIFO)대로 깨우므로 먼저 온 요청이 먼저 처리됨
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._rate_lock = asyncio.Lock()
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+
+        # 메트릭
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.concurrency_waits = 0
+        self.throttled = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    async def acquire(self):
+        """호출 허가 대기 (동시 호출 슬롯 확보 후 토큰 1개 소비)"""
+        started_at = time.monotonic()
+        self.waiting += 1
+        try:
+            if self._semaphore.locked():
+                self.concurrency_waits += 1
+            await self._semaphore.acquire()
+            try:
+                await self._take_token()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        wait_seconds = time.monotonic() - started_at
+        self._total_wait_seconds += wait_seconds
+        self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+        self.admitted += 1
+        self.in_flight += 1
+
+    def release(self):
+        """호출 종료"""
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    async def _take_token(self):
+        """토큰 버킷에서 토큰 1개 소비 (부족하면 충전될 때까지 대기)"""
+        if self.requests_per_minute == 0:
+            return
+
+        rate = self.requests_per_minute / 60.0
+        async with self._rate_lock:
+            throttled = False
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                if not throttled:
+                    throttled = True
+                    self.throttled += 1
+                    logger.info(f"⏳ {self.name}: 분당 요청 한도 도달, 대기 중 (대기 {self.waiting}건)")
+                await asyncio.sleep((1 - self._tokens) / rate)
+
+    def get_stats(self) -> Dict:
+        """대기열 길이, 제한 발생 횟수 등 통계"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "requests_per_minute": self.requests_per_minute,
+            "in_flight": self.in_flight,
+            "queue_length": self.waiting,
+            "admitted": self.admitted,
+            "concurrency_waits": self.concurrency_waits,
+            "throttled": self.throttled,
+            "avg_wait_seconds": round(self._total_wait_seconds / self.admitted, 3) if self.admitted else 0.0,
+            "max_wait_seconds": round(self._max_wait_seconds, 3),
+        }
+
+
+class AdmissionController:
+    """공급자/모델별 ProviderLimiter 관리 (모든 이미지 생성기가 공유)"""
+
+    def __init__(self):
+        self._limiters: Dict[Tuple[str, str], ProviderLimiter] = {}
+
+    def limiter(self, provider: str, model: str = "") -> ProviderLimiter:
+        """
+        공급자/모델의 제한기 조회 (없으면 설정값으로 생성)
+
+        PROVIDER_LIMITS에서 "provider:model" > "provider" 순으로 개별 설정을 찾고,
+        없으면 기본값(PROVIDER_MAX_CONCURRENCY 등)을 사용
+        """
+        key = (provider, model)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            name = f"{provider}:{model}" if model else provider
+            limits = settings.PROVIDER_LIMITS.get(name) or settings.PROVIDER_LIMITS.get(provider) or {}
+            limiter = ProviderLimiter(
+                name=name,
+                max_concurrency=limits.get("max_concurrency", settings.PROVIDER_MAX_CONCURRENCY),
+                requests_per_minute=limits.get("requests_per_minute", settings.PROVIDER_REQUESTS_PER_MINUTE),
+                burst=limits.get("burst", settings.PROVIDER_RATE_BURST)
+            )
+            self._limiters[key] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, provider: str, model: str = "") -> AsyncIterator[None]:
+        """
+        API 호출 1회 허가
+
+        사용 예:
+            async with admission_controller.slot("google_ai", model):
+                await client.post(...)
+        """
+        limiter = self.limiter(provider, model)
+        await limiter.acquire()
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    def get_stats(self) -> Dict:
+        """공급자/모델별 통계"""
+        return {limiter.name: limiter.get_stats() for limiter in self._limiters.values()}
+
+
+# 싱글톤 인스턴스
+admission_controller = AdmissionController()
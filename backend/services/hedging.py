@@ -0,0 +1,81 @@
+"""
+요청 헤징(hedging) 보조 도구
+- LatencyWindow: 최근 이미지 생성 시간으로 p90 등 백분위 계산
+- HedgeBudget: 중복 요청을 일반 요청의 일정 비율 이하로 제한 (할당량 보호)
+"""
+from collections import deque
+from typing import Dict, Optional
+
+# 비율 누적 시 부동소수점 오차 허용치 (예: 0.1 x 10 = 0.9999999999999999)
+_TOKEN_EPSILON = 1e-9
+
+
+class LatencyWindow:
+    """최근 N개 성공 요청의 소요 시간 (슬라이딩 윈도우)"""
+
+    def __init__(self, size: int):
+        self._samples = deque(maxlen=max(1, size))
+
+    def record(self, seconds: float):
+        """소요 시간 기록"""
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        백분위 값 (nearest-rank)
+
+        Args:
+            q: 0 ~ 1 (예: 0.9 = p90)
+
+        Returns:
+            소요 시간(초) 또는 None (기록이 없는 경우)
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))
+        return ordered[rank]
+
+
+class HedgeBudget:
+    """
+    중복 요청 예산 (토큰 버킷)
+    일반 요청마다 ratio만큼 토큰이 쌓이고, 중복 요청 1건에 토큰 1개를 사용
+    (예: ratio=0.1이면 장기적으로 중복 요청은 전체의 10% 이하)
+    """
+
+    def __init__(self, ratio: float, burst: float):
+        self.ratio = max(0.0, ratio)
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+
+        self.requests = 0
+        self.hedges = 0
+        self.denied = 0
+
+    def on_request(self):
+        """일반 요청 1건 기록 (토큰 적립)"""
+        self.requests += 1
+        self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        """중복 요청 가능 여부 (가능하면 토큰 1개 사용)"""
+        if self._tokens >= 1.0 - _TOKEN_EPSILON:
+            self._tokens = max(0.0, self._tokens - 1.0)
+            self.hedges += 1
+            return True
+        self.denied += 1
+        return False
+
+    def get_stats(self) -> Dict:
+        """예산 통계"""
+        return {
+            "ratio": self.ratio,
+            "tokens": round(self._tokens, 3),
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "denied": self.denied,
+        }
@@ -0,0 +1,73 @@
+"""
+공유 HTTP 클라이언트
+외부 이미지 생성 API 호출에 사용하는 keep-alive 커넥션 풀 (앱 시작 시 생성, 종료 시 정리)
+"""
+from typing import Optional
+import logging
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 지원 여부 (h2 패키지 설치 필요)"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPClientManager:
+    """앱 전체에서 공유하는 httpx.AsyncClient 관리자"""
+    
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """커넥션 풀 설정으로 클라이언트 생성"""
+        http2 = settings.HTTP2_ENABLED and _http2_available()
+        if settings.HTTP2_ENABLED and not http2:
+            logger.warning("⚠️ h2 패키지가 없어 HTTP/1.1로 연결합니다 (pip install 'httpx[http2]')")
+        
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        timeout = httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        )
+        
+        logger.info(
+            f"🌐 HTTP 커넥션 풀 생성: max={settings.HTTP_POOL_MAX_CONNECTIONS}, "
+            f"keepalive={settings.HTTP_POOL_MAX_KEEPALIVE}, http2={http2}"
+        )
+        return httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout)
+    
+    async def startup(self):
+        """앱 시작 시 클라이언트 생성"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+    
+    async def shutdown(self):
+        """앱 종료 시 커넥션 풀 정리"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("🌐 HTTP 커넥션 풀 종료")
+        self._client = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """공유 클라이언트 (startup 전에 호출되면 즉시 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+
+# 싱글톤 인스턴스
+http_client = HTTPClientManager()
@@ -3,89 +3,54 @@
 Replicate API를 사용한 Stable Diffusion 이미지 생성
 """
 import asyncio
-import random
-import time
 import requests
-import base64
-from typing import List, Dict, Tuple
+from typing import Dict
 import logging
 
 from config import settings
 from data.mappings import DEFAULT_GENERATION_PARAMS
+from services.image_generator_base import BaseImageGenerator, build_image_result
+from services.retry import ProviderError, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
 
-class ImageGenerator:
+class ImageGenerator(BaseImageGenerator):
     """Replicate API 기반 Stable Diffusion 이미지 생성기"""
     
+    provider_name = "replicate"
+    
     def __init__(self):
         self.api_token = settings.REPLICATE_API_TOKEN
         self.model = settings.REPLICATE_MODEL
     
-    async def generate_images(
+    async def generate_single_image(
         self,
         positive_prompt: str,
         negative_prompt: str,
         width: int,
         height: int,
-        generation_id: str
-    ) -> Tuple[List[Dict], List[int], float]:
+        seed: int,
+        generation_id: str,
+        index: int
+    ) -> Dict:
         """
-        Replicate API로 이미지 4개 생성 (비동기 병렬 처리)
+        Replicate API로 단일 이미지 생성 (동기 SDK 호출은 워커 스레드에서 실행)
+        동시 호출 제한, 재시도, 4장 병렬 생성은 BaseImageGenerator가 처리
         
-        Args:
-            positive_prompt: Positive 프롬프트
-            negative_prompt: Negative 프롬프트
-            width: 이미지 너비
-            height: 이미지 높이
-            generation_id: 생성 작업 ID
-            
         Returns:
-            (생성된 이미지 정보 리스트, 사용된 seed 리스트, 소요 시간)
+            {"image_id": str, "filename": str, "base64": str, "seed": int}
         """
-        start_time = time.time()
-        
-        # 시드값 4개 생성
-        seeds = [random.randint(1, 1000000) for _ in range(settings.DEFAULT_NUM_IMAGES)]
-        
-        logger.info(f"🎨 Replicate 이미지 생성 시작: generation_id={generation_id}")
-        logger.info(f"   모델: {self.model}")
-        logger.info(f"   프롬프트: {positive_prompt[:100]}...")
-        logger.info(f"   크기: {width}x{height}")
-        logger.info(f"   시드: {seeds}")
-        
-        # 비동기 병렬 생성
-        tasks = [
-            asyncio.to_thread(
-                self._generate_single_image_sync,
-                positive_prompt=positive_prompt,
-                negative_prompt=negative_prompt,
-                width=width,
-                height=height,
-                seed=seed,
-                generation_id=generation_id,
-                index=idx
-            )
-            for idx, seed in enumerate(seeds)
-        ]
-        
-        # 모든 이미지 생성 완료 대기
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 결과 처리
-        images = []
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"❌ 이미지 생성 실패: {result}")
-                continue
-            if result:
-                images.append(result)
-        
-        elapsed_time = time.time() - start_time
-        logger.info(f"✅ 이미지 생성 완료: {len(images)}개, {elapsed_time:.2f}초 소요")
-        
-        return images, seeds, elapsed_time
+        return await asyncio.to_thread(
+            self._generate_single_image_sync,
+            positive_prompt=positive_prompt,
+            negative_prompt=negative_prompt,
+            width=width,
+            height=height,
+            seed=seed,
+            generation_id=generation_id,
+            index=index
+        )
     
     def _generate_single_image_sync(
         self,
@@ -105,6 +70,7 @@ class ImageGenerator:
         """
         try:
             import replicate
+            from replicate.exceptions import ReplicateError
             import os
             
             # API 토큰 설정
@@ -112,20 +78,26 @@ class ImageGenerator:
             
             logger.info(f"🔄 이미지 {index} 생성 중... (seed={seed})")
             
-            # Replicate API 호출
-            output = replicate.run(
-                self.model,
-                input={
-                    "prompt": positive_prompt,
-                    "negative_prompt": negative_prompt,
-                    "width": width,
-                    "height": height,
-                    "num_inference_steps": settings.DEFAULT_NUM_INFERENCE_STEPS,
-                    "guidance_scale": settings.DEFAULT_GUIDANCE_SCALE,
-                    "seed": seed,
-                    "num_outputs": 1
-                }
-            )
+            # Replicate API 호출 (상태 코드가 있으면 재시도 여부 판단에 사용)
+            try:
+                output = replicate.run(
+                    self.model,
+                    input={
+                        "prompt": positive_prompt,
+                        "negative_prompt": negative_prompt,
+                        "width": width,
+                        "height": height,
+                        "num_inference_steps": settings.DEFAULT_NUM_INFERENCE_STEPS,
+                        "guidance_scale": settings.DEFAULT_GUIDANCE_SCALE,
+                        "seed": seed,
+                        "num_outputs": 1
+                    }
+                )
+            except ReplicateError as e:
+                raise ProviderError(
+                    f"Replicate API 호출 실패: {str(e)}",
+                    status_code=getattr(e, "status", None)
+                ) from e
             
             # Replicate는 이미지 URL을 반환
             if isinstance(output, list) and len(output) > 0:
@@ -136,40 +108,34 @@ class ImageGenerator:
             logger.info(f"📥 이미지 {index} URL 받음: {image_url[:50]}...")
             
             # 이미지 다운로드
-            response = requests.get(image_url, timeout=30)
-            response.raise_for_status()
-            image_bytes = response.content
+            try:
+                response = requests.get(image_url, timeout=30)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                raise ProviderError(f"이미지 다운로드 실패: {str(e)}", retryable=True) from e
             
-            # 이미지 크기 검증 (최대 10MB)
-            MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
-            if len(image_bytes) > MAX_IMAGE_SIZE:
-                logger.error(f"❌ 이미지 {index} 크기 초과: {len(image_bytes)} bytes (최대 {MAX_IMAGE_SIZE} bytes)")
-                raise Exception(f"Image size exceeds maximum allowed size (10MB)")
-            
-            # base64 인코딩 (서버 저장 없이 클라이언트로 직접 전달)
-            image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-            
-            # Base64 문자열 길이 검증 (약 15MB = 15,000,000 문자)
-            MAX_BASE64_LENGTH = 15_000_000
-            if len(image_base64) > MAX_BASE64_LENGTH:
-                logger.error(f"❌ Base64 인코딩 크기 초과: {len(image_base64)} characters")
-                raise Exception(f"Base64 encoded image exceeds maximum allowed size")
+            if response.status_code != 200:
+                raise ProviderError(
+                    f"이미지 다운로드 실패: {response.status_code}",
+                    status_code=response.status_code,
+                    retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                )
+            image_bytes = response.content
             
-            filename = f"{generation_id}_{index}.png"
+            # 크기 검증, 이미지 저장소 저장, base64 인코딩
+            result = build_image_result(image_bytes, generation_id, index, seed)
             
             logger.info(f"✅ 이미지 {index} base64 인코딩 완료 (seed={seed}, {len(image_bytes)} bytes)")
             
-            return {
-                "image_id": f"{generation_id}_{index}",
-                "filename": filename,
-                "base64": image_base64,
-                "seed": seed
-            }
+            return result
         
         except Exception as e:
             logger.error(f"❌ 이미지 {index} 생성 실패: {str(e)}")
             raise
     
+    def is_available(self) -> bool:
+        """API 토큰 설정 여부 (로그 없이 확인)"""
+        return bool(self.api_token)
+    
     def validate_api_token(self) -> bool:
         """API 토큰 유효성 검사"""
         if not self.api_token:
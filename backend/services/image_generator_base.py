@@ -0,0 +1,288 @@
+"""
+이미지 생성기 공통 기반 클래스
+이미지 1장 단위 생성(generate_single_image)만 구현하면
+4장 병렬 생성, 이미지별 실패 수집 등을 공통으로 제공
+"""
+import asyncio
+import base64
+import random
+import time
+from typing import AsyncIterator, List, Dict, Tuple, Optional
+import logging
+
+from config import settings
+from services.admission import admission_controller
+from services.image_store import image_store
+from services.retry import retry_policy
+
+logger = logging.getLogger(__name__)
+
+# 이미지 크기 제한 (최대 10MB)
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+
+# Base64 문자열 길이 제한 (약 15MB = 15,000,000 문자)
+MAX_BASE64_LENGTH = 15_000_000
+
+
+def build_image_result(
+    image_bytes: bytes,
+    generation_id: str,
+    index: int,
+    seed: int,
+    image_base64: Optional[str] = None,
+    extension: str = "png"
+) -> Dict:
+    """
+    생성된 이미지 바이트를 검증하고 이미지 저장소에 저장한 뒤 응답용 결과 생성
+    (동기 함수 - 이벤트 루프에서는 asyncio.to_thread로 호출)
+
+    Args:
+        image_bytes: 이미지 바이트
+        generation_id: 생성 작업 ID
+        index: 슬롯 번호
+        seed: 사용된 시드값
+        image_base64: 이미 base64로 받은 경우 재인코딩 생략
+        extension: 저장 파일 확장자 (png, webp, jpg, avif)
+
+    Returns:
+        {"image_id": str, "index": int, "filename": str, "base64": str, "seed": int, "digest": str, "size": int}
+    """
+    if len(image_bytes) > MAX_IMAGE_SIZE:
+        logger.error(f"❌ 이미지 {index} 크기 초과: {len(image_bytes)} bytes (최대 {MAX_IMAGE_SIZE} bytes)")
+        raise Exception(f"Image size exceeds maximum allowed size (10MB)")
+
+    # 내용 해시로 저장 (/api/images/{filename}으로 다시 받을 수 있음)
+    stored = image_store.put(image_bytes, extension)
+
+    if image_base64 is None:
+        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+
+    if len(image_base64) > MAX_BASE64_LENGTH:
+        logger.error(f"❌ Base64 인코딩 크기 초과: {len(image_base64)} characters")
+        raise Exception(f"Base64 encoded image exceeds maximum allowed size")
+
+    return {
+        "image_id": f"{generation_id}_{index}",
+        "index": index,
+        "filename": stored["filename"],
+        "base64": image_base64,
+        "seed": seed,
+        "digest": stored["digest"],
+        "size": stored["size"]
+    }
+
+
+class BaseImageGenerator:
+    """이미지 생성기 공통 인터페이스"""
+
+    # 로그/메트릭에 사용하는 공급자 이름
+    provider_name: str = "base"
+    model: str = ""
+
+    def validate_api_token(self) -> bool:
+        """API 토큰 유효성 검증"""
+        raise NotImplementedError
+
+    def is_available(self) -> bool:
+        """
+        API 토큰 설정 여부 (로그 없이 확인)
+        라우터가 이미지마다, /health마다 호출하므로 validate_api_token의 오류 로그를 남기지 않음
+        """
+        return self.validate_api_token()
+
+    async def startup(self):
+        """앱 시작 시 준비 작업 (커넥션 생성 등, 필요한 생성기만 구현)"""
+        pass
+
+    async def shutdown(self):
+        """앱 종료 시 정리 작업"""
+        pass
+
+    async def generate_single_image(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        seed: int,
+        generation_id: str,
+        index: int
+    ) -> Dict:
+        """
+        단일 이미지 생성 (하위 클래스에서 구현)
+
+        Returns:
+            {"image_id": str, "filename": str, "base64": str, "seed": int}
+        """
+        raise NotImplementedError
+
+    async def generate_admitted_image(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        seed: int,
+        generation_id: str,
+        index: int
+    ) -> Dict:
+        """
+        공급자 호출 제한(동시 호출 수, 분당 요청 수)을 지키며 단일 이미지 생성
+        (한도를 넘으면 실패하지 않고 순서대로 대기, 일시적 오류는 재시도)
+        """
+        def attempt():
+            return self.generate_single_image(
+                positive_prompt=positive_prompt,
+                negative_prompt=negative_prompt,
+                width=width,
+                height=height,
+                seed=seed,
+                generation_id=generation_id,
+                index=index
+            )
+        
+        # 제한 시간은 호출 허가를 받은 뒤부터 계산 (대기열에서 기다린 시간은 제외)
+        return await retry_policy.run(
+            attempt,
+            description=f"{self.provider_name} 이미지 {index+1}",
+            admit=lambda: admission_controller.slot(self.provider_name, self.model)
+        )
+
+    def new_seeds(self) -> List[int]:
+        """이미지 개수만큼 시드값 생성"""
+        return [random.randint(1, 1000000) for _ in range(settings.DEFAULT_NUM_IMAGES)]
+
+    async def _run_slot(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        seed: int,
+        generation_id: str,
+        index: int
+    ) -> Tuple[int, int, Optional[Dict], Optional[Dict]]:
+        """
+        슬롯 하나를 생성하고 예외를 결과로 변환
+
+        Returns:
+            (index, seed, 이미지 또는 None, 실패 정보 또는 None)
+        """
+        try:
+            image = await self.generate_admitted_image(
+                positive_prompt=positive_prompt,
+                negative_prompt=negative_prompt,
+                width=width,
+                height=height,
+                seed=seed,
+                generation_id=generation_id,
+                index=index
+            )
+            return index, seed, image, None
+        except Exception as e:
+            logger.error(f"❌ 이미지 {index+1} 생성 실패: {e}")
+            return index, seed, None, self.failed_slot_info(index, seed, e)
+
+    async def generate_image_slots(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        generation_id: str,
+        seeds: Optional[List[int]] = None,
+        indexes: Optional[List[int]] = None
+    ) -> Tuple[List[Dict], List[Dict], List[int], float]:
+        """
+        이미지 4개를 병렬 생성하고 이미지(슬롯)별 결과를 수집
+        일부가 실패해도 성공한 이미지는 그대로 반환
+        (indexes를 주면 seeds[i]를 슬롯 indexes[i]로 생성 - 일부 슬롯만 생성할 때 사용)
+
+        Returns:
+            (성공한 이미지 리스트, 실패한 슬롯 리스트, 사용된 seed 리스트, 소요 시간)
+            실패한 슬롯: {"index": int, "seed": int, "error": str}
+        """
+        start_time = time.time()
+        seeds = seeds or self.new_seeds()
+        indexes = indexes or list(range(len(seeds)))
+
+        results = await asyncio.gather(*[
+            self._run_slot(positive_prompt, negative_prompt, width, height, seed, generation_id, idx)
+            for idx, seed in zip(indexes, seeds)
+        ])
+
+        images = [image for _, _, image, _ in results if image]
+        failed_slots = [failed for _, _, _, failed in results if failed]
+
+        elapsed_time = time.time() - start_time
+        if failed_slots:
+            logger.warning(
+                f"⚠️ {self.provider_name}: {len(images)}개 성공, {len(failed_slots)}개 실패 "
+                f"({elapsed_time:.2f}초 소요)"
+            )
+
+        return images, failed_slots, seeds, elapsed_time
+
+    async def iter_image_slots(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        generation_id: str,
+        seeds: Optional[List[int]] = None
+    ) -> AsyncIterator[Tuple[int, int, Optional[Dict], Optional[Dict]]]:
+        """
+        이미지 4개를 병렬 생성하고 완료되는 순서대로 슬롯 결과를 반환 (스트리밍용)
+        소비자가 중단하면 남은 생성 작업은 취소
+
+        Yields:
+            (index, seed, 이미지 또는 None, 실패 정보 또는 None)
+        """
+        seeds = seeds or self.new_seeds()
+        tasks = [
+            asyncio.ensure_future(
+                self._run_slot(positive_prompt, negative_prompt, width, height, seed, generation_id, idx)
+            )
+            for idx, seed in enumerate(seeds)
+        ]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def generate_images(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        generation_id: str
+    ) -> Tuple[List[Dict], List[int], float]:
+        """
+        이미지 4개 생성 (실패한 이미지는 제외)
+
+        Returns:
+            (생성된 이미지 정보 리스트, 사용된 seed 리스트, 소요 시간)
+        """
+        images, _, seeds, elapsed_time = await self.generate_image_slots(
+            positive_prompt=positive_prompt,
+            negative_prompt=negative_prompt,
+            width=width,
+            height=height,
+            generation_id=generation_id
+        )
+        return images, seeds, elapsed_time
+
+    @staticmethod
+    def failed_slot_info(index: int, seed: int, error: BaseException) -> Dict:
+        """실패한 슬롯 정보 (보안: 프로덕션에서는 상세 에러 숨김)"""
+        return {
+            "index": index,
+            "seed": seed,
+            "error": str(error)[:300] if settings.DEBUG else "이미지 생성에 실패했습니다.",
+        }
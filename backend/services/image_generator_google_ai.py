@@ -3,22 +3,24 @@
 Google AI Studio (Nano Banana)를 사용한 이미지 생성
 """
 import asyncio
-import random
-import time
 import base64
 import json
-import requests
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import logging
 
 from config import settings
+from services.http_client import http_client
+from services.image_generator_base import BaseImageGenerator, build_image_result
+from services.retry import ProviderError, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
 
-class GoogleAIImageGenerator:
+class GoogleAIImageGenerator(BaseImageGenerator):
     """Google AI Studio (Nano Banana) 기반 이미지 생성기"""
     
+    provider_name = "google_ai"
+    
     def __init__(self):
         self.api_key = settings.GOOGLE_AI_API_KEY
         # 기본 모델: gemini-2.5-flash-image-preview (Nano Banana) - 무료 티어에서 작동 확인됨
@@ -31,16 +33,18 @@ class GoogleAIImageGenerator:
         """API 토큰 유효성 검증"""
         return bool(self.api_key and self.api_key.strip())
     
-    async def generate_images(
+    async def generate_image_slots(
         self,
         positive_prompt: str,
         negative_prompt: str,
         width: int,
         height: int,
-        generation_id: str
-    ) -> Tuple[List[Dict], List[int], float]:
+        generation_id: str,
+        seeds: Optional[List[int]] = None,
+        indexes: Optional[List[int]] = None
+    ) -> Tuple[List[Dict], List[Dict], List[int], float]:
         """
-        Google AI Studio로 이미지 4개 생성 (비동기 병렬 처리)
+        Google AI Studio로 이미지 4개 생성 (비동기 병렬 처리, 이미지별 실패 수집)
         
         Args:
             positive_prompt: Positive 프롬프트
@@ -48,45 +52,32 @@ class GoogleAIImageGenerator:
             width: 이미지 너비
             height: 이미지 높이
             generation_id: 생성 작업 ID
+            seeds: 사용할 시드값 (없으면 생성, Google AI Studio는 seed를 직접 지원하지 않을 수 있음)
+            indexes: 시드별 슬롯 번호 (없으면 0부터 순서대로)
             
         Returns:
-            (생성된 이미지 정보 리스트, 사용된 seed 리스트, 소요 시간)
+            (성공한 이미지 리스트, 실패한 슬롯 리스트, 사용된 seed 리스트, 소요 시간)
         """
-        start_time = time.time()
-        
-        # 시드값 4개 생성 (Google AI Studio는 seed를 직접 지원하지 않을 수 있음)
-        seeds = [random.randint(1, 1000000) for _ in range(settings.DEFAULT_NUM_IMAGES)]
-        
         logger.info(f"🎨 Google AI Studio 이미지 생성 시작: generation_id={generation_id}")
         logger.info(f"   모델: {self.model}")
         logger.info(f"   프롬프트: {positive_prompt[:100]}...")
         logger.info(f"   이미지 크기: {width}x{height}")
         
-        # 비동기 병렬 생성
-        tasks = [
-            self._generate_single_image_async(
-                positive_prompt=positive_prompt,
-                negative_prompt=negative_prompt,
-                width=width,
-                height=height,
-                seed=seed,
-                generation_id=generation_id,
-                index=idx
-            )
-            for idx, seed in enumerate(seeds)
-        ]
-        
-        images_data = await asyncio.gather(*tasks)
-        
-        # None 값 제거 (실패한 이미지)
-        images_data = [img for img in images_data if img is not None]
+        images_data, failed_slots, seeds, elapsed_time = await super().generate_image_slots(
+            positive_prompt=positive_prompt,
+            negative_prompt=negative_prompt,
+            width=width,
+            height=height,
+            generation_id=generation_id,
+            seeds=seeds,
+            indexes=indexes
+        )
         
-        elapsed_time = time.time() - start_time
         logger.info(f"✅ Google AI Studio 이미지 생성 완료: {len(images_data)}개, {elapsed_time:.2f}초 소요")
         
-        return images_data, seeds, elapsed_time
+        return images_data, failed_slots, seeds, elapsed_time
     
-    async def _generate_single_image_async(
+    async def generate_single_image(
         self,
         positive_prompt: str,
         negative_prompt: str,
@@ -97,35 +88,7 @@ class GoogleAIImageGenerator:
         index: int
     ) -> Dict:
         """
-        Google AI Studio로 단일 이미지 생성 (비동기)
-        
-        Returns:
-            {"image_id": str, "filename": str, "base64": str, "seed": int}
-        """
-        # 동기 함수를 비동기로 실행
-        return await asyncio.to_thread(
-            self._generate_single_image_sync,
-            positive_prompt,
-            negative_prompt,
-            width,
-            height,
-            seed,
-            generation_id,
-            index
-        )
-    
-    def _generate_single_image_sync(
-        self,
-        positive_prompt: str,
-        negative_prompt: str,
-        width: int,
-        height: int,
-        seed: int,
-        generation_id: str,
-        index: int
-    ) -> Dict:
-        """
-        Google AI Studio로 단일 이미지 생성 (동기 방식)
+        Google AI Studio로 단일 이미지 생성 (비동기, 공유 커넥션 풀 사용)
         
         Returns:
             {"image_id": str, "filename": str, "base64": str, "seed": int}
@@ -137,73 +100,43 @@ class GoogleAIImageGenerator:
                 "Content-Type": "application/json",
             }
             
-            # 프롬프트 구성 (negative prompt는 positive prompt에 포함)
-            # Google AI Studio는 negative prompt를 직접 지원하지 않으므로
-            # positive prompt에 제약사항을 추가
-            full_prompt = positive_prompt
-            if negative_prompt:
-                # Negative prompt의 주요 키워드를 제외 요청으로 변환
-                # 예: "blurry, low quality" -> "avoid blurry images, avoid low quality"
-                negative_keywords = negative_prompt.split(",")[:3]  # 처음 3개만 사용
-                negative_text = ", ".join([f"avoid {kw.strip()}" for kw in negative_keywords if kw.strip()])
-                if negative_text:
-                    full_prompt = f"{positive_prompt}. {negative_text}"
-            
-            # 이미지 크기 정보 추가 (프롬프트에 포함)
-            size_hint = f"{width}x{height} pixels"
-            full_prompt = f"{full_prompt}, {size_hint}"
-            
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": full_prompt
-                    }]
-                }],
-                # 생성 설정 (지원되는 경우)
-                "generationConfig": {
-                    "temperature": 0.7,
-                    # "seed": seed,  # Google AI Studio가 seed를 지원하는지 확인 필요
-                }
-            }
+            payload = self._build_payload(positive_prompt, negative_prompt, width, height)
             
             params = {
                 "key": self.api_key
             }
             
             logger.info(f"🔄 이미지 {index+1}/4 생성 중... (seed={seed})")
-            logger.debug(f"   프롬프트: {full_prompt[:200]}...")
+            logger.debug(f"   프롬프트: {payload['contents'][0]['parts'][0]['text'][:200]}...")
             
-            # API 호출
-            response = requests.post(url, json=payload, headers=headers, params=params, timeout=120)
+            # API 호출 (keep-alive 커넥션 재사용)
+            response = await http_client.client.post(url, json=payload, headers=headers, params=params)
             
             if response.status_code != 200:
                 error_msg = response.text[:500]
                 logger.error(f"❌ 이미지 {index+1} 생성 실패: {response.status_code}")
                 logger.error(f"   에러: {error_msg}")
                 
-                # 할당량 초과 에러 처리
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                
+                # 할당량 초과 에러 처리 (Retry-After가 있으면 그만큼 기다렸다가 재시도)
                 if response.status_code == 429:
-                    raise Exception(
+                    raise ProviderError(
                         "API 할당량을 초과했습니다. "
-                        "Google AI Studio에서 할당량을 확인하거나 유료 플랜으로 업그레이드해주세요."
+                        "Google AI Studio에서 할당량을 확인하거나 유료 플랜으로 업그레이드해주세요.",
+                        status_code=429,
+                        retry_after=retry_after
                     )
                 
-                raise Exception(f"API 호출 실패: {response.status_code} - {error_msg}")
+                raise ProviderError(
+                    f"API 호출 실패: {response.status_code} - {error_msg}",
+                    status_code=response.status_code,
+                    retry_after=retry_after
+                )
             
             result = response.json()
             
-            # 이미지 데이터 추출
-            image_base64 = None
-            if "candidates" in result:
-                for candidate in result.get("candidates", []):
-                    if "content" in candidate:
-                        parts = candidate["content"].get("parts", [])
-                        for part in parts:
-                            if "inlineData" in part:
-                                image_base64 = part["inlineData"]["data"]
-                                break
-                    if image_base64:
-                        break
+            image_base64 = self._extract_image_base64(result)
             
             if not image_base64:
                 logger.error(f"❌ 이미지 {index+1}: 응답에 이미지 데이터가 없습니다")
@@ -212,22 +145,71 @@ class GoogleAIImageGenerator:
             
             logger.info(f"✅ 이미지 {index+1} 생성 완료!")
             
-            # 이미지 ID 및 파일명 생성
-            image_id = f"{generation_id}_{index}"
-            filename = f"{image_id}.png"
-            
-            return {
-                "image_id": image_id,
-                "filename": filename,
-                "base64": image_base64,
-                "seed": seed
-            }
+            # 이미지 저장소에 저장 (파일 쓰기는 워커 스레드에서)
+            image_bytes = base64.b64decode(image_base64)
+            return await asyncio.to_thread(
+                build_image_result,
+                image_bytes,
+                generation_id,
+                index,
+                seed,
+                image_base64
+            )
             
         except Exception as e:
             logger.error(f"❌ 이미지 {index+1} 생성 중 에러: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            if not isinstance(e, ProviderError):
+                import traceback
+                logger.error(traceback.format_exc())
             raise
+    
+    def _build_payload(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int
+    ) -> Dict:
+        """generateContent 요청 본문 생성"""
+        # 프롬프트 구성 (negative prompt는 positive prompt에 포함)
+        # Google AI Studio는 negative prompt를 직접 지원하지 않으므로
+        # positive prompt에 제약사항을 추가
+        full_prompt = positive_prompt
+        if negative_prompt:
+            # Negative prompt의 주요 키워드를 제외 요청으로 변환
+            # 예: "blurry, low quality" -> "avoid blurry images, avoid low quality"
+            negative_keywords = negative_prompt.split(",")[:3]  # 처음 3개만 사용
+            negative_text = ", ".join([f"avoid {kw.strip()}" for kw in negative_keywords if kw.strip()])
+            if negative_text:
+                full_prompt = f"{positive_prompt}. {negative_text}"
+        
+        # 이미지 크기 정보 추가 (프롬프트에 포함)
+        size_hint = f"{width}x{height} pixels"
+        full_prompt = f"{full_prompt}, {size_hint}"
+        
+        return {
+            "contents": [{
+                "parts": [{
+                    "text": full_prompt
+                }]
+            }],
+            # 생성 설정 (지원되는 경우)
+            "generationConfig": {
+                "temperature": 0.7,
+                # "seed": seed,  # Google AI Studio가 seed를 지원하는지 확인 필요
+            }
+        }
+    
+    @staticmethod
+    def _extract_image_base64(result: Dict):
+        """응답에서 첫 번째 이미지(base64) 추출"""
+        for candidate in result.get("candidates", []):
+            if "content" in candidate:
+                parts = candidate["content"].get("parts", [])
+                for part in parts:
+                    if "inlineData" in part:
+                        return part["inlineData"]["data"]
+        return None
 
 
 # 싱글톤 인스턴스
@@ -3,163 +3,114 @@
 Hugging Face Hub + fal-ai provider를 사용한 Stable Diffusion 이미지 생성
 """
 import asyncio
-import random
-import time
-import base64
-import io
-from typing import List, Dict, Tuple
+from typing import Dict
 import logging
 
 from config import settings
 from data.mappings import DEFAULT_GENERATION_PARAMS
+from services.image_generator_base import BaseImageGenerator, build_image_result
+from services.image_processing import image_processor
+from services.retry import ProviderError, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
 
-class HuggingFaceImageGenerator:
+class HuggingFaceImageGenerator(BaseImageGenerator):
     """Hugging Face Hub (fal-ai provider) 기반 Stable Diffusion 이미지 생성기"""
     
+    provider_name = "huggingface"
+    
     def __init__(self):
         self.api_token = settings.HUGGINGFACE_API_TOKEN
         self.model = "stabilityai/stable-diffusion-3-medium"
     
-    async def generate_images(
+    async def generate_single_image(
         self,
         positive_prompt: str,
         negative_prompt: str,
         width: int,
         height: int,
-        generation_id: str
-    ) -> Tuple[List[Dict], List[int], float]:
+        seed: int,
+        generation_id: str,
+        index: int
+    ) -> Dict:
         """
-        Hugging Face Hub + fal-ai로 이미지 4개 생성 (비동기 병렬 처리)
+        Hugging Face Hub + fal-ai로 단일 이미지 생성 (동기 SDK 호출은 워커 스레드에서 실행)
+        동시 호출 제한, 재시도, 4장 병렬 생성은 BaseImageGenerator가 처리
         
-        Args:
-            positive_prompt: Positive 프롬프트
-            negative_prompt: Negative 프롬프트
-            width: 이미지 너비
-            height: 이미지 높이
-            generation_id: 생성 작업 ID
-            
         Returns:
-            (생성된 이미지 정보 리스트, 사용된 seed 리스트, 소요 시간)
+            {"image_id": str, "filename": str, "base64": str, "seed": int}
         """
-        start_time = time.time()
-        
-        # 시드값 4개 생성
-        seeds = [random.randint(1, 1000000) for _ in range(settings.DEFAULT_NUM_IMAGES)]
-        
-        logger.info(f"🎨 Hugging Face (fal-ai) 이미지 생성 시작: generation_id={generation_id}")
-        logger.info(f"   모델: {self.model}")
-        logger.info(f"   프롬프트: {positive_prompt[:100]}...")
-        logger.info(f"   크기: {width}x{height}")
-        logger.info(f"   시드: {seeds}")
-        
-        # 비동기 병렬 생성
-        tasks = [
-            asyncio.to_thread(
-                self._generate_single_image_sync,
+        try:
+            image = await asyncio.to_thread(
+                self._text_to_image_sync,
                 positive_prompt=positive_prompt,
                 negative_prompt=negative_prompt,
-                width=width,
-                height=height,
-                seed=seed,
-                generation_id=generation_id,
-                index=idx
+                index=index
             )
-            for idx, seed in enumerate(seeds)
-        ]
-        
-        # 모든 이미지 생성 완료 대기
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 결과 처리
-        images = []
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"❌ 이미지 생성 실패: {result}")
-                continue
-            if result:
-                images.append(result)
-        
-        elapsed_time = time.time() - start_time
-        logger.info(f"✅ 이미지 생성 완료: {len(images)}개, {elapsed_time:.2f}초 소요")
+            
+            # PNG 바이트로 변환 (프로세스 풀에서 인코딩)
+            image_bytes = await image_processor.encode_png(image)
+            
+            # 크기 검증, 이미지 저장소 저장, base64 인코딩
+            result = await asyncio.to_thread(build_image_result, image_bytes, generation_id, index, seed)
+            
+            logger.info(f"✅ 이미지 {index} base64 인코딩 완료 (seed={seed}, {len(image_bytes)} bytes)")
+            
+            return result
         
-        return images, seeds, elapsed_time
+        except Exception as e:
+            logger.error(f"❌ 이미지 {index} 생성 실패: {str(e)}")
+            raise
     
-    def _generate_single_image_sync(
+    def _text_to_image_sync(
         self,
         positive_prompt: str,
         negative_prompt: str,
-        width: int,
-        height: int,
-        seed: int,
-        generation_id: str,
         index: int
-    ) -> Dict:
+    ):
         """
         Hugging Face Hub + fal-ai로 단일 이미지 생성 (동기 방식)
         
         Returns:
-            {"image_id": str, "filename": str, "url": str, "seed": int}
+            PIL Image
         """
+        from huggingface_hub import InferenceClient
+        from huggingface_hub.utils import HfHubHTTPError
+        
+        logger.info(f"🔄 이미지 {index} 생성 중...")
+        
+        # InferenceClient 생성
+        client = InferenceClient(
+            provider="fal-ai",
+            api_key=self.api_token,
+        )
+        
+        # 프롬프트 결합 (negative prompt는 일부 모델에서 지원하지 않을 수 있음)
+        full_prompt = positive_prompt
+        if negative_prompt:
+            full_prompt += f" [Negative: {negative_prompt}]"
+        
+        # 이미지 생성 (HTTP 오류는 상태 코드/Retry-After와 함께 전달하여 재시도 여부 판단)
         try:
-            from huggingface_hub import InferenceClient
-            
-            logger.info(f"🔄 이미지 {index} 생성 중... (seed={seed})")
-            
-            # InferenceClient 생성
-            client = InferenceClient(
-                provider="fal-ai",
-                api_key=self.api_token,
-            )
-            
-            # 프롬프트 결합 (negative prompt는 일부 모델에서 지원하지 않을 수 있음)
-            full_prompt = positive_prompt
-            if negative_prompt:
-                full_prompt += f" [Negative: {negative_prompt}]"
-            
-            # 이미지 생성
             image = client.text_to_image(
                 full_prompt,
                 model=self.model,
             )
-            
-            logger.info(f"✅ 이미지 {index} 생성 완료!")
-            
-            # 이미지를 base64로 인코딩 (서버 저장 없이 클라이언트로 직접 전달)
-            buffer = io.BytesIO()
-            image.save(buffer, format='PNG')
-            image_bytes = buffer.getvalue()
-            
-            # 이미지 크기 검증 (최대 10MB)
-            MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
-            if len(image_bytes) > MAX_IMAGE_SIZE:
-                logger.error(f"❌ 이미지 {index} 크기 초과: {len(image_bytes)} bytes (최대 {MAX_IMAGE_SIZE} bytes)")
-                raise Exception(f"Image size exceeds maximum allowed size (10MB)")
-            
-            image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-            
-            # Base64 문자열 길이 검증 (약 15MB = 15,000,000 문자)
-            MAX_BASE64_LENGTH = 15_000_000
-            if len(image_base64) > MAX_BASE64_LENGTH:
-                logger.error(f"❌ Base64 인코딩 크기 초과: {len(image_base64)} characters")
-                raise Exception(f"Base64 encoded image exceeds maximum allowed size")
-            
-            filename = f"{generation_id}_{index}.png"
-            
-            logger.info(f"✅ 이미지 {index} base64 인코딩 완료 (seed={seed}, {len(image_bytes)} bytes)")
-            
-            return {
-                "image_id": f"{generation_id}_{index}",
-                "filename": filename,
-                "base64": image_base64,
-                "seed": seed
-            }
+        except HfHubHTTPError as e:
+            response = e.response
+            raise ProviderError(
+                f"Hugging Face API 호출 실패: {str(e)}",
+                status_code=response.status_code if response is not None else None,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+            ) from e
         
-        except Exception as e:
-            logger.error(f"❌ 이미지 {index} 생성 실패: {str(e)}")
-            raise
+        logger.info(f"✅ 이미지 {index} 생성 완료!")
+        return image
+    
+    def is_available(self) -> bool:
+        """API 토큰 설정 여부 (로그 없이 확인)"""
+        return bool(self.api_token)
     
     def validate_api_token(self) -> bool:
         """API 토큰 유효성 검사"""
@@ -0,0 +1,335 @@
+"""
+이미지 후처리 서비스
+리사이즈/크롭/PNG·WebP·JPEG·AVIF 인코딩 같은 CPU 작업을 프로세스 풀에서 실행하여
+GIL과 이벤트 루프를 막지 않고 여러 코어로 분산
+(큰 버퍼는 pickle 대신 공유 메모리로 주고받음)
+"""
+import asyncio
+import io
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+import logging
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 출력 형식: 요청 값 -> PIL 형식, 파일 확장자, media type
+OUTPUT_FORMATS = {
+    "png": {"pil_format": "PNG", "extension": "png", "media_type": "image/png"},
+    "webp": {"pil_format": "WEBP", "extension": "webp", "media_type": "image/webp"},
+    "jpeg": {"pil_format": "JPEG", "extension": "jpg", "media_type": "image/jpeg"},
+    "avif": {"pil_format": "AVIF", "extension": "avif", "media_type": "image/avif"},
+}
+
+# 확장자 -> media type (이미지 다운로드 응답용)
+MEDIA_TYPES = {fmt["extension"]: fmt["media_type"] for fmt in OUTPUT_FORMATS.values()}
+
+# 품질 단계 (손실 압축 형식에만 적용, PNG는 항상 무손실)
+QUALITY_TIERS = {
+    "master": 95,  # 원본 보관/인쇄용
+    "standard": 85,
+    "preview": 70,  # SNS 미리보기용
+}
+
+
+def is_format_supported(output_format: str) -> bool:
+    """설치된 Pillow가 해당 형식 인코딩을 지원하는지 확인 (AVIF는 빌드에 따라 없을 수 있음)"""
+    from PIL import features
+
+    if output_format == "webp":
+        return features.check("webp")
+    if output_format == "avif":
+        return bool(features.check("avif"))
+    return output_format in OUTPUT_FORMATS
+
+
+def fit_image(img, width: int, height: int):
+    """
+    비율을 유지하면서 리사이즈 후 중앙 크롭 (요청 크기와 같으면 그대로)
+
+    Args:
+        img: PIL Image
+        width: 목표 너비
+        height: 목표 높이
+
+    Returns:
+        PIL Image
+    """
+    from PIL import Image
+
+    original_width, original_height = img.size
+    if original_width == width and original_height == height:
+        return img
+
+    # 1. 비율 계산
+    target_ratio = width / height
+    original_ratio = original_width / original_height
+
+    if target_ratio > original_ratio:
+        # 타겟이 더 넓음: 높이 기준으로 리사이즈 후 좌우 크롭
+        new_height = height
+        new_width = int(original_width * (height / original_height))
+        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # 좌우 중앙 크롭
+        left = (new_width - width) // 2
+        return img.crop((left, 0, left + width, height))
+
+    # 타겟이 더 높음: 너비 기준으로 리사이즈 후 상하 크롭
+    new_width = width
+    new_height = int(original_height * (width / original_width))
+    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    # 상하 중앙 크롭
+    top = (new_height - height) // 2
+    return img.crop((0, top, width, top + height))
+
+
+def _encode(
+    img,
+    width: Optional[int],
+    height: Optional[int],
+    output_format: str = "png",
+    quality: Optional[int] = None,
+    optimize: bool = False,
+    max_side: Optional[int] = None
+) -> bytes:
+    """크기 조정(선택) 후 지정한 형식으로 인코딩 (max_side: 비율 유지 축소, 썸네일용)"""
+    if width and height:
+        img = fit_image(img, width, height)
+    if max_side and max(img.size) > max_side:
+        from PIL import Image
+
+        img = img.copy()
+        img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+    pil_format = OUTPUT_FORMATS[output_format]["pil_format"]
+    if pil_format == "PNG":
+        params = {"optimize": optimize}
+    elif pil_format == "JPEG":
+        # JPEG는 알파 채널을 지원하지 않음
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        params = {"quality": quality, "optimize": True, "progressive": True}
+    elif pil_format == "WEBP":
+        params = {"quality": quality, "method": 4}
+    else:
+        params = {"quality": quality}
+
+    buffer = io.BytesIO()
+    img.save(buffer, format=pil_format, **params)
+    return buffer.getvalue()
+
+
+def _encode_file(
+    path: str,
+    width: Optional[int],
+    height: Optional[int],
+    output_format: str = "png",
+    quality: Optional[int] = None,
+    optimize: bool = False,
+    max_side: Optional[int] = None
+) -> bytes:
+    """이미지 파일을 열어 크기 조정 후 인코딩 (스레드 실행용)"""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        return _encode(img, width, height, output_format, quality, optimize, max_side)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    공유 메모리 연결 (정리는 만든 쪽 책임)
+    Python 3.11은 연결만 해도 resource_tracker에 등록되어 종료 시 블록을 지우므로 등록 해제
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _process_in_worker(
+    source: Tuple,
+    width: Optional[int],
+    height: Optional[int],
+    output_format: str,
+    quality: Optional[int],
+    optimize: bool,
+    max_side: Optional[int] = None
+) -> Tuple[str, int]:
+    """
+    프로세스 풀 워커: 이미지를 열어 크기 조정 후 인코딩
+    결과는 새 공유 메모리 블록에 쓰고 (이름, 크기)만 반환 (블록 해제는 호출 측에서)
+
+    Args:
+        source: ("file", 경로) 또는 ("raw", 공유 메모리 이름, 바이트 수, 모드, 너비, 높이)
+    """
+    from PIL import Image
+
+    if source[0] == "file":
+        img = Image.open(source[1])
+        img.load()
+    else:
+        _, name, length, mode, raw_width, raw_height = source
+        shm = _attach(name)
+        try:
+            img = Image.frombytes(mode, (raw_width, raw_height), bytes(shm.buf[:length]))
+        finally:
+            shm.close()
+
+    with img:
+        data = _encode(img, width, height, output_format, quality, optimize, max_side)
+
+    out = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+    try:
+        out.buf[:len(data)] = data
+        return out.name, len(data)
+    finally:
+        # 블록은 호출 측에서 읽은 뒤 해제하므로 워커 종료 시 자동 삭제되지 않게 등록 해제
+        resource_tracker.unregister(out._name, "shared_memory")
+        out.close()
+
+
+def _read_and_release(name: str, size: int) -> bytes:
+    """워커가 만든 결과 블록을 읽고 해제 (unlink가 resource_tracker 등록도 함께 해제)"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(shm.buf[:size])
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _release_abandoned(future: Future):
+    """호출 측이 취소된 작업의 결과 블록 해제 (워커는 취소와 무관하게 작업을 마침)"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    name, _ = future.result()
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+class ImagePostProcessor:
+    """제한된 크기의 ProcessPoolExecutor로 이미지 후처리 실행"""
+
+    def __init__(self, max_workers: int):
+        # 0이면 프로세스 풀 없이 워커 스레드에서 실행
+        self.max_workers = max(0, max_workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            # 대기 작업이 무한히 쌓이지 않도록 워커 수의 2배까지만 동시에 제출
+            self._slots = asyncio.Semaphore(self.max_workers * 2)
+            logger.info(f"🧮 이미지 후처리 프로세스 풀 시작: 워커 {self.max_workers}개")
+        return self._executor
+
+    async def _run(
+        self,
+        source: Tuple,
+        width: Optional[int],
+        height: Optional[int],
+        output_format: str = "png",
+        quality: Optional[int] = None,
+        optimize: bool = False,
+        max_side: Optional[int] = None
+    ) -> bytes:
+        """프로세스 풀에서 후처리 실행 (결과는 공유 메모리로 받음)"""
+        executor = self._get_executor()
+        async with self._slots:
+            future = executor.submit(
+                _process_in_worker, source, width, height, output_format, quality, optimize, max_side
+            )
+            try:
+                name, size = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # 헤징 패자, 클라이언트 연결 종료 등으로 취소되면 결과를 읽을 곳이 없으므로
+                # 실행 중인 작업이 끝나는 대로 공유 메모리 블록 해제 (/dev/shm 누수 방지)
+                future.add_done_callback(_release_abandoned)
+                raise
+        return _read_and_release(name, size)
+
+    async def fit_file_to_png(self, path: str, width: int, height: int) -> bytes:
+        """
+        이미지 파일을 요청 크기로 맞춘 뒤 PNG 바이트로 변환 (Gradio 결과 파일 등)
+
+        Args:
+            path: 이미지 파일 경로
+            width: 목표 너비
+            height: 목표 높이
+        """
+        if self.max_workers == 0:
+            return await asyncio.to_thread(_encode_file, path, width, height, "png", None, True)
+        return await self._run(("file", path), width, height, optimize=True)
+
+    async def convert_file(self, path: str, output_format: str, quality_tier: str = "standard") -> bytes:
+        """
+        저장된 이미지 파일을 다른 형식으로 변환 (크기는 유지)
+
+        Args:
+            path: 이미지 파일 경로
+            output_format: png, webp, jpeg, avif
+            quality_tier: master, standard, preview (손실 압축 형식에만 적용)
+        """
+        quality = QUALITY_TIERS[quality_tier]
+        if self.max_workers == 0:
+            return await asyncio.to_thread(_encode_file, path, None, None, output_format, quality, True)
+        return await self._run(("file", path), None, None, output_format, quality, optimize=True)
+
+    async def thumbnail_file(self, path: str, max_side: int, output_format: str = "webp") -> bytes:
+        """
+        저장된 이미지 파일로 미리보기 썸네일 생성 (비율 유지, 긴 변이 max_side 이하)
+
+        Args:
+            path: 이미지 파일 경로
+            max_side: 썸네일 긴 변 길이 (px)
+            output_format: png, webp, jpeg, avif (preview 품질 단계 사용)
+        """
+        quality = QUALITY_TIERS["preview"]
+        if self.max_workers == 0:
+            return await asyncio.to_thread(
+                _encode_file, path, None, None, output_format, quality, False, max_side
+            )
+        return await self._run(("file", path), None, None, output_format, quality, max_side=max_side)
+
+    async def encode_png(self, image) -> bytes:
+        """
+        PIL Image를 PNG 바이트로 변환 (픽셀 데이터는 공유 메모리로 전달)
+
+        Args:
+            image: PIL Image
+        """
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGB")
+
+        if self.max_workers == 0:
+            return await asyncio.to_thread(_encode, image, None, None)
+
+        raw = image.tobytes()
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(raw)))
+        try:
+            shm.buf[:len(raw)] = raw
+            source = ("raw", shm.name, len(raw), image.mode, image.width, image.height)
+            return await self._run(source, None, None)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self):
+        """프로세스 풀 종료 (앱 종료 시 호출)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# 싱글톤 인스턴스
+image_processor = ImagePostProcessor(
+    max_workers=settings.IMAGE_PROCESS_WORKERS
+    if settings.IMAGE_PROCESS_WORKERS >= 0 else min(4, os.cpu_count() or 1)
+)
@@ -0,0 +1,156 @@
+"""
+이미지 저장소 서비스
+생성된 이미지를 내용 해시(SHA-256)로 디스크에 저장 (content-addressed)
+- 하위 디렉토리 분산: ab/cd/abcd...png
+- 임시 파일 작성 후 os.replace로 원자적 저장
+- 전체 용량 초과 시 가장 오래 사용하지 않은 이미지부터 삭제
+"""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 저장소 파일명 형식: <sha256>.<확장자>
+STORE_FILENAME_PATTERN = re.compile(r'^([0-9a-f]{64})\.(png|webp|jpg|avif)$')
+
+
+class ImageStore:
+    """내용 해시 기반 디스크 이미지 저장소 (스레드 안전)"""
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        # 파일명 -> 크기 (최근 사용 순서)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._evictions = 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """기존 저장 파일을 수정 시각 순으로 색인 (재시작 후에도 용량 제한 유지)"""
+        files = []
+        for path in self.root.glob("*/*/*"):
+            if STORE_FILENAME_PATTERN.match(path.name):
+                stat = path.stat()
+                files.append((stat.st_mtime, path.name, stat.st_size))
+
+        for _, filename, size in sorted(files):
+            self._entries[filename] = size
+            self._total_bytes += size
+
+        if files:
+            logger.info(f"🗄️ 이미지 저장소 로드: {len(files)}개, {self._total_bytes / 1024 / 1024:.1f}MB")
+
+    def _path_for(self, filename: str) -> Path:
+        """파일명 -> 분산 디렉토리 경로 (ab/cd/abcd....png)"""
+        return self.root / filename[:2] / filename[2:4] / filename
+
+    def put(self, data: bytes, extension: str = "png") -> Dict:
+        """
+        이미지 저장 (같은 내용이면 기존 파일 재사용)
+
+        Args:
+            data: 이미지 바이트
+            extension: 파일 확장자
+
+        Returns:
+            {"digest": str, "filename": str, "size": int}
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        filename = f"{digest}.{extension}"
+        path = self._path_for(filename)
+
+        with self._lock:
+            if filename in self._entries and path.exists():
+                self._entries.move_to_end(filename)
+                return {"digest": digest, "filename": filename, "size": len(data)}
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 임시 파일에 쓴 뒤 원자적으로 교체 (읽는 쪽은 항상 완성된 파일만 봄)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        with self._lock:
+            if filename not in self._entries:
+                self._entries[filename] = len(data)
+                self._total_bytes += len(data)
+            self._entries.move_to_end(filename)
+            self._evict_locked()
+
+        return {"digest": digest, "filename": filename, "size": len(data)}
+
+    def get_path(self, filename: str) -> Optional[Path]:
+        """
+        저장된 이미지 경로 조회
+
+        Args:
+            filename: 저장소 파일명 (<sha256>.png, .webp, .jpg, .avif)
+
+        Returns:
+            파일 경로 또는 None (형식이 다르거나 없는 경우)
+        """
+        if not STORE_FILENAME_PATTERN.match(filename):
+            return None
+
+        path = self._path_for(filename)
+        if not path.exists():
+            with self._lock:
+                size = self._entries.pop(filename, None)
+                if size is not None:
+                    self._total_bytes -= size
+            return None
+
+        with self._lock:
+            if filename in self._entries:
+                self._entries.move_to_end(filename)
+        return path
+
+    def _evict_locked(self):
+        """용량 초과 시 가장 오래 사용하지 않은 이미지 삭제 (lock 보유 상태에서 호출)"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            filename, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._evictions += 1
+            try:
+                self._path_for(filename).unlink()
+            except FileNotFoundError:
+                pass
+            logger.info(f"🗑️ 이미지 저장소 용량 초과로 삭제: {filename}")
+
+    def get_stats(self) -> Dict:
+        """저장소 통계"""
+        with self._lock:
+            return {
+                "images": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+            }
+
+
+# 싱글톤 인스턴스
+image_store = ImageStore(
+    root=settings.GENERATED_IMAGES_DIR,
+    max_bytes=settings.IMAGE_STORE_MAX_BYTES
+)
@@ -0,0 +1,136 @@
+"""
+생성 작업 큐 서비스
+긴 이미지 생성 요청을 즉시 접수하고 제한된 수의 워커가 순서대로 처리
+(클라이언트는 generation_id로 상태를 조회)
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+import logging
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """작업 큐가 가득 찬 경우"""
+    pass
+
+
+class GenerationJobQueue:
+    """asyncio 기반 제한 크기 작업 큐 + 워커 풀"""
+
+    def __init__(self, num_workers: int, maxsize: int):
+        self.num_workers = max(1, num_workers)
+        self.maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        # 메트릭
+        self._busy_workers = 0
+        self._busy_seconds = 0.0
+        self._started_at: Optional[float] = None
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    async def start(self):
+        """워커 시작 (앱 시작 시 호출)"""
+        if self._workers:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._started_at = time.monotonic()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"generation-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+        logger.info(f"🧵 생성 작업 큐 시작: 워커 {self.num_workers}개, 최대 대기 {self.maxsize}개")
+
+    async def stop(self):
+        """워커 종료 (앱 종료 시 호출, 대기 중인 작업은 버림)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("🧵 생성 작업 큐 종료")
+
+    def submit(self, job_id: str, job: Callable[[], Awaitable[None]]) -> int:
+        """
+        작업 등록
+
+        Args:
+            job_id: 작업 ID (generation_id)
+            job: 실행할 코루틴 함수 (예외는 워커가 기록만 함)
+
+        Returns:
+            등록 직후 대기열 길이 (현재 작업 포함)
+
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+        """
+        if self._queue is None:
+            raise QueueFullError("작업 큐가 시작되지 않았습니다.")
+
+        try:
+            self._queue.put_nowait((job_id, job, time.monotonic()))
+        except asyncio.QueueFull:
+            raise QueueFullError("생성 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+        self._submitted += 1
+        return self._queue.qsize()
+
+    async def _worker(self, worker_index: int):
+        """대기열에서 작업을 꺼내 순서대로 실행"""
+        while True:
+            job_id, job, enqueued_at = await self._queue.get()
+
+            wait_seconds = time.monotonic() - enqueued_at
+            self._total_wait_seconds += wait_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+
+            self._busy_workers += 1
+            started_at = time.monotonic()
+            try:
+                logger.info(f"🧵 워커 {worker_index}: 작업 시작 {job_id} (대기 {wait_seconds:.2f}초)")
+                await job()
+                self._completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed += 1
+                logger.error(f"❌ 워커 {worker_index}: 작업 실패 {job_id}: {str(e)}")
+            finally:
+                self._busy_workers -= 1
+                self._busy_seconds += time.monotonic() - started_at
+                self._queue.task_done()
+
+    def get_stats(self) -> Dict:
+        """큐 깊이, 대기 시간, 워커 사용률 통계"""
+        started = self._submitted - (self._queue.qsize() if self._queue else 0)
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_maxsize": self.maxsize,
+            "workers": self.num_workers,
+            "busy_workers": self._busy_workers,
+            "worker_utilization": round(
+                self._busy_seconds / (uptime * self.num_workers), 4
+            ) if uptime else 0.0,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "avg_wait_seconds": round(self._total_wait_seconds / started, 3) if started else 0.0,
+            "max_wait_seconds": round(self._max_wait_seconds, 3),
+        }
+
+
+# 싱글톤 인스턴스
+generation_queue = GenerationJobQueue(
+    num_workers=settings.GENERATION_WORKERS,
+    maxsize=settings.GENERATION_QUEUE_MAXSIZE
+)
@@ -0,0 +1,169 @@
+"""
+장소 자동완성 서비스
+LOCATION_DATA의 영문명/한글명/검색 키워드를 정렬 배열로 색인하여
+접두어 검색(bisect)으로 priority 순 상위 k개 장소를 반환
+(한글은 자모 분해/초성 키로 색인하여 "팔", "ㅍㄹ" 같은 입력도 매칭)
+"""
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+import logging
+
+from data.mappings import (
+    LOCATION_DATA,
+    LOCATION_HINTS_KR,
+    get_location_index_version,
+    search_locations,
+)
+from data.hangul import has_hangul, decompose, choseong
+
+logger = logging.getLogger(__name__)
+
+# 자동완성 최대 반환 개수
+MAX_SUGGESTIONS = 20
+
+# 이 길이 이하의 접두어는 결과 범위가 넓으므로 상위 결과를 미리 계산
+PRECOMPUTED_PREFIX_LENGTH = 2
+
+
+class LocationSuggester:
+    """정렬 배열 + bisect 기반 장소 자동완성 인덱스"""
+
+    def __init__(self, location_data: Dict[str, Dict]):
+        self._location_data = location_data
+        self._build()
+
+    def _build(self):
+        """색인 구축 (LOCATION_DATA 순서를 동률 시 우선순위로 사용)"""
+        # (정규화 키, 원본 텍스트, 순위, location_id)
+        # 순위: (priority, 필드 순위, LOCATION_DATA 순서) - 작을수록 우선
+        entries: List[Tuple[str, str, Tuple[int, int, int], str]] = []
+
+        ordinals = {}
+        for ordinal, (location_id, location) in enumerate(self._location_data.items()):
+            ordinals[location_id] = ordinal
+            for text, field_rank in self._iter_names(location):
+                rank = (location["priority"], field_rank, ordinal)
+                for key in self._iter_keys(text):
+                    entries.append((key, text, rank, location_id))
+
+        # 한글 장소 힌트 중 LOCATION_DATA로 연결되는 항목 (예: "에펠탑" -> PAR_EIF)
+        # 해변, 산 같은 일반 장소 유형(LOCATION_CATEGORY_HINTS_KR)은 특정 장소로 연결하지 않음
+        for name_kr, term_en in LOCATION_HINTS_KR.items():
+            matches = search_locations(term_en, limit=1)
+            if not matches or matches[0]["id"] not in ordinals:
+                continue
+            location = matches[0]
+            rank = (location["priority"], 1, ordinals[location["id"]])
+            for key in self._iter_keys(name_kr):
+                entries.append((key, name_kr, rank, location["id"]))
+
+        entries.sort()
+        self._keys = [entry[0] for entry in entries]
+        self._entries = entries
+
+        # 짧은 접두어는 범위 스캔 비용이 크므로 상위 결과를 미리 계산
+        self._precomputed: Dict[str, List[Tuple[str, str]]] = {}
+        prefixes = {key[:n] for key in self._keys for n in range(1, PRECOMPUTED_PREFIX_LENGTH + 1)}
+        for prefix in prefixes:
+            self._precomputed[prefix] = self._scan(prefix, MAX_SUGGESTIONS)
+
+        self.index_version = get_location_index_version()
+        logger.info(f"📍 장소 자동완성 색인 구축: {len(self._location_data)}개 장소, {len(entries)}개 키")
+
+    @staticmethod
+    def _iter_names(location: Dict):
+        """자동완성 대상 텍스트와 필드 순위 (표시명 > 도시/국가명 > 검색 키워드)"""
+        names = [
+            (location["display_name_en"], 0),
+            (location["display_name_kr"], 0),
+            (location["city_en"], 1),
+            (location["city_kr"], 1),
+            (location["country_en"], 1),
+            (location["country_kr"], 1),
+            *((keyword, 2) for keyword in location["search_keywords"]),
+        ]
+        seen = set()
+        for name, field_rank in names:
+            if name and name not in seen:
+                seen.add(name)
+                yield name, field_rank
+
+    @staticmethod
+    def _iter_keys(text: str):
+        """
+        정규화 키 - 전체 이름 및 각 단어 시작 위치부터의 접미어 (예: "eiffel tower", "tower")
+        한글은 자모 분해 키("ㅍㅏㄹㅣ")와 초성 키("ㅍㄹ")를 함께 생성
+        """
+        words = normalize_query(text).split(" ")
+        for i in range(len(words)):
+            suffix = " ".join(words[i:])
+            if has_hangul(suffix):
+                compact = suffix.replace(" ", "")
+                yield decompose(compact)
+                yield choseong(compact)
+            else:
+                yield suffix
+
+    def _scan(self, prefix: str, limit: int) -> List[Tuple[str, str]]:
+        """접두어 범위를 스캔하여 순위순 (location_id, 매칭 텍스트) 반환"""
+        best: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        start = bisect_left(self._keys, prefix)
+        for key, text, rank, location_id in self._entries[start:]:
+            if not key.startswith(prefix):
+                break
+            current = best.get(location_id)
+            if current is None or rank < current[0]:
+                best[location_id] = (rank, text)
+
+        ranked = sorted(best.items(), key=lambda item: item[1][0])
+        return [(location_id, text) for location_id, (_, text) in ranked[:limit]]
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        접두어로 장소 자동완성
+
+        Args:
+            query: 사용자가 입력 중인 텍스트
+            limit: 반환할 최대 결과 수
+
+        Returns:
+            priority 순으로 정렬된 자동완성 결과 리스트
+        """
+        prefix = normalize_query(query)
+        if not prefix:
+            return []
+        if has_hangul(prefix):
+            prefix = decompose(prefix.replace(" ", ""))
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+
+        if self.index_version != get_location_index_version():
+            # LOCATION_DATA가 변경되어 인덱스가 재구축된 경우
+            self._build()
+
+        matches = self._precomputed.get(prefix)
+        if matches is None:
+            matches = [] if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH else self._scan(prefix, limit)
+
+        suggestions = []
+        for location_id, matched_text in matches[:limit]:
+            location = self._location_data[location_id]
+            suggestions.append({
+                "id": location_id,
+                "display_name_en": location["display_name_en"],
+                "display_name_kr": location["display_name_kr"],
+                "city_en": location["city_en"],
+                "country_en": location["country_en"],
+                "type": location["type"],
+                "priority": location["priority"],
+                "matched_text": matched_text,
+            })
+        return suggestions
+
+
+def normalize_query(text: str) -> str:
+    """자동완성 키 정규화 (소문자, 연속 공백 제거)"""
+    return " ".join(text.lower().split())
+
+
+# 싱글톤 인스턴스
+location_suggester = LocationSuggester(LOCATION_DATA)
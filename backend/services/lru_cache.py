@@ -0,0 +1,65 @@
+"""
+크기 제한 LRU 캐시
+자주 반복되는 계산 결과(장소 프롬프트 등)를 메모리에 보관하고 적중률 통계를 제공
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """최대 항목 수가 제한된 LRU 캐시 (단일 이벤트 루프에서 사용)"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = max(0, maxsize)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        캐시 조회 (적중 시 최근 사용으로 갱신)
+        
+        Returns:
+            캐시된 값 또는 None
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: Hashable, value: Any):
+        """캐시 저장 (최대 크기 초과 시 가장 오래된 항목 제거)"""
+        if self.maxsize == 0:
+            return
+        
+        self._data[key] = value
+        self._data.move_to_end(key)
+        
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        """모든 항목 제거 (통계는 유지)"""
+        self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
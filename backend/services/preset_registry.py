@@ -0,0 +1,122 @@
+"""
+브랜드 프리셋 레지스트리
+(톤앤매너, 국적, 연령대) 조합마다 BrandPreset과 파생 프롬프트 조각을 한 번만 만들어 공유
+세션은 프리셋 키만 보관하고, 프롬프트 생성 시 미리 채워 둔 인물 템플릿 등을 그대로 사용
+"""
+from typing import Dict, Tuple
+import logging
+
+from models.preset import BrandPreset
+from data.mappings import AGE_GROUP_MAP, BRAND_PRESETS, NATIONALITY_MAP, PERSONA_GENERATOR
+
+logger = logging.getLogger(__name__)
+
+# 프리셋 키: (tone_manner, nationality, age_group)
+PresetKey = Tuple[str, str, str]
+
+
+class PresetEntry:
+    """조합 하나의 프리셋과 미리 계산한 프롬프트 조각"""
+
+    __slots__ = ("key", "preset", "persona_prompts", "style_prompt", "color_prompt")
+
+    def __init__(self, key: PresetKey):
+        tone_manner, nationality, age_group = key
+        preset_data = BRAND_PRESETS[tone_manner]
+
+        self.key = key
+        self.preset = BrandPreset(
+            tone_manner=tone_manner,
+            nationality=nationality,
+            age_group=age_group,
+            style_tone=preset_data["style_tone"],
+            color_grade=preset_data["color_grade"],
+            default_lighting=preset_data["default_lighting"],
+            preset_name=preset_data["name"],
+            preset_description=preset_data["description"]
+        )
+
+        # 인물 템플릿에 국적/연령대 대입 (알 수 없는 값은 기본값)
+        nationality_text = NATIONALITY_MAP.get(nationality, "Korean")
+        age_group_text = AGE_GROUP_MAP.get(age_group, "in late 20s to early 30s")
+        self.persona_prompts: Dict[str, str] = {
+            persona: config.get("prompt", "").format(
+                nationality=nationality_text,
+                age_group=age_group_text
+            )
+            for persona, config in PERSONA_GENERATOR.items()
+        }
+
+        # Brand Style은 낮은 가중치로 뒤에 배치
+        style_tone = self.preset.style_tone
+        color_grade = self.preset.color_grade
+        self.style_prompt = f"({style_tone}:0.8)" if style_tone else ""
+        self.color_prompt = f"({color_grade}:0.8)" if color_grade else ""
+
+
+class PresetRegistry:
+    """
+    프리셋 조합 테이블 (처음 사용할 때 만들어 보관)
+    매핑에 있는 조합만 보관하여 크기를 톤앤매너 × 국적 × 연령대 수로 제한하고,
+    매핑에 없는 국적/연령대는 요청마다 만들어 사용 (기존과 같이 기본값으로 대체)
+    """
+
+    def __init__(self):
+        self._entries: Dict[PresetKey, PresetEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    @staticmethod
+    def key_for(preset: BrandPreset) -> PresetKey:
+        """BrandPreset -> 프리셋 키"""
+        return (preset.tone_manner, preset.nationality, preset.age_group)
+
+    @staticmethod
+    def is_known(key: PresetKey) -> bool:
+        """매핑에 있는 조합인지 확인"""
+        tone_manner, nationality, age_group = key
+        return (
+            tone_manner in BRAND_PRESETS
+            and nationality in NATIONALITY_MAP
+            and age_group in AGE_GROUP_MAP
+        )
+
+    def get(self, tone_manner: str, nationality: str, age_group: str) -> PresetEntry:
+        """
+        조합의 프리셋 조회
+
+        Raises:
+            KeyError: 톤앤매너가 BRAND_PRESETS에 없는 경우
+        """
+        key = (tone_manner, nationality, age_group)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        entry = PresetEntry(key)
+        if self.is_known(key):
+            self.misses += 1
+            self._entries[key] = entry
+        else:
+            self.uncached += 1
+        return entry
+
+    def entry_for(self, preset: BrandPreset) -> PresetEntry:
+        """BrandPreset의 조합 조회"""
+        return self.get(*self.key_for(preset))
+
+    def get_stats(self) -> Dict:
+        """레지스트리 통계"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": len(BRAND_PRESETS) * len(NATIONALITY_MAP) * len(AGE_GROUP_MAP),
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+        }
+
+
+# 싱글톤 인스턴스
+preset_registry = PresetRegistry()
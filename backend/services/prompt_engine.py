@@ -9,18 +9,20 @@ import asyncio
 import logging
 from data.mappings import (
     BRAND_PRESETS,
-    NATIONALITY_MAP,
-    AGE_GROUP_MAP,
-    PERSONA_GENERATOR,
     LAYOUT_MAP,
     TIME_OF_DAY_MAP,
     IMAGE_RATIOS,
     NEGATIVE_PROMPT_BASE,
     search_locations,
     get_location_by_id,
+    get_location_index_version,
+    translate_korean_location,
 )
 from models.preset import BrandPreset
 from models.generation import ImageGenerationRequest
+from services.lru_cache import LRUCache
+from services.preset_registry import PresetEntry, preset_registry
+from config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,11 @@ logger = logging.getLogger(__name__)
 class PromptEngine:
     """프롬프트 생성 엔진"""
     
+    def __init__(self):
+        # 장소 프롬프트 캐시: {정규화된 장소 입력: 장소 프롬프트}
+        self._location_prompt_cache = LRUCache(settings.LOCATION_PROMPT_CACHE_SIZE)
+        self._location_cache_version = get_location_index_version()
+    
     async def generate_final_prompt(
         self,
         preset: BrandPreset,
@@ -50,9 +57,12 @@ class PromptEngine:
             request.expression
         )
         
+        # 프리셋 조합별로 미리 계산된 프롬프트 조각 (인물 템플릿, Brand Style)
+        preset_entry = preset_registry.entry_for(preset)
+        
         # 2. 인물 프롬프트 생성
         persona_prompt = self._build_persona_prompt(
-            preset, request, action_detail_en, expression_en
+            preset_entry, request, action_detail_en, expression_en
         )
         
         # 3. 장소 프롬프트 생성
@@ -80,8 +90,8 @@ class PromptEngine:
             location_prompt=location_prompt,
             lighting_prompt=lighting_prompt,
             layout_prompt=layout_prompt,
-            style_tone=preset.style_tone,
-            color_grade=preset.color_grade,
+            style_prompt=preset_entry.style_prompt,
+            color_prompt=preset_entry.color_prompt,
             quality_prompt=quality_prompt,
             width=width,
             height=height
@@ -110,26 +120,14 @@ class PromptEngine:
     
     def _build_persona_prompt(
         self,
-        preset: BrandPreset,
+        preset_entry: PresetEntry,
         request: ImageGenerationRequest,
         action_detail_en: str,
         expression_en: str
     ) -> str:
         """인물 프롬프트 생성"""
-        # 기본 인물 템플릿 가져오기
-        persona_template = PERSONA_GENERATOR.get(request.persona, {}).get("prompt", "")
-        
-        # 국적 매핑
-        nationality = NATIONALITY_MAP.get(preset.nationality, "Korean")
-        
-        # 연령대 매핑
-        age_group = AGE_GROUP_MAP.get(preset.age_group, "in late 20s to early 30s")
-        
-        # 템플릿에 국적/연령대 대입
-        persona_prompt = persona_template.format(
-            nationality=nationality,
-            age_group=age_group
-        )
+        # 국적/연령대가 대입된 인물 템플릿 (프리셋 조합별로 미리 계산됨)
+        persona_prompt = preset_entry.persona_prompts.get(request.persona, "")
         
         # 행동(action) 추가 - 앞/뒤/옆모습
         if request.action and request.action.strip():
@@ -148,6 +146,29 @@ class PromptEngine:
         return persona_prompt
     
     def _build_location_prompt(self, location: str) -> str:
+        """장소 프롬프트 생성 (캐시 적용) - 같은 장소 입력은 검색/조합 없이 재사용"""
+        # 입력 정규화 (앞뒤/연속 공백 제거)
+        normalized = " ".join(location.split()) if location else ""
+        
+        # LOCATION_DATA가 변경되어 인덱스가 재구축되었으면 캐시 무효화
+        index_version = get_location_index_version()
+        if index_version != self._location_cache_version:
+            self._location_prompt_cache.clear()
+            self._location_cache_version = index_version
+        
+        cached = self._location_prompt_cache.get(normalized)
+        if cached is not None:
+            return cached
+        
+        location_prompt = self._resolve_location_prompt(normalized)
+        self._location_prompt_cache.set(normalized, location_prompt)
+        return location_prompt
+    
+    def get_location_cache_stats(self) -> Dict:
+        """장소 프롬프트 캐시 통계 (적중/미적중 수 등)"""
+        return self._location_prompt_cache.stats()
+    
+    def _resolve_location_prompt(self, location: str) -> str:
         """장소 프롬프트 생성 - LOCATION_DATA를 활용하여 구체적인 랜드마크 프롬프트 삽입 (최우선 가중치)"""
         if not location or not location.strip():
             return "(iconic travel destination:1.4), (beautiful scenery:1.3)"
@@ -207,28 +228,8 @@ class PromptEngine:
             else:
                 return f"({display_name}:1.7), (iconic travel destination:1.5), (beautiful scenery:1.4), (recognizable landmark visible in background:1.6), (regional architecture style:1.5), (distinctive location features:1.5)"
         
-        # 매칭되지 않으면 기본 처리 (가중치 강화)
-        location_hints = {
-            "파리": "Paris",
-            "에펠탑": "Eiffel Tower",
-            "제주": "Jeju Island",
-            "성산일출봉": "Seongsan Ilchulbong",
-            "뉴욕": "New York",
-            "센트럴파크": "Central Park",
-            "런던": "London",
-            "빅벤": "Big Ben",
-            "도쿄": "Tokyo",
-            "후지산": "Mt. Fuji",
-            "해변": "beach",
-            "바다": "ocean",
-            "산": "mountain",
-            "도시": "city",
-            "거리": "street",
-        }
-        
-        location_english = location
-        for kor, eng in location_hints.items():
-            location_english = location_english.replace(kor, eng)
+        # 매칭되지 않으면 기본 처리 (가중치 강화) - 한글 단어는 자모/초성 인덱스로 영어 치환
+        location_english = translate_korean_location(location)
         
         # 장소 정보에 높은 가중치 부여
         return f"({location_english}:1.7), (iconic travel destination:1.5), (beautiful scenery:1.4), (recognizable landmark visible in background:1.6), (regional architecture style:1.5), (distinctive location features:1.5)"
@@ -310,8 +311,8 @@ class PromptEngine:
         location_prompt: str,
         lighting_prompt: str,
         layout_prompt: str,
-        style_tone: str,
-        color_grade: str,
+        style_prompt: str,
+        color_prompt: str,
         quality_prompt: str,
         width: int = None,
         height: int = None
@@ -326,9 +327,9 @@ class PromptEngine:
             lighting_prompt,  # 4순위: 조명/시간대
             layout_prompt,    # 5순위: 레이아웃
             quality_prompt,   # 6순위: 품질
-            # Brand Style과 Travel Theme는 낮은 가중치로 뒤에 배치
-            f"({style_tone}:0.8)" if style_tone else "",  # Brand Style (가중치 낮춤)
-            f"({color_grade}:0.8)" if color_grade else "",  # Brand Style (가중치 낮춤)
+            # Brand Style과 Travel Theme는 낮은 가중치로 뒤에 배치 (가중치는 프리셋 레지스트리에서 적용)
+            style_prompt,  # Brand Style (가중치 낮춤)
+            color_prompt,  # Brand Style (가중치 낮춤)
         ]
         
         # 빈 문자열 제거 및 공백 정리
@@ -0,0 +1,371 @@
+"""
+이미지 생성 공급자 라우터
+설정된 공급자(IMAGE_PROVIDERS)별 상태(오류율, 지연 시간 EWMA)를 기록하고,
+상태가 나빠진 공급자는 서킷을 열어 잠시 제외한 뒤 다음 공급자로 자동 전환
+"""
+import asyncio
+import importlib
+import time
+from typing import Dict, List, Optional
+import logging
+
+from config import settings
+from services.hedging import HedgeBudget, LatencyWindow
+from services.image_generator_base import BaseImageGenerator
+from services.retry import is_local_error
+
+logger = logging.getLogger(__name__)
+
+# 공급자 이름 -> 생성기 모듈 (모듈의 image_generator 싱글톤 사용)
+PROVIDER_MODULES = {
+    "google_ai": "services.image_generator_google_ai",
+    "replicate": "services.image_generator",
+    "huggingface": "services.image_generator_hf",
+    "gradio": "services.image_generator_gradio",
+}
+
+# 서킷 상태
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# EWMA 가중치 (최근 결과의 반영 비율)
+_EWMA_ALPHA = 0.2
+
+
+class ProviderHealth:
+    """공급자 하나의 상태 점수 + 서킷 브레이커"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CIRCUIT_CLOSED
+        self.error_rate = 0.0
+        self.latency_ewma: Optional[float] = None
+        self.samples = 0
+        self.consecutive_failures = 0
+        self.successes = 0
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    @property
+    def score(self) -> float:
+        """상태 점수 (0 ~ 1, 높을수록 건강)"""
+        return 1.0 - self.error_rate
+
+    def allow_request(self) -> bool:
+        """
+        요청 허용 여부
+        열린 서킷은 대기 시간이 지나면 시험 요청 1건만 허용 (half-open)
+        """
+        if self.state == CIRCUIT_CLOSED:
+            return True
+
+        if self.state == CIRCUIT_OPEN:
+            if time.monotonic() - self.opened_at < settings.CIRCUIT_OPEN_SECONDS:
+                return False
+            self.state = CIRCUIT_HALF_OPEN
+            logger.info(f"🔌 {self.name}: 서킷 half-open (시험 요청 허용)")
+
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self, latency: float):
+        """성공 기록 (half-open이면 서킷 닫음)"""
+        self._record(failed=False, latency=latency)
+        self.successes += 1
+        self.consecutive_failures = 0
+
+        if self.state != CIRCUIT_CLOSED:
+            logger.info(f"✅ {self.name}: 서킷 닫힘 (정상 복구)")
+        self.state = CIRCUIT_CLOSED
+        self._probe_in_flight = False
+
+    def record_failure(self, latency: float):
+        """실패 기록 (임계치를 넘거나 시험 요청이 실패하면 서킷 열림)"""
+        self._record(failed=True, latency=latency)
+        self.failures += 1
+        self.consecutive_failures += 1
+
+        degraded = (
+            self.consecutive_failures >= settings.CIRCUIT_FAILURE_THRESHOLD
+            or (
+                self.samples >= settings.CIRCUIT_MIN_SAMPLES
+                and self.error_rate >= settings.CIRCUIT_ERROR_RATE_THRESHOLD
+            )
+        )
+        if self.state == CIRCUIT_HALF_OPEN or (self.state == CIRCUIT_CLOSED and degraded):
+            self.state = CIRCUIT_OPEN
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+            logger.warning(
+                f"🔌 {self.name}: 서킷 열림 ({settings.CIRCUIT_OPEN_SECONDS:.0f}초간 제외, "
+                f"오류율 {self.error_rate:.2f}, 연속 실패 {self.consecutive_failures}회)"
+            )
+        self._probe_in_flight = False
+
+    def record_cancelled(self):
+        """요청이 취소된 경우 (결과를 기록하지 않고 시험 요청 자리만 반환)"""
+        self._probe_in_flight = False
+
+    def _record(self, failed: bool, latency: float):
+        self.samples += 1
+        self.error_rate += _EWMA_ALPHA * ((1.0 if failed else 0.0) - self.error_rate)
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += _EWMA_ALPHA * (latency - self.latency_ewma)
+
+    def get_stats(self) -> Dict:
+        """상태 통계"""
+        return {
+            "state": self.state,
+            "score": round(self.score, 4),
+            "error_rate": round(self.error_rate, 4),
+            "latency_ewma_seconds": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+        }
+
+
+class ProviderRouter(BaseImageGenerator):
+    """
+    여러 공급자를 하나의 생성기처럼 사용하는 라우터
+    이미지 1장마다 상태가 좋은 공급자 순으로 시도하고, 실패하면 다음 공급자로 전환
+    """
+
+    provider_name = "router"
+
+    def __init__(self, provider_names: List[str]):
+        self.providers: Dict[str, BaseImageGenerator] = {}
+        for name in provider_names:
+            if name not in PROVIDER_MODULES:
+                logger.warning(f"⚠️ 알 수 없는 이미지 생성 공급자: {name} (무시)")
+                continue
+            module = importlib.import_module(PROVIDER_MODULES[name])
+            self.providers[name] = module.image_generator
+
+        self.health = {name: ProviderHealth(name) for name in self.providers}
+        self.priority = {name: i for i, name in enumerate(self.providers)}
+        # 캐시/요청 병합 키에 사용 (공급자 구성이 바뀌면 다른 키)
+        self.model = ",".join(
+            f"{name}:{generator.model}" for name, generator in self.providers.items()
+        )
+        self.failovers = 0
+
+        # 헤징 (느린 이미지에 중복 요청)
+        self.latency = LatencyWindow(settings.HEDGE_LATENCY_WINDOW)
+        self.hedge_budget = HedgeBudget(settings.HEDGE_BUDGET_RATIO, settings.HEDGE_BUDGET_BURST)
+        self.hedge_wins = 0
+
+    async def startup(self):
+        """설정된 공급자 준비 (Gradio Client 풀 생성 등)"""
+        for generator in self.providers.values():
+            await generator.startup()
+
+    async def shutdown(self):
+        """설정된 공급자 정리"""
+        for generator in self.providers.values():
+            await generator.shutdown()
+
+    def validate_api_token(self) -> bool:
+        """사용 가능한 공급자가 하나라도 있는지 확인"""
+        return any(generator.is_available() for generator in self.providers.values())
+
+    def candidates(self) -> List[str]:
+        """
+        시도 순서 (API 키가 설정된 공급자를 상태 점수 > 설정 순서로 정렬)
+        서킷 상태는 실제로 시도할 때 확인
+        """
+        names = [
+            name for name, generator in self.providers.items()
+            if generator.is_available()
+        ]
+        # 점수는 소수점 첫째 자리까지만 비교하여 작은 변동으로 순서가 바뀌지 않게 함
+        names.sort(key=lambda name: (-round(self.health[name].score, 1), self.priority[name]))
+        return names
+
+    async def generate_admitted_image(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        seed: int,
+        generation_id: str,
+        index: int
+    ) -> Dict:
+        """
+        단일 이미지 생성 (공급자 라우팅, HEDGE_ENABLED면 느린 요청에 중복 요청)
+
+        Raises:
+            마지막으로 실패한 공급자의 오류 (시도할 공급자가 없으면 Exception)
+        """
+        args = (positive_prompt, negative_prompt, width, height, seed, generation_id, index)
+        started_at = time.monotonic()
+
+        if settings.HEDGE_ENABLED:
+            image = await self._generate_hedged(*args)
+        else:
+            image = await self._route_image(*args)
+
+        self.latency.record(time.monotonic() - started_at)
+        return image
+
+    async def _generate_hedged(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        seed: int,
+        generation_id: str,
+        index: int
+    ) -> Dict:
+        """
+        헤징 요청: 최근 p90 시간 안에 끝나지 않으면 중복 요청(가능하면 다른 공급자)을 보내고
+        먼저 성공한 결과를 사용, 나머지는 취소 (중복 요청 수는 HedgeBudget으로 제한)
+        """
+        args = (positive_prompt, negative_prompt, width, height, seed, generation_id, index)
+        self.hedge_budget.on_request()
+
+        primary = asyncio.ensure_future(self._route_image(*args))
+        hedge: Optional[asyncio.Future] = None
+        hedge_delay = self.hedge_delay()
+
+        try:
+            if hedge_delay is None:
+                return await primary
+
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+            if done or not self.hedge_budget.try_acquire():
+                return await primary
+
+            logger.info(f"🪞 이미지 {index+1}: {hedge_delay:.1f}초 경과, 중복 요청 전송")
+            hedge = asyncio.ensure_future(self._route_image(*args, prefer_alternate=True))
+            pending = {primary, hedge}
+            last_error: Optional[BaseException] = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+
+            raise last_error
+        finally:
+            # 먼저 끝난 쪽을 사용하고 남은 요청은 취소
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def hedge_delay(self) -> Optional[float]:
+        """중복 요청을 보내기까지 대기 시간 (최근 p90, 기록이 부족하면 None = 헤징 안 함)"""
+        if len(self.latency) < settings.HEDGE_MIN_SAMPLES:
+            return None
+        return max(settings.HEDGE_MIN_DELAY_SECONDS, self.latency.percentile(settings.HEDGE_PERCENTILE))
+
+    async def _route_image(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        seed: int,
+        generation_id: str,
+        index: int,
+        prefer_alternate: bool = False
+    ) -> Dict:
+        """
+        상태가 좋은 공급자부터 시도하여 단일 이미지 생성 (실패 시 다음 공급자로 전환)
+        각 공급자 안에서의 호출 제한/재시도는 공급자 생성기가 처리
+        (prefer_alternate면 1순위 공급자를 마지막에 시도 - 헤징 요청용)
+        """
+        last_error: Optional[Exception] = None
+        attempted = 0
+
+        names = self.candidates()
+        if prefer_alternate and len(names) > 1:
+            names = names[1:] + names[:1]
+
+        for name in names:
+            health = self.health[name]
+            if not health.allow_request():
+                continue
+
+            if attempted:
+                self.failovers += 1
+                logger.warning(f"🔀 이미지 {index+1}: {name}(으)로 전환")
+            attempted += 1
+
+            started_at = time.monotonic()
+            try:
+                image = await self.providers[name].generate_admitted_image(
+                    positive_prompt=positive_prompt,
+                    negative_prompt=negative_prompt,
+                    width=width,
+                    height=height,
+                    seed=seed,
+                    generation_id=generation_id,
+                    index=index
+                )
+            except asyncio.CancelledError:
+                health.record_cancelled()
+                raise
+            except Exception as e:
+                # 이쪽 제한 시간 초과는 공급자 장애로 기록하지 않음 (대기열 적체로 서킷이 열리지 않도록)
+                if is_local_error(e):
+                    health.record_cancelled()
+                else:
+                    health.record_failure(time.monotonic() - started_at)
+                logger.error(f"❌ {name}: 이미지 {index+1} 생성 실패: {str(e)[:200]}")
+                last_error = e
+                continue
+
+            health.record_success(time.monotonic() - started_at)
+            return {**image, "provider": name}
+
+        if last_error is not None:
+            raise last_error
+        raise Exception("사용 가능한 이미지 생성 공급자가 없습니다. 잠시 후 다시 시도해주세요.")
+
+    async def generate_single_image(
+        self,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        seed: int,
+        generation_id: str,
+        index: int
+    ) -> Dict:
+        """단일 이미지 생성 (공급자 라우팅 포함)"""
+        return await self.generate_admitted_image(
+            positive_prompt, negative_prompt, width, height, seed, generation_id, index
+        )
+
+    def get_stats(self) -> Dict:
+        """공급자별 상태 및 전환 횟수"""
+        return {
+            "order": self.candidates(),
+            "failovers": self.failovers,
+            "hedging": {
+                "enabled": settings.HEDGE_ENABLED,
+                "delay_seconds": self.hedge_delay(),
+                "hedge_wins": self.hedge_wins,
+                **self.hedge_budget.get_stats(),
+            },
+            "providers": {name: health.get_stats() for name, health in self.health.items()},
+        }
+
+
+# 싱글톤 인스턴스
+provider_router = ProviderRouter(settings.IMAGE_PROVIDERS)
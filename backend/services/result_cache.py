@@ -0,0 +1,145 @@
+"""
+생성 결과 캐시 서비스
+같은 (공급자, 모델, 프롬프트, 크기, 시드)로 생성한 이미지를 TTL 동안 재사용
+(데모/온보딩처럼 같은 입력이 반복되는 경우 유료 API 호출을 생략)
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 이미지 정보(파일명, 시드 등) 자체의 대략적인 메모리 비용
+_ENTRY_OVERHEAD_BYTES = 512
+
+
+class GenerationResultCache:
+    """TTL + 전체 바이트 예산 기반 LRU 결과 캐시 (단일 이벤트 루프에서 사용)"""
+
+    def __init__(self, ttl_seconds: int, max_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max(0, max_bytes)
+
+        # 키 -> (만료 시각, 바이트 비용, 이미지 정보)
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict]]" = OrderedDict()
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        seed: int
+    ) -> str:
+        """캐시 키 (생성 결과를 결정하는 입력 전체의 해시)"""
+        raw = "\x1f".join([
+            provider, model, positive_prompt, negative_prompt,
+            str(width), str(height), str(seed)
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def seeds_for(
+        provider: str,
+        model: str,
+        positive_prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        count: int
+    ) -> List[int]:
+        """
+        입력에서 결정되는 시드값 (같은 요청이 같은 시드 -> 같은 캐시 키가 되도록)
+
+        Returns:
+            1 ~ 1000000 범위의 시드값 리스트
+        """
+        raw = "\x1f".join([provider, model, positive_prompt, negative_prompt, str(width), str(height)])
+        digest = hashlib.sha256(raw.encode("utf-8")).digest()
+        return [
+            int.from_bytes(digest[i * 4:(i + 1) * 4], "big") % 1000000 + 1
+            for i in range(count)
+        ]
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        캐시 조회 (만료된 항목은 제거)
+
+        Returns:
+            캐시된 이미지 정보 또는 None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, cost, image = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def set(self, key: str, image: Dict):
+        """캐시 저장 (바이트 예산 초과 시 가장 오래 사용하지 않은 항목부터 제거)"""
+        cost = len(image.get("base64") or "") + _ENTRY_OVERHEAD_BYTES
+        if cost > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, cost, image)
+        self._total_bytes += cost
+
+        while self._total_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def invalidate(self, key: str):
+        """항목 제거 (저장된 파일이 사라진 경우 등)"""
+        if key in self._entries:
+            self._remove(key)
+
+    def _remove(self, key: str):
+        _, cost, _ = self._entries.pop(key)
+        self._total_bytes -= cost
+
+    def get_stats(self) -> Dict:
+        """캐시 통계"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "total_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# 싱글톤 인스턴스
+result_cache = GenerationResultCache(
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+    max_bytes=settings.RESULT_CACHE_MAX_BYTES
+)
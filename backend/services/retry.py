@@ -0,0 +1,194 @@
+"""
+이미지 생성 API 재시도 정책
+일시적인 오류(429, 5xx, 네트워크 오류)만 지수 백오프 + 지터로 재시도하고,
+Retry-After 헤더와 요청별 제한 시간(deadline)을 지킴
+(대기는 asyncio.sleep으로 하므로 워커 스레드를 붙잡지 않음)
+"""
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import AsyncContextManager, Awaitable, Callable, Dict, Optional, TypeVar
+import logging
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 재시도하면 성공할 수 있는 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class ProviderError(Exception):
+    """이미지 생성 API 호출 오류 (상태 코드, Retry-After 포함)"""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        retryable: Optional[bool] = None,
+        local: bool = False
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        # 제한 시간 초과 등 공급자 응답과 무관한 오류 (공급자 상태 점수에 반영하지 않음)
+        self.local = local
+        # 명시하지 않으면 상태 코드로 판단 (상태 코드가 없으면 재시도하지 않음)
+        self.retryable = retryable if retryable is not None else status_code in RETRYABLE_STATUS_CODES
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After 헤더 값을 대기 초로 변환
+
+    Args:
+        value: 초 단위 숫자 또는 HTTP 날짜
+
+    Returns:
+        대기 시간(초) 또는 None
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def is_retryable(error: BaseException) -> bool:
+    """재시도 대상 오류인지 판단 (429/5xx, 연결/타임아웃 오류)"""
+    if isinstance(error, ProviderError):
+        return error.retryable
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError, ConnectionError, TimeoutError))
+
+
+def is_local_error(error: BaseException) -> bool:
+    """공급자 응답이 아닌 이쪽 사정으로 실패한 오류인지 판단 (제한 시간 초과 등)"""
+    return isinstance(error, ProviderError) and error.local
+
+
+class RetryPolicy:
+    """지수 백오프(full jitter) + Retry-After + 제한 시간 기반 비동기 재시도"""
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        deadline_seconds: float
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_seconds = deadline_seconds
+
+        # 메트릭
+        self.retries = 0
+        self.gave_up = 0
+        self.deadline_exceeded = 0
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """
+        다음 시도까지 대기 시간
+
+        Retry-After가 있으면 그 값을, 없으면 0 ~ min(max_delay, base_delay * 2^(attempt-1)) 사이 임의 값
+        """
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        description: str = "API 호출",
+        admit: Optional[Callable[[], AsyncContextManager]] = None
+    ) -> T:
+        """
+        재시도하며 실행
+
+        Args:
+            fn: 시도마다 새로 호출할 코루틴 함수
+            description: 로그용 설명
+            admit: 시도마다 호출 허가를 받는 컨텍스트 (호출 제한 대기 시간은 제한 시간에서 제외)
+
+        Returns:
+            fn의 결과
+
+        Raises:
+            재시도할 수 없는 오류, 마지막 시도의 오류, 또는 제한 시간 초과 시 ProviderError
+        """
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+
+        while True:
+            attempt += 1
+            try:
+                if admit is None:
+                    return await asyncio.wait_for(fn(), timeout=deadline - time.monotonic())
+                queued_at = time.monotonic()
+                async with admit():
+                    # 호출 제한기에서 기다린 시간만큼 제한 시간 연장
+                    deadline += time.monotonic() - queued_at
+                    return await asyncio.wait_for(fn(), timeout=deadline - time.monotonic())
+            except asyncio.TimeoutError as e:
+                if time.monotonic() >= deadline:
+                    self.deadline_exceeded += 1
+                    raise ProviderError(
+                        f"{description}: 제한 시간({self.deadline_seconds:.0f}초) 초과",
+                        retryable=False,
+                        local=True
+                    ) from e
+                error = e
+            except Exception as e:
+                error = e
+
+            if not is_retryable(error) or attempt >= self.max_attempts:
+                if attempt > 1:
+                    self.gave_up += 1
+                raise error
+
+            delay = self.backoff(attempt, error)
+            if time.monotonic() + delay >= deadline:
+                self.deadline_exceeded += 1
+                raise error
+
+            self.retries += 1
+            logger.warning(
+                f"⚠️ {description} 재시도 {attempt}/{self.max_attempts - 1} "
+                f"({delay:.1f}초 후): {str(error)[:200]}"
+            )
+            await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict:
+        """재시도 통계"""
+        return {
+            "max_attempts": self.max_attempts,
+            "deadline_seconds": self.deadline_seconds,
+            "retries": self.retries,
+            "gave_up": self.gave_up,
+            "deadline_exceeded": self.deadline_exceeded,
+        }
+
+
+# 싱글톤 인스턴스 (모든 이미지 생성기가 공유)
+retry_policy = RetryPolicy(
+    max_attempts=settings.RETRY_MAX_ATTEMPTS,
+    base_delay=settings.RETRY_BASE_DELAY_SECONDS,
+    max_delay=settings.RETRY_MAX_DELAY_SECONDS,
+    deadline_seconds=settings.RETRY_DEADLINE_SECONDS
+)
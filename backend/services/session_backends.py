@@ -0,0 +1,616 @@
+"""
+세션/생성 히스토리 저장소 (SessionManager 백엔드)
+- MemorySessionBackend: 프로세스 메모리 (단일 워커, 기본값)
+- SQLiteSessionBackend: SQLite WAL 파일 (같은 호스트의 여러 워커 프로세스가 공유)
+- KeyValueSessionBackend: Redis 호환 키-값 서비스 (여러 서버가 공유, 만료는 서버 TTL)
+"""
+import heapq
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+from services.preset_registry import PresetKey
+from services.session_records import (
+    GENERATION_UPDATE_FIELDS,
+    GenerationRecord,
+    SessionRecord,
+    prompt_interner,
+)
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 생성 히스토리 삭제 사유
+EVICTION_REASONS = ("max_entries", "max_bytes", "session_expired")
+
+
+class SessionBackend:
+    """
+    세션/생성 히스토리 저장소 공통 인터페이스
+    세션 데이터 형식: SessionRecord (preset_key, created_at)
+    생성 데이터 형식: {"session_id": str, "metadata": Dict, "created_at": timestamp, "status": str(선택), ...}
+    """
+
+    # /health에 표시하는 저장소 이름
+    name: str = "base"
+
+    # 호출이 파일/네트워크 I/O로 블록되는지 (True면 SessionManager가 워커 스레드에서 호출)
+    blocking: bool = False
+
+    def create_session(self, session_id: str, preset_key: PresetKey, created_at: float):
+        """세션 저장 (만료 시각은 created_at + SESSION_EXPIRY_SECONDS)"""
+        raise NotImplementedError
+
+    def get_session(self, session_id: str) -> Optional[SessionRecord]:
+        """세션 조회 (만료 여부는 호출 측에서 확인)"""
+        raise NotImplementedError
+
+    def delete_session(self, session_id: str):
+        """세션과 해당 세션의 생성 히스토리 삭제"""
+        raise NotImplementedError
+
+    def cleanup_expired(self, current_time: float) -> int:
+        """만료된 세션 정리, 삭제한 세션 수 반환"""
+        raise NotImplementedError
+
+    def oldest_session_created_at(self) -> Optional[float]:
+        """가장 오래된 세션의 생성 시각 (알 수 없으면 None)"""
+        raise NotImplementedError
+
+    def count_sessions(self) -> Optional[int]:
+        """세션 수 (알 수 없으면 None)"""
+        raise NotImplementedError
+
+    def save_generation(self, generation_id: str, record: Dict):
+        """생성 히스토리 저장 (한도를 넘으면 오래 조회되지 않은 항목부터 삭제)"""
+        raise NotImplementedError
+
+    def update_generation(self, generation_id: str, updates: Dict) -> bool:
+        """생성 히스토리 필드 병합, 항목이 없으면 False"""
+        raise NotImplementedError
+
+    def get_generation(self, generation_id: str) -> Optional[Dict]:
+        """생성 히스토리 조회"""
+        raise NotImplementedError
+
+    def get_history_stats(self) -> Dict:
+        """생성 히스토리 통계 (항목 수, 대략적인 크기, 삭제 사유별 카운트)"""
+        raise NotImplementedError
+
+    def close(self):
+        """연결 정리 (앱 종료 시 호출)"""
+
+
+class MemorySessionBackend(SessionBackend):
+    """
+    프로세스 메모리 저장소
+    세션 만료는 만료 시각 최소 힙, 생성 히스토리는 개수/바이트 한도가 있는 LRU
+    레코드는 __slots__ 객체로 보관하고 프롬프트는 공유 조각으로 저장
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        # 세션 저장소: {session_id: SessionRecord}
+        self._sessions: Dict[str, SessionRecord] = {}
+
+        # 만료 시각 최소 힙: [(expires_at, session_id)]
+        # 먼저 삭제된 세션의 항목은 남겨 두었다가 꺼낼 때 건너뜀 (lazy deletion)
+        self._expiry_heap: List[Tuple[float, str]] = []
+
+        # 생성 히스토리: {generation_id: GenerationRecord} (오래 조회되지 않은 순서)
+        # 개수/대략적인 바이트 한도를 넘으면 LRU로 삭제, 세션이 만료되면 함께 삭제
+        self._generation_history: "OrderedDict[str, GenerationRecord]" = OrderedDict()
+        self._generations_by_session: Dict[str, Set[str]] = {}
+        self._history_bytes = 0
+        self._history_evictions = {reason: 0 for reason in EVICTION_REASONS}
+
+    def create_session(self, session_id: str, preset_key: PresetKey, created_at: float):
+        self._sessions[session_id] = SessionRecord(preset_key, created_at)
+        heapq.heappush(self._expiry_heap, (created_at + settings.SESSION_EXPIRY_SECONDS, session_id))
+
+    def get_session(self, session_id: str) -> Optional[SessionRecord]:
+        return self._sessions.get(session_id)
+
+    def delete_session(self, session_id: str):
+        if self._sessions.pop(session_id, None) is not None:
+            self._drop_session_generations(session_id)
+
+    def cleanup_expired(self, current_time: float) -> int:
+        """만료 시각 힙에서 만료된 항목만 꺼내므로 세션당 O(log n)"""
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < current_time:
+            _, session_id = heapq.heappop(heap)
+            # 이미 get_session에서 삭제된 세션은 건너뜀
+            if self._sessions.pop(session_id, None) is not None:
+                self._drop_session_generations(session_id)
+                removed += 1
+        return removed
+
+    def oldest_session_created_at(self) -> Optional[float]:
+        """힙의 맨 앞 항목 (이미 삭제된 세션 항목은 제거)"""
+        heap = self._expiry_heap
+        while heap and heap[0][1] not in self._sessions:
+            heapq.heappop(heap)
+
+        if not heap:
+            return None
+
+        return self._sessions[heap[0][1]].created_at
+
+    def count_sessions(self) -> Optional[int]:
+        return len(self._sessions)
+
+    def save_generation(self, generation_id: str, record: Dict):
+        generation = GenerationRecord(
+            record["session_id"], record["created_at"], record["metadata"], prompt_interner
+        )
+        # 함께 저장한 상태 필드 (작업 모드의 status 등)
+        generation.update({key: record[key] for key in GENERATION_UPDATE_FIELDS if key in record})
+
+        # 같은 ID로 다시 저장하면 (작업 모드: 등록 시 + 완료 시) 기존 항목 크기를 이어받아 차이만 반영
+        previous = self._generation_history.get(generation_id)
+        if previous is not None:
+            generation.size = previous.size
+            if previous.session_id != generation.session_id:
+                self._discard_session_generation(previous.session_id, generation_id)
+
+        self._generation_history[generation_id] = generation
+        self._generation_history.move_to_end(generation_id)
+        self._generations_by_session.setdefault(record["session_id"], set()).add(generation_id)
+        self._resize_generation(generation_id)
+        self._evict_generations()
+
+    def update_generation(self, generation_id: str, updates: Dict) -> bool:
+        generation = self._generation_history.get(generation_id)
+        if not generation:
+            return False
+
+        generation.update(updates)
+        self._generation_history.move_to_end(generation_id)
+        self._resize_generation(generation_id)
+        self._evict_generations()
+        return True
+
+    def get_generation(self, generation_id: str) -> Optional[Dict]:
+        generation = self._generation_history.get(generation_id)
+        if generation is None:
+            return None
+        self._generation_history.move_to_end(generation_id)
+        return generation.to_dict()
+
+    def get_history_stats(self) -> Dict:
+        return {
+            "entries": len(self._generation_history),
+            "approx_bytes": self._history_bytes,
+            "max_entries": settings.GENERATION_HISTORY_MAX_ENTRIES,
+            "max_bytes": settings.GENERATION_HISTORY_MAX_BYTES,
+            "evictions": dict(self._history_evictions),
+            "prompt_segments": prompt_interner.get_stats(),
+        }
+
+    def _resize_generation(self, generation_id: str):
+        """히스토리 항목 크기 다시 계산 (저장/갱신 시)"""
+        generation = self._generation_history[generation_id]
+        size = generation.approx_size()
+        self._history_bytes += size - generation.size
+        generation.size = size
+
+    def _remove_generation(self, generation_id: str, reason: str):
+        """히스토리 항목 삭제 및 삭제 사유별 카운트"""
+        generation = self._generation_history.pop(generation_id, None)
+        if generation is None:
+            return
+        self._history_bytes -= generation.size
+        self._history_evictions[reason] += 1
+        self._discard_session_generation(generation.session_id, generation_id)
+
+    def _discard_session_generation(self, session_id: str, generation_id: str):
+        """세션별 생성 ID 목록에서 제거"""
+        session_generations = self._generations_by_session.get(session_id)
+        if session_generations is not None:
+            session_generations.discard(generation_id)
+            if not session_generations:
+                del self._generations_by_session[session_id]
+
+    def _evict_generations(self):
+        """개수/바이트 한도를 넘으면 가장 오래 조회되지 않은 항목부터 삭제"""
+        while len(self._generation_history) > settings.GENERATION_HISTORY_MAX_ENTRIES:
+            self._remove_generation(next(iter(self._generation_history)), "max_entries")
+
+        # 방금 저장/갱신한 항목 하나만 남으면 한도를 넘어도 유지 (조회 직후 사라지지 않도록)
+        while (
+            self._history_bytes > settings.GENERATION_HISTORY_MAX_BYTES
+            and len(self._generation_history) > 1
+        ):
+            self._remove_generation(next(iter(self._generation_history)), "max_bytes")
+
+    def _drop_session_generations(self, session_id: str):
+        """만료된 세션의 생성 히스토리 삭제"""
+        for generation_id in list(self._generations_by_session.get(session_id, ())):
+            self._remove_generation(generation_id, "session_expired")
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    preset_key TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at);
+
+CREATE TABLE IF NOT EXISTS generations (
+    generation_id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_generations_session_id ON generations (session_id);
+CREATE INDEX IF NOT EXISTS idx_generations_accessed_at ON generations (accessed_at);
+"""
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    SQLite 파일 저장소 (WAL 모드)
+    같은 호스트의 여러 uvicorn 워커가 하나의 파일을 공유하며, 읽기는 쓰기와 동시에 진행됨
+    SessionManager가 워커 스레드에서 호출하므로 연결은 미리 만들어 둔 풀에서 빌려 씀
+    (삭제 사유별 카운트는 프로세스별)
+    """
+
+    name = "sqlite"
+    blocking = True
+
+    def __init__(self, path: Path, pool_size: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        for _ in range(max(1, pool_size)):
+            self._pool.put(self._connect())
+
+        with self._connection() as conn:
+            conn.executescript(SQLITE_SCHEMA)
+
+        self._history_evictions = {reason: 0 for reason in EVICTION_REASONS}
+        logger.info(f"🗃️ SQLite 세션 저장소: {self.path} (연결 {max(1, pool_size)}개)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """WAL 모드 연결 생성 (autocommit, 트랜잭션은 _transaction에서 명시적으로 시작)"""
+        conn = sqlite3.connect(
+            str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """풀에서 연결 대여"""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 트랜잭션 (다른 프로세스와 읽기-수정-쓰기가 섞이지 않도록 IMMEDIATE로 시작)"""
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def create_session(self, session_id: str, preset_key: PresetKey, created_at: float):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, preset_key, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (session_id, json.dumps(preset_key, ensure_ascii=False), created_at,
+                 created_at + settings.SESSION_EXPIRY_SECONDS)
+            )
+
+    def get_session(self, session_id: str) -> Optional[SessionRecord]:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT preset_key, created_at FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return SessionRecord(tuple(json.loads(row[0])), row[1])
+
+    def delete_session(self, session_id: str):
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM generations WHERE session_id = ?", (session_id,))
+            self._history_evictions["session_expired"] += cursor.rowcount
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def cleanup_expired(self, current_time: float) -> int:
+        """expires_at 인덱스로 만료된 세션만 조회하여 삭제"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM generations WHERE session_id IN "
+                "(SELECT session_id FROM sessions WHERE expires_at < ?)",
+                (current_time,)
+            )
+            self._history_evictions["session_expired"] += cursor.rowcount
+            cursor = conn.execute("DELETE FROM sessions WHERE expires_at < ?", (current_time,))
+            return cursor.rowcount
+
+    def oldest_session_created_at(self) -> Optional[float]:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT created_at FROM sessions ORDER BY expires_at LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def count_sessions(self) -> Optional[int]:
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def save_generation(self, generation_id: str, record: Dict):
+        data = json.dumps(record, ensure_ascii=False)
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO generations (generation_id, session_id, data, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (generation_id, record["session_id"], data, len(data), time.time())
+            )
+            self._evict_generations(conn)
+
+    def update_generation(self, generation_id: str, updates: Dict) -> bool:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT data FROM generations WHERE generation_id = ?", (generation_id,)
+            ).fetchone()
+            if row is None:
+                return False
+
+            record = json.loads(row[0])
+            record.update(updates)
+            data = json.dumps(record, ensure_ascii=False)
+            conn.execute(
+                "UPDATE generations SET data = ?, size = ?, accessed_at = ? WHERE generation_id = ?",
+                (data, len(data), time.time(), generation_id)
+            )
+            self._evict_generations(conn)
+        return True
+
+    def get_generation(self, generation_id: str) -> Optional[Dict]:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT data, accessed_at FROM generations WHERE generation_id = ?", (generation_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            # 조회 시각(LRU 순서)은 일정 간격이 지났을 때만 갱신 (작업 상태 폴링마다 쓰기가 생기지 않도록)
+            now = time.time()
+            if now - row[1] >= settings.SESSION_SQLITE_TOUCH_INTERVAL_SECONDS:
+                conn.execute(
+                    "UPDATE generations SET accessed_at = ? WHERE generation_id = ?",
+                    (now, generation_id)
+                )
+        return json.loads(row[0])
+
+    def get_history_stats(self) -> Dict:
+        with self._connection() as conn:
+            entries, total_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM generations"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "approx_bytes": total_bytes,
+            "max_entries": settings.GENERATION_HISTORY_MAX_ENTRIES,
+            "max_bytes": settings.GENERATION_HISTORY_MAX_BYTES,
+            "evictions": dict(self._history_evictions),
+        }
+
+    def _evict_generations(self, conn: sqlite3.Connection):
+        """개수/바이트 한도를 넘으면 가장 오래 조회되지 않은 항목부터 삭제 (트랜잭션 안에서 호출)"""
+        entries, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM generations"
+        ).fetchone()
+        if (
+            entries <= settings.GENERATION_HISTORY_MAX_ENTRIES
+            and total_bytes <= settings.GENERATION_HISTORY_MAX_BYTES
+        ):
+            return
+
+        # 방금 저장/갱신한 항목 하나만 남으면 한도를 넘어도 유지
+        victims = []
+        rows = conn.execute(
+            "SELECT generation_id, size FROM generations ORDER BY accessed_at LIMIT ?",
+            (entries - 1,)
+        ).fetchall()
+        for generation_id, size in rows:
+            if entries > settings.GENERATION_HISTORY_MAX_ENTRIES:
+                reason = "max_entries"
+            elif total_bytes > settings.GENERATION_HISTORY_MAX_BYTES:
+                reason = "max_bytes"
+            else:
+                break
+            victims.append((generation_id,))
+            self._history_evictions[reason] += 1
+            entries -= 1
+            total_bytes -= size
+
+        conn.executemany("DELETE FROM generations WHERE generation_id = ?", victims)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class InMemoryKeyValueStore:
+    """
+    Redis 클라이언트 대용 (테스트/로컬 개발용)
+    KeyValueSessionBackend가 사용하는 get/set/delete, sadd/smembers/expire만 같은 방식으로 지원
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ex: Optional[float] = None, keepttl: bool = False):
+        with self._lock:
+            expires_at = time.time() + ex if ex else None
+            if keepttl and key in self._data:
+                expires_at = self._data[key][1]
+            self._data[key] = (value, expires_at)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def sadd(self, key: str, *members: str) -> int:
+        with self._lock:
+            members_set, expires_at = self._data.get(key, (set(), None))
+            added = len(set(members) - members_set)
+            members_set.update(members)
+            self._data[key] = (members_set, expires_at)
+            return added
+
+    def smembers(self, key: str) -> Set[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or (item[1] is not None and item[1] <= time.time()):
+                return set()
+            return set(item[0])
+
+    def expire(self, key: str, seconds: float) -> bool:
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._data[key] = (self._data[key][0], time.time() + seconds)
+            return True
+
+
+class KeyValueSessionBackend(SessionBackend):
+    """
+    Redis 호환 키-값 저장소
+    세션과 생성 히스토리 모두 SESSION_EXPIRY_SECONDS TTL로 저장하여 만료/정리는 서버가 처리
+    (개수/바이트 한도는 서버의 maxmemory 정책으로 관리, 세션 수 등은 알 수 없음)
+    """
+
+    name = "redis"
+    blocking = True
+
+    def __init__(self, client, prefix: str = "travelfit"):
+        """
+        Args:
+            client: get/set(ex, keepttl)/delete/sadd/smembers/expire를 지원하는 클라이언트
+                (redis.Redis 또는 InMemoryKeyValueStore)
+            prefix: 키 접두어
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def _session_key(self, session_id: str) -> str:
+        return f"{self.prefix}:session:{session_id}"
+
+    def _generation_key(self, generation_id: str) -> str:
+        return f"{self.prefix}:generation:{generation_id}"
+
+    def _session_generations_key(self, session_id: str) -> str:
+        """세션의 생성 ID 집합 (세션 삭제 시 생성 히스토리도 함께 삭제)"""
+        return f"{self.prefix}:session_generations:{session_id}"
+
+    def create_session(self, session_id: str, preset_key: PresetKey, created_at: float):
+        value = json.dumps({"preset_key": preset_key, "created_at": created_at}, ensure_ascii=False)
+        self.client.set(self._session_key(session_id), value, ex=settings.SESSION_EXPIRY_SECONDS)
+
+    def get_session(self, session_id: str) -> Optional[SessionRecord]:
+        raw = self.client.get(self._session_key(session_id))
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return SessionRecord(tuple(data["preset_key"]), data["created_at"])
+
+    def delete_session(self, session_id: str):
+        index_key = self._session_generations_key(session_id)
+        generation_keys = [
+            # redis.Redis는 bytes로 반환
+            self._generation_key(member.decode() if isinstance(member, bytes) else member)
+            for member in self.client.smembers(index_key)
+        ]
+        self.client.delete(self._session_key(session_id), index_key, *generation_keys)
+
+    def cleanup_expired(self, current_time: float) -> int:
+        return 0
+
+    def oldest_session_created_at(self) -> Optional[float]:
+        return None
+
+    def count_sessions(self) -> Optional[int]:
+        return None
+
+    def save_generation(self, generation_id: str, record: Dict):
+        self.client.set(
+            self._generation_key(generation_id),
+            json.dumps(record, ensure_ascii=False),
+            ex=settings.SESSION_EXPIRY_SECONDS
+        )
+        index_key = self._session_generations_key(record["session_id"])
+        self.client.sadd(index_key, generation_id)
+        self.client.expire(index_key, settings.SESSION_EXPIRY_SECONDS)
+
+    def update_generation(self, generation_id: str, updates: Dict) -> bool:
+        key = self._generation_key(generation_id)
+        raw = self.client.get(key)
+        if raw is None:
+            return False
+        record = json.loads(raw)
+        record.update(updates)
+        self.client.set(key, json.dumps(record, ensure_ascii=False), keepttl=True)
+        return True
+
+    def get_generation(self, generation_id: str) -> Optional[Dict]:
+        raw = self.client.get(self._generation_key(generation_id))
+        return json.loads(raw) if raw is not None else None
+
+    def get_history_stats(self) -> Dict:
+        return {"entries": None, "ttl_seconds": settings.SESSION_EXPIRY_SECONDS}
+
+
+def create_session_backend() -> SessionBackend:
+    """SESSION_BACKEND 설정에 맞는 저장소 생성"""
+    if settings.SESSION_BACKEND == "sqlite":
+        return SQLiteSessionBackend(settings.SESSION_SQLITE_PATH, settings.SESSION_SQLITE_POOL_SIZE)
+
+    if settings.SESSION_BACKEND == "redis":
+        if not settings.SESSION_REDIS_URL:
+            logger.warning("⚠️  SESSION_REDIS_URL이 없어 프로세스 내 키-값 저장소를 사용합니다 (워커 간 공유 안 됨)")
+            return KeyValueSessionBackend(InMemoryKeyValueStore())
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("SESSION_BACKEND=redis는 redis 패키지가 필요합니다: pip install redis") from e
+        return KeyValueSessionBackend(redis.Redis.from_url(settings.SESSION_REDIS_URL))
+
+    return MemorySessionBackend()
@@ -1,162 +1,222 @@
 """
 세션 관리 서비스
-사용자의 브랜드 프리셋과 생성 히스토리를 메모리에 저장
-(MVP 단계에서는 In-Memory, 추후 Redis/DB로 전환)
+사용자의 브랜드 프리셋과 생성 히스토리를 저장
+(저장소는 SESSION_BACKEND 설정으로 선택: memory, sqlite, redis)
+sqlite/redis 저장소 호출은 워커 스레드에서 실행하여 이벤트 루프를 막지 않음
 """
+import asyncio
 import uuid
 import time
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional
 from datetime import datetime
 import logging
 
 from models.preset import BrandPreset
 from models.generation import GenerationMetadata
+from services.preset_registry import preset_registry
+from services.session_backends import SessionBackend, create_session_backend
+from services.session_records import SessionRecord
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 
 class SessionManager:
-    """세션 및 프리셋 관리자 (In-Memory)"""
+    """세션 및 프리셋 관리자"""
     
-    def __init__(self):
-        # 세션 저장소: {session_id: {"preset": BrandPreset, "created_at": timestamp}}
-        self._sessions: Dict[str, Dict] = {}
-        
-        # 생성 히스토리: {generation_id: GenerationMetadata}
-        self._generation_history: Dict[str, Dict] = {}
+    def __init__(self, backend: Optional[SessionBackend] = None):
+        # 세션/생성 히스토리 저장소 (테스트에서는 직접 주입)
+        self.backend = backend or create_session_backend()
+        self._expired_count = 0
+        self._sweeper: Optional[asyncio.Task] = None
+    
+    async def _call(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        저장소 메서드 호출
+        파일/네트워크 I/O가 있는 저장소(blocking)는 워커 스레드에서 실행,
+        메모리 저장소는 이벤트 루프에서 바로 실행 (스레드 안전하지 않음)
+        """
+        if self.backend.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
     
-    def create_session(self, preset: BrandPreset) -> str:
+    async def create_session(self, preset: BrandPreset) -> str:
         """
         새 세션 생성
         
         Args:
             preset: 브랜드 프리셋
-            
+        
         Returns:
             session_id
         """
         session_id = str(uuid.uuid4())
+        created_at = time.time()
         
-        self._sessions[session_id] = {
-            "preset": preset,
-            "created_at": time.time()
-        }
+        # 조합별 공유 키 저장 (프리셋 객체는 레지스트리에서 조회)
+        preset_key = preset_registry.entry_for(preset).key
+        await self._call(self.backend.create_session, session_id, preset_key, created_at)
         
         logger.info(f"✅ 세션 생성: {session_id}")
         logger.info(f"   프리셋: {preset.tone_manner}, {preset.nationality}, {preset.age_group}")
         
-        # 만료된 세션 정리
-        self._cleanup_expired_sessions()
+        # 만료된 세션 정리 (만료 시각이 지난 항목만 정리)
+        await self._cleanup_expired_sessions(created_at)
         
         return session_id
     
-    def get_session(self, session_id: str) -> Optional[Dict]:
+    async def get_session(self, session_id: str) -> Optional[SessionRecord]:
         """
         세션 조회
         
         Args:
             session_id: 세션 ID
-            
+        
         Returns:
-            세션 데이터 또는 None
+            SessionRecord (preset_key, created_at) 또는 None
         """
-        session = self._sessions.get(session_id)
+        session = await self._call(self.backend.get_session, session_id)
         
         if not session:
             logger.warning(f"⚠️  세션을 찾을 수 없음: {session_id}")
             return None
         
         # 만료 체크
-        elapsed = time.time() - session["created_at"]
+        elapsed = time.time() - session.created_at
         if elapsed > settings.SESSION_EXPIRY_SECONDS:
             logger.warning(f"⏰ 세션 만료: {session_id} (생성 후 {elapsed:.0f}초)")
-            del self._sessions[session_id]
+            await self._call(self.backend.delete_session, session_id)
+            self._expired_count += 1
             return None
         
         return session
     
-    def get_preset(self, session_id: str) -> Optional[BrandPreset]:
+    async def get_preset(self, session_id: str) -> Optional[BrandPreset]:
         """
         세션의 프리셋 조회
         
         Args:
             session_id: 세션 ID
-            
+        
         Returns:
             BrandPreset 또는 None
         """
-        session = self.get_session(session_id)
-        return session["preset"] if session else None
+        session = await self.get_session(session_id)
+        return session.preset if session else None
     
-    def save_generation(
+    async def save_generation(
         self,
         generation_id: str,
         session_id: str,
-        metadata: Dict
+        metadata: Dict,
+        status: Optional[str] = None
     ):
         """
-        생성 히스토리 저장
+        생성 히스토리 저장 (같은 ID면 기존 항목을 대체)
         
         Args:
             generation_id: 생성 ID
             session_id: 세션 ID
             metadata: 생성 메타데이터
+            status: 작업 상태 (작업 모드, 없으면 조회 시 completed로 간주)
         """
-        self._generation_history[generation_id] = {
+        record = {
             "session_id": session_id,
             "metadata": metadata,
             "created_at": time.time()
         }
+        if status is not None:
+            record["status"] = status
+        await self._call(self.backend.save_generation, generation_id, record)
         
         logger.info(f"💾 생성 히스토리 저장: {generation_id}")
     
-    def get_generation(self, generation_id: str) -> Optional[Dict]:
+    async def update_generation(self, generation_id: str, updates: Dict) -> bool:
+        """
+        생성 히스토리 갱신 (백그라운드 재생성 결과 등)
+        
+        Args:
+            generation_id: 생성 ID
+            updates: 병합할 필드
+        
+        Returns:
+            갱신 성공 여부
+        """
+        return await self._call(self.backend.update_generation, generation_id, updates)
+    
+    async def get_generation(self, generation_id: str) -> Optional[Dict]:
         """
         생성 히스토리 조회
         
         Args:
             generation_id: 생성 ID
-            
+        
         Returns:
             생성 데이터 또는 None
         """
-        return self._generation_history.get(generation_id)
+        return await self._call(self.backend.get_generation, generation_id)
     
-    def _cleanup_expired_sessions(self):
-        """만료된 세션 정리"""
-        current_time = time.time()
-        expired_sessions = [
-            session_id
-            for session_id, session_data in self._sessions.items()
-            if current_time - session_data["created_at"] > settings.SESSION_EXPIRY_SECONDS
-        ]
+    async def _cleanup_expired_sessions(self, current_time: Optional[float] = None) -> int:
+        """
+        만료된 세션 정리
+        
+        Returns:
+            삭제한 세션 수
+        """
+        if current_time is None:
+            current_time = time.time()
         
-        for session_id in expired_sessions:
-            del self._sessions[session_id]
-            logger.info(f"🗑️  만료된 세션 삭제: {session_id}")
+        removed = await self._call(self.backend.cleanup_expired, current_time)
+        
+        if removed:
+            self._expired_count += removed
+            logger.info(f"🗑️  만료된 세션 삭제: {removed}개")
+        return removed
+    
+    async def start(self):
+        """만료 세션 정리 작업 시작 (앱 시작 시 호출)"""
+        if self._sweeper is not None:
+            return
+        self._sweeper = asyncio.create_task(self._sweep_loop(), name="session-sweeper")
+        logger.info(f"🧹 세션 정리 작업 시작: {settings.SESSION_SWEEP_INTERVAL_SECONDS}초 간격 ({self.backend.name})")
     
-    def get_stats(self) -> Dict:
-        """현재 상태 통계"""
+    async def stop(self):
+        """만료 세션 정리 작업 종료 및 저장소 연결 정리 (앱 종료 시 호출)"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        await self._call(self.backend.close)
+    
+    async def _sweep_loop(self):
+        """요청이 없어도 만료된 세션이 남지 않도록 주기적으로 정리"""
+        while True:
+            await asyncio.sleep(settings.SESSION_SWEEP_INTERVAL_SECONDS)
+            try:
+                await self._cleanup_expired_sessions()
+            except Exception as e:
+                logger.error(f"❌ 세션 정리 실패: {str(e)}")
+    
+    async def get_stats(self) -> Dict:
+        """현재 상태 통계 (저장소가 알 수 없는 값은 None)"""
+        history = await self._call(self.backend.get_history_stats)
         return {
-            "active_sessions": len(self._sessions),
-            "total_generations": len(self._generation_history),
-            "oldest_session_age": self._get_oldest_session_age(),
+            "backend": self.backend.name,
+            "active_sessions": await self._call(self.backend.count_sessions),
+            "total_generations": history["entries"],
+            "oldest_session_age": await self._get_oldest_session_age(),
+            "expired_sessions": self._expired_count,
+            "generation_history": history,
         }
     
-    def _get_oldest_session_age(self) -> Optional[float]:
+    async def _get_oldest_session_age(self) -> Optional[float]:
         """가장 오래된 세션의 나이 (초)"""
-        if not self._sessions:
+        created_at = await self._call(self.backend.oldest_session_created_at)
+        if created_at is None:
             return None
         
-        current_time = time.time()
-        oldest = min(
-            current_time - session_data["created_at"]
-            for session_data in self._sessions.values()
-        )
-        return oldest
+        return time.time() - created_at
 
 
 # 싱글톤 인스턴스
 session_manager = SessionManager()
-
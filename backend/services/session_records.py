@@ -0,0 +1,167 @@
+"""
+세션/생성 히스토리 레코드 (메모리 저장소용)
+- __slots__ 레코드로 항목마다 dict를 두지 않음
+- 프롬프트는 쉼표 조각 단위로 intern하여 여러 레코드가 같은 문자열을 공유
+  (기본/품질 프롬프트, NEGATIVE_PROMPT_BASE 등은 요청마다 거의 같음)
+"""
+import sys
+from typing import Dict, Optional, Tuple
+
+from models.preset import BrandPreset
+from services.lru_cache import LRUCache
+from services.preset_registry import PresetKey, preset_registry
+from config import settings
+
+# 프롬프트 조각 구분자 (prompt_engine이 쉼표로 조합하므로 split/join이 정확히 역연산)
+PROMPT_SEPARATOR = ", "
+
+# 생성 히스토리에서 조각으로 저장하는 프롬프트 필드
+PROMPT_FIELDS = ("positive_prompt", "negative_prompt")
+
+# update_generation으로 갱신되는 필드
+GENERATION_UPDATE_FIELDS = ("status", "result", "error", "backfill")
+
+
+def _approx_size(value) -> int:
+    """
+    히스토리 항목의 대략적인 메모리 크기 (bytes)
+    문자열 길이 위주로 합산 (base64 이미지가 대부분을 차지하므로 정확한 객체 크기 대신 사용)
+    """
+    if isinstance(value, (str, bytes)):
+        return len(value) + 50
+    if isinstance(value, dict):
+        return 64 + sum(_approx_size(k) + _approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(_approx_size(v) for v in value)
+    return 24
+
+
+class PromptInterner:
+    """
+    프롬프트를 intern된 조각 튜플로 변환
+    조각은 sys.intern으로 공유 (참조가 없어지면 해제됨),
+    조각 구성이 같은 프롬프트는 최근 튜플을 그대로 재사용
+    """
+
+    def __init__(self, maxsize: int):
+        self._segments = LRUCache(maxsize)
+
+    def intern(self, prompt: str) -> Tuple[str, ...]:
+        """프롬프트 -> 공유 조각 튜플"""
+        segments = tuple(sys.intern(part) for part in prompt.split(PROMPT_SEPARATOR))
+        shared = self._segments.get(segments)
+        if shared is not None:
+            return shared
+        self._segments.set(segments, segments)
+        return segments
+
+    @staticmethod
+    def join(segments: Tuple[str, ...]) -> str:
+        """조각 튜플 -> 프롬프트"""
+        return PROMPT_SEPARATOR.join(segments)
+
+    def get_stats(self) -> Dict:
+        """튜플 재사용 통계"""
+        return self._segments.stats()
+
+
+class SessionRecord:
+    """세션 레코드 (프리셋은 키만 보관하고 레지스트리의 공유 객체를 사용)"""
+
+    __slots__ = ("preset_key", "created_at")
+
+    def __init__(self, preset_key: PresetKey, created_at: float):
+        self.preset_key = preset_key
+        self.created_at = created_at
+
+    @property
+    def preset(self) -> BrandPreset:
+        """조합별로 공유하는 BrandPreset"""
+        return preset_registry.get(*self.preset_key).preset
+
+
+class GenerationRecord:
+    """
+    생성 히스토리 레코드
+    프롬프트는 조각 튜플로, 나머지 메타데이터는 그대로 보관하고 조회 시 dict로 복원
+    """
+
+    __slots__ = (
+        "session_id", "created_at", "metadata", "positive_prompt", "negative_prompt",
+        "status", "result", "error", "backfill", "extra", "size",
+    )
+
+    def __init__(self, session_id: str, created_at: float, metadata: Dict, interner: PromptInterner):
+        self.session_id = session_id
+        self.created_at = created_at
+
+        # 프롬프트 필드는 조각 튜플로 분리 (작업 등록 시점 등 프롬프트가 없으면 None)
+        for field in PROMPT_FIELDS:
+            prompt = metadata.get(field)
+            setattr(self, field, interner.intern(prompt) if isinstance(prompt, str) else None)
+        self.metadata = {
+            key: value for key, value in metadata.items()
+            if key not in PROMPT_FIELDS or not isinstance(value, str)
+        }
+
+        self.status: Optional[str] = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.backfill: Optional[Dict] = None
+        self.extra: Optional[Dict] = None
+
+        # 저장소가 계산해 둔 대략적인 크기 (approx_size)
+        self.size = 0
+
+    def update(self, updates: Dict):
+        """필드 병합 (알 수 없는 필드는 extra에 보관)"""
+        for key, value in updates.items():
+            if key in GENERATION_UPDATE_FIELDS:
+                setattr(self, key, value)
+            else:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[key] = value
+
+    def to_dict(self) -> Dict:
+        """저장 전과 같은 dict 형식으로 복원 (설정된 필드만 포함)"""
+        metadata = {
+            field: PromptInterner.join(getattr(self, field))
+            for field in PROMPT_FIELDS if getattr(self, field) is not None
+        }
+        metadata.update(self.metadata)
+
+        data = {
+            "session_id": self.session_id,
+            "metadata": metadata,
+            "created_at": self.created_at,
+        }
+        for field in GENERATION_UPDATE_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def approx_size(self) -> int:
+        """
+        레코드가 추가로 차지하는 대략적인 크기 (bytes)
+        공유 프롬프트 조각은 제외하고 조각 참조(튜플)만 계산
+        """
+        size = 120 + _approx_size(self.metadata)
+        for field in PROMPT_FIELDS:
+            segments = getattr(self, field)
+            if segments is not None:
+                size += 56 + 8 * len(segments)
+        for field in GENERATION_UPDATE_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                size += _approx_size(value)
+        if self.extra:
+            size += _approx_size(self.extra)
+        return size
+
+
+# 싱글톤 인스턴스
+prompt_interner = PromptInterner(maxsize=settings.PROMPT_INTERN_CACHE_SIZE)
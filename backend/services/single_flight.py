@@ -0,0 +1,55 @@
+"""
+중복 요청 병합 서비스 (single-flight)
+같은 키로 동시에 들어온 작업은 하나만 실행하고 나머지는 그 결과를 함께 사용
+(예: "생성하기" 더블클릭, 같은 프리셋으로 동시에 생성)
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """키별 진행 중 작업을 공유하는 요청 병합기 (단일 이벤트 루프에서 사용)"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        키에 해당하는 작업 실행 (이미 진행 중이면 그 결과를 기다림)
+
+        Args:
+            key: 병합 키 (같은 결과를 내는 요청은 같은 키)
+            fn: 실제 작업 코루틴 함수
+
+        Returns:
+            작업 결과 (예외도 모든 대기자에게 그대로 전달)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+            logger.info(f"🔗 진행 중인 동일 생성 작업에 합류 (대기 {self.coalesced}회째)")
+
+        # 한 요청이 취소되어도 다른 대기자를 위해 작업은 계속 실행
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> Dict:
+        """병합 통계"""
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
+
+
+# 싱글톤 인스턴스
+generation_flight = SingleFlight()
@@ -0,0 +1,26 @@
+"""
+테스트 공용 헬퍼
+"""
+from services.provider_router import ProviderHealth, ProviderRouter
+
+
+def generation_metadata(**fields) -> dict:
+    """생성 히스토리 메타데이터 (지정하지 않은 필드는 기본값)"""
+    fields.setdefault("positive_prompt", "photo of a traveler, Paris Eiffel Tower, high quality")
+    fields.setdefault("negative_prompt", "blurry, low quality")
+    fields.setdefault("seeds", [1, 2, 3, 4])
+    return fields
+
+
+def generation_record(session_id: str, created_at: float = 1.0, **metadata) -> dict:
+    """저장소에 저장하는 생성 히스토리 레코드"""
+    return {"session_id": session_id, "created_at": created_at, "metadata": generation_metadata(**metadata)}
+
+
+def make_router(**generators) -> ProviderRouter:
+    """가짜 공급자(이름=생성기)로 구성한 라우터 (인자 순서가 설정 순서)"""
+    router = ProviderRouter([])
+    router.providers = generators
+    router.health = {name: ProviderHealth(name) for name in generators}
+    router.priority = {name: i for i, name in enumerate(generators)}
+    return router
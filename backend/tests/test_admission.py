@@ -0,0 +1,118 @@
+"""
+공급자 호출 제한 테스트 (동시 호출 수, 토큰 버킷)
+"""
+import asyncio
+import time
+
+from config import settings
+from services.admission import AdmissionController, ProviderLimiter
+
+run = asyncio.run
+
+
+def test_concurrency_cap():
+    limiter = ProviderLimiter("test", max_concurrency=2, requests_per_minute=0, burst=1)
+    active = {"now": 0, "max": 0}
+
+    async def call():
+        await limiter.acquire()
+        try:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.02)
+            active["now"] -= 1
+        finally:
+            limiter.release()
+
+    async def main():
+        await asyncio.gather(*[call() for _ in range(6)])
+
+    run(main())
+    stats = limiter.get_stats()
+    assert active["max"] == 2
+    assert stats["admitted"] == 6
+    assert stats["in_flight"] == 0
+    assert stats["concurrency_waits"] >= 1
+
+
+def test_admits_in_arrival_order():
+    limiter = ProviderLimiter("test", max_concurrency=1, requests_per_minute=0, burst=1)
+    order = []
+
+    async def call(i):
+        await limiter.acquire()
+        order.append(i)
+        await asyncio.sleep(0.001)
+        limiter.release()
+
+    async def main():
+        await asyncio.gather(*[call(i) for i in range(5)])
+
+    run(main())
+    assert order == list(range(5))
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    # 분당 600회 = 0.1초당 1회, burst 2
+    limiter = ProviderLimiter("test", max_concurrency=10, requests_per_minute=600, burst=2)
+
+    async def main():
+        started_at = time.monotonic()
+        admitted_at = []
+        for _ in range(4):
+            await limiter.acquire()
+            admitted_at.append(time.monotonic() - started_at)
+            limiter.release()
+        return admitted_at
+
+    admitted_at = run(main())
+    # burst 2개는 바로 통과, 이후는 0.1초 간격
+    assert admitted_at[1] < 0.05
+    assert 0.08 <= admitted_at[2] < 0.2
+    assert 0.18 <= admitted_at[3] < 0.3
+    assert limiter.get_stats()["throttled"] == 2
+
+
+def test_zero_rate_disables_throttling():
+    limiter = ProviderLimiter("test", max_concurrency=10, requests_per_minute=0, burst=1)
+
+    async def main():
+        for _ in range(20):
+            await limiter.acquire()
+            limiter.release()
+
+    run(main())
+    assert limiter.get_stats()["throttled"] == 0
+
+
+def test_cancelled_waiter_does_not_hold_slot():
+    """대기 중 취소된 요청은 슬롯을 차지하지 않음"""
+    limiter = ProviderLimiter("test", max_concurrency=1, requests_per_minute=0, burst=1)
+
+    async def main():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        limiter.release()
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+        limiter.release()
+
+    run(main())
+    assert limiter.get_stats()["in_flight"] == 0
+    assert limiter.get_stats()["queue_length"] == 0
+
+
+def test_controller_uses_per_provider_limits(monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_LIMITS", {
+        "google_ai": {"max_concurrency": 2},
+        "google_ai:fast-model": {"max_concurrency": 5, "requests_per_minute": 30},
+    })
+    controller = AdmissionController()
+
+    assert controller.limiter("google_ai", "other-model").max_concurrency == 2
+    fast = controller.limiter("google_ai", "fast-model")
+    assert (fast.max_concurrency, fast.requests_per_minute) == (5, 30)
+    assert controller.limiter("replicate").max_concurrency == settings.PROVIDER_MAX_CONCURRENCY
+    assert controller.limiter("google_ai", "fast-model") is fast
@@ -0,0 +1,49 @@
+"""
+Gradio 생성기 오류 처리 테스트 (연결 오류만 Client 교체/재시도)
+"""
+import asyncio
+from concurrent.futures import Future
+
+import httpx
+import pytest
+
+from services.image_generator_gradio import GradioImageGenerator
+from services.retry import ProviderError
+
+
+def _generator(error: Exception) -> GradioImageGenerator:
+    generator = GradioImageGenerator()
+    generator._clients = ["client-1", "client-2"]
+
+    def submit(*args):
+        job = Future()
+        job.set_exception(error)
+        return job
+
+    generator._submit = submit
+    return generator
+
+
+def _generate(generator: GradioImageGenerator):
+    return asyncio.run(generator.generate_single_image(
+        "prompt", "negative", 512, 512, seed=1, generation_id="generation-1", index=0
+    ))
+
+
+@pytest.mark.parametrize("error", [httpx.ConnectError("refused"), TimeoutError()])
+def test_transport_error_discards_client_and_retries(error):
+    generator = _generator(error)
+
+    with pytest.raises(ProviderError) as info:
+        _generate(generator)
+    assert info.value.retryable
+    assert generator._clients == ["client-2"]
+
+
+def test_application_error_fails_fast_and_keeps_client():
+    generator = _generator(ValueError("invalid width"))
+
+    with pytest.raises(ProviderError) as info:
+        _generate(generator)
+    assert not info.value.retryable
+    assert generator._clients == ["client-1", "client-2"]
@@ -0,0 +1,169 @@
+"""
+요청 헤징 테스트 (지연 시간 백분위, 중복 요청 예산, 헤징 시작 조건)
+"""
+import asyncio
+
+import pytest
+
+from config import settings
+from services.hedging import HedgeBudget, LatencyWindow
+from services.provider_router import ProviderRouter
+from tests.helpers import make_router
+
+
+def test_latency_percentile_nearest_rank():
+    window = LatencyWindow(100)
+    assert window.percentile(0.9) is None
+
+    for seconds in range(1, 11):
+        window.record(float(seconds))
+
+    assert window.percentile(0.9) == 9.0
+    assert window.percentile(0.5) == 5.0
+    assert window.percentile(1.0) == 10.0
+    assert window.percentile(0.0) == 1.0
+
+
+def test_latency_window_keeps_recent_samples():
+    window = LatencyWindow(3)
+    for seconds in (100.0, 1.0, 2.0, 3.0):
+        window.record(seconds)
+
+    assert len(window) == 3
+    assert window.percentile(1.0) == 3.0
+
+
+def test_hedge_budget_burst_then_ratio():
+    budget = HedgeBudget(ratio=0.25, burst=2)
+
+    assert budget.try_acquire()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+
+    # 일반 요청 4건마다 중복 요청 1건
+    for _ in range(3):
+        budget.on_request()
+    assert not budget.try_acquire()
+    budget.on_request()
+    assert budget.try_acquire()
+
+    stats = budget.get_stats()
+    assert (stats["requests"], stats["hedges"], stats["denied"]) == (4, 3, 2)
+
+
+def test_hedge_budget_ratio_survives_float_rounding():
+    """0.1씩 10번 적립하면 정확히 1이 되지 않아도 중복 요청 1건 허용"""
+    budget = HedgeBudget(ratio=0.1, burst=1)
+    assert budget.try_acquire()
+
+    for _ in range(3):
+        for _ in range(10):
+            budget.on_request()
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+
+def test_hedge_budget_caps_tokens_at_burst():
+    budget = HedgeBudget(ratio=0.5, burst=2)
+    for _ in range(100):
+        budget.on_request()
+
+    assert budget.get_stats()["tokens"] == 2
+    assert budget.try_acquire() and budget.try_acquire()
+    assert not budget.try_acquire()
+
+
+def test_zero_ratio_allows_only_burst():
+    budget = HedgeBudget(ratio=0, burst=1)
+    for _ in range(100):
+        budget.on_request()
+
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+
+
+class SlowGenerator:
+    """delay초 뒤 이미지를 반환하는 공급자"""
+
+    model = "fake"
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+        self.cancelled = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    async def generate_admitted_image(self, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {"seed": kwargs["seed"]}
+
+
+def _record_latencies(router: ProviderRouter, seconds: float, count: int):
+    for _ in range(count):
+        router.latency.record(seconds)
+
+
+def test_hedge_delay_needs_min_samples():
+    router = make_router()
+    _record_latencies(router, 5.0, settings.HEDGE_MIN_SAMPLES - 1)
+    assert router.hedge_delay() is None
+
+    router.latency.record(5.0)
+    assert router.hedge_delay() == 5.0
+
+
+def test_hedge_delay_has_floor():
+    router = make_router()
+    _record_latencies(router, 0.01, settings.HEDGE_MIN_SAMPLES)
+
+    assert router.hedge_delay() == settings.HEDGE_MIN_DELAY_SECONDS
+
+
+def _generate_hedged(router: ProviderRouter):
+    return asyncio.run(router._generate_hedged("prompt", "negative", 512, 512, 1, "generation-1", 0))
+
+
+def test_slow_primary_is_hedged_to_alternate_provider(monkeypatch):
+    monkeypatch.setattr(settings, "HEDGE_MIN_DELAY_SECONDS", 0.05)
+    slow, fast = SlowGenerator(1.0), SlowGenerator(0.0)
+    router = make_router(slow=slow, fast=fast)
+    _record_latencies(router, 0.05, settings.HEDGE_MIN_SAMPLES)
+
+    image = _generate_hedged(router)
+
+    assert image["provider"] == "fast"
+    assert router.hedge_wins == 1
+    assert slow.cancelled == 1
+    assert router.hedge_budget.get_stats()["hedges"] == 1
+
+
+def test_no_hedge_without_budget(monkeypatch):
+    monkeypatch.setattr(settings, "HEDGE_MIN_DELAY_SECONDS", 0.01)
+    slow, fast = SlowGenerator(0.1), SlowGenerator(0.0)
+    router = make_router(slow=slow, fast=fast)
+    router.hedge_budget = HedgeBudget(ratio=0, burst=1)
+    router.hedge_budget.try_acquire()
+    _record_latencies(router, 0.01, settings.HEDGE_MIN_SAMPLES)
+
+    image = _generate_hedged(router)
+
+    assert image["provider"] == "slow"
+    assert fast.calls == 0
+    assert router.hedge_budget.get_stats()["denied"] == 1
+
+
+@pytest.mark.parametrize("samples", [0, 1])
+def test_no_hedge_before_enough_samples(samples):
+    slow, fast = SlowGenerator(0.05), SlowGenerator(0.0)
+    router = make_router(slow=slow, fast=fast)
+    _record_latencies(router, 0.01, samples)
+
+    assert _generate_hedged(router)["provider"] == "slow"
+    assert fast.calls == 0
@@ -0,0 +1,48 @@
+"""
+한글 장소 입력 변환 테스트 (자모/초성 매칭, 일반 장소 유형)
+"""
+import pytest
+
+from data.mappings import (
+    resolve_korean_location,
+    search_locations,
+    translate_korean_location,
+)
+from services.prompt_engine import prompt_engine
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("파리", "Paris"),
+    ("팔", "Paris"),
+    ("ㅍㄹ", "Paris"),
+    ("에펠탑", "Eiffel Tower"),
+])
+def test_resolve_place_names(query, expected):
+    assert resolve_korean_location(query) == expected
+
+
+@pytest.mark.parametrize("query", ["도", "해", "파", "ㅅ", "산책로"])
+def test_short_or_unknown_input_is_not_resolved(query):
+    assert resolve_korean_location(query) is None
+
+
+@pytest.mark.parametrize("query", ["해변", "ㅎㅂ", "바다", "산", "도시", "거리"])
+def test_generic_words_do_not_match_specific_locations(query):
+    assert resolve_korean_location(query) is None
+    assert search_locations(query) == []
+
+
+@pytest.mark.parametrize("location, expected", [
+    ("해변", "beach"),
+    ("산", "mountain"),
+    ("제주 바다", "Jeju Island ocean"),
+    ("파리에서", "Paris"),
+    ("산책로", "산책로"),
+    ("도", "도"),
+])
+def test_translate_korean_location(location, expected):
+    assert translate_korean_location(location) == expected
+
+
+def test_generic_word_location_prompt():
+    assert prompt_engine._build_location_prompt("해변").startswith("(beach:1.7)")
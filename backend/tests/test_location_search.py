@@ -0,0 +1,111 @@
+"""
+장소 검색 인덱스 테스트 (기존 전체 스캔과 결과/순서 동일)
+"""
+import pytest
+
+from data import mappings
+from data.mappings import LOCATION_DATA, build_location_index, search_locations
+
+
+def _location(location_id, display_name, city, country, location_type, keywords, priority=1,
+              display_name_kr=None, city_kr=None, country_kr=None):
+    return {
+        "id": location_id,
+        "display_name_kr": display_name_kr or display_name,
+        "display_name_en": display_name,
+        "city_kr": city_kr if city_kr is not None else city,
+        "city_en": city,
+        "country_kr": country_kr or country,
+        "country_en": country,
+        "priority": priority,
+        "type": location_type,
+        "search_keywords": keywords,
+        "landmark_prompt": "",
+    }
+
+
+FIXTURE = {
+    "FRANCE": _location("FRANCE", "France", "", "France", "Country", ["France", "Paris", "Europe"]),
+    "FR_PAR": _location("FR_PAR", "Paris", "Paris", "France", "City", ["Paris", "Eiffel", "Louvre"]),
+    "PAR_EIF": _location("PAR_EIF", "Eiffel Tower", "Paris", "France", "Landmark", ["Eiffel", "Tower"]),
+    "US_PAR": _location("US_PAR", "Paris Las Vegas", "Las Vegas", "United States", "Landmark",
+                        ["Paris", "Casino"], priority=2),
+    "KR_SEL": _location("KR_SEL", "Seoul", "Seoul", "South Korea", "City", ["Seoul", "Tower"],
+                        display_name_kr="서울", city_kr="서울", country_kr="대한민국"),
+    "SEL_NST": _location("SEL_NST", "N Seoul Tower", "Seoul", "South Korea", "Landmark", ["Namsan", "Tower"],
+                         priority=2, display_name_kr="N서울타워", city_kr="서울", country_kr="대한민국"),
+}
+
+QUERIES = [
+    "Paris", "paris", "  PARIS ", "par", "Eiffel", "tower", "Tow", "e", "fr", "France",
+    "las vegas", "Vegas", "seoul", "N Seoul", "서울", "서", "대한민국", "N서울", "남산", "xyz", "",
+]
+
+
+def _reference_search(locations: dict, query: str, limit: int = 10) -> list:
+    """인덱스 도입 전의 전체 스캔 구현"""
+    query_lower = query.lower().strip()
+    if not query_lower:
+        return []
+
+    results = []
+    for location_data in locations.values():
+        score = 0
+        matched_type = None
+
+        if location_data["country_en"].lower() == query_lower or \
+           location_data["country_kr"] == query or \
+           query_lower in location_data["country_en"].lower():
+            score = 100 if location_data["type"] == "Country" else 50
+            matched_type = "country"
+        elif location_data["city_en"] and \
+             (location_data["city_en"].lower() == query_lower or
+              location_data["city_kr"] == query or
+              query_lower in location_data["city_en"].lower()):
+            score = 80 if location_data["type"] == "City" else 40
+            matched_type = "city"
+        elif any(query_lower in keyword.lower() for keyword in location_data["search_keywords"]):
+            score = 60 if location_data["type"] == "Landmark" else 30
+            matched_type = "keyword"
+        elif query_lower in location_data["display_name_en"].lower() or \
+             query in location_data["display_name_kr"]:
+            score = 70
+            matched_type = "landmark"
+
+        if score > 0:
+            results.append({
+                **location_data,
+                "match_score": score + (2 - location_data["priority"]) * 10,
+                "matched_type": matched_type
+            })
+
+    results.sort(key=lambda x: x["match_score"], reverse=True)
+    return results[:limit]
+
+
+@pytest.fixture
+def no_korean_fallback(monkeypatch):
+    """한글 재검색(인덱스 도입 후 추가된 동작)은 비교에서 제외"""
+    monkeypatch.setattr(mappings, "resolve_korean_location", lambda query: None)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("limit", [2, 10])
+def test_index_matches_linear_scan_on_fixture(query, limit, monkeypatch, no_korean_fallback):
+    monkeypatch.setattr(mappings, "_location_index", build_location_index(FIXTURE))
+
+    assert search_locations(query, limit) == _reference_search(FIXTURE, query, limit)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_index_matches_linear_scan_on_location_data(query, no_korean_fallback):
+    assert search_locations(query, 50) == _reference_search(LOCATION_DATA, query, 50)
+
+
+def test_index_postings_cover_all_fields():
+    index = build_location_index(FIXTURE)
+
+    assert [record["data"]["id"] for record in index["records"]] == list(FIXTURE)
+    assert index["postings"]["par"] == {0, 1, 2, 3}
+    assert index["postings"]["서울"] == {4, 5}
+    assert "xyz" not in index["postings"]
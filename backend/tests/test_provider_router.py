@@ -0,0 +1,195 @@
+"""
+공급자 상태/서킷 브레이커 테스트 (closed -> open -> half-open -> closed/open)
+"""
+import asyncio
+import time
+
+import pytest
+
+from config import settings
+from services.provider_router import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    ProviderHealth,
+    ProviderRouter,
+)
+from services.retry import ProviderError
+from tests.helpers import make_router
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.monotonic을 수동으로 진행하는 시계"""
+    now = {"value": 1000.0}
+    monkeypatch.setattr(time, "monotonic", lambda: now["value"])
+    return now
+
+
+def _open_circuit(health: ProviderHealth):
+    for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD):
+        health.record_failure(1.0)
+
+
+def test_opens_after_consecutive_failures(clock):
+    health = ProviderHealth("test")
+
+    for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD - 1):
+        health.record_failure(1.0)
+    assert health.state == CIRCUIT_CLOSED
+    assert health.allow_request()
+
+    health.record_failure(1.0)
+    assert health.state == CIRCUIT_OPEN
+    assert health.times_opened == 1
+    assert not health.allow_request()
+
+
+def test_success_resets_consecutive_failures(clock):
+    health = ProviderHealth("test")
+
+    for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD - 1):
+        health.record_failure(1.0)
+    health.record_success(1.0)
+    health.record_failure(1.0)
+
+    assert health.state == CIRCUIT_CLOSED
+    assert health.consecutive_failures == 1
+
+
+def test_opens_on_error_rate(clock, monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 100)
+    health = ProviderHealth("test")
+
+    # 중간에 성공이 섞여 연속 실패 기준에는 못 미치지만 오류율이 기준을 넘음
+    for _ in range(settings.CIRCUIT_MIN_SAMPLES):
+        health.record_success(1.0)
+        for _ in range(3):
+            health.record_failure(1.0)
+        if health.state == CIRCUIT_OPEN:
+            break
+
+    assert health.state == CIRCUIT_OPEN
+    assert health.consecutive_failures < settings.CIRCUIT_FAILURE_THRESHOLD
+    assert health.samples >= settings.CIRCUIT_MIN_SAMPLES
+
+
+def test_half_open_allows_single_probe(clock):
+    health = ProviderHealth("test")
+    _open_circuit(health)
+
+    clock["value"] += settings.CIRCUIT_OPEN_SECONDS - 1
+    assert not health.allow_request()
+
+    clock["value"] += 1
+    assert health.allow_request()
+    assert health.state == CIRCUIT_HALF_OPEN
+    # 시험 요청이 끝나기 전에는 다른 요청을 허용하지 않음
+    assert not health.allow_request()
+
+
+def test_probe_success_closes_circuit(clock):
+    health = ProviderHealth("test")
+    _open_circuit(health)
+    clock["value"] += settings.CIRCUIT_OPEN_SECONDS
+
+    assert health.allow_request()
+    health.record_success(1.0)
+
+    assert health.state == CIRCUIT_CLOSED
+    assert health.allow_request()
+    assert health.allow_request()
+
+
+def test_probe_failure_reopens_circuit(clock):
+    health = ProviderHealth("test")
+    _open_circuit(health)
+    clock["value"] += settings.CIRCUIT_OPEN_SECONDS
+
+    assert health.allow_request()
+    health.record_failure(1.0)
+
+    assert health.state == CIRCUIT_OPEN
+    assert health.times_opened == 2
+    assert not health.allow_request()
+
+    clock["value"] += settings.CIRCUIT_OPEN_SECONDS
+    assert health.allow_request()
+
+
+def test_cancelled_probe_frees_slot(clock):
+    health = ProviderHealth("test")
+    _open_circuit(health)
+    clock["value"] += settings.CIRCUIT_OPEN_SECONDS
+
+    assert health.allow_request()
+    health.record_cancelled()
+
+    assert health.state == CIRCUIT_HALF_OPEN
+    assert health.allow_request()
+
+
+class FakeGenerator:
+    """지정한 오류를 발생시키거나 이미지를 반환하는 공급자"""
+
+    model = "fake"
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    async def generate_admitted_image(self, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return {"seed": kwargs["seed"]}
+
+
+def _route(router: ProviderRouter):
+    return asyncio.run(router._route_image("prompt", "negative", 512, 512, 1, "generation-1", 0))
+
+
+def test_router_fails_over_to_healthier_provider(clock):
+    broken, backup = FakeGenerator(ProviderError("unavailable", status_code=503)), FakeGenerator()
+    router = make_router(broken=broken, backup=backup)
+
+    assert _route(router)["provider"] == "backup"
+    assert (broken.calls, backup.calls, router.failovers) == (1, 1, 1)
+
+    # 실패로 점수가 낮아진 공급자는 다음 요청부터 뒤로 밀림
+    assert router.candidates() == ["backup", "broken"]
+    assert _route(router)["provider"] == "backup"
+    assert (broken.calls, backup.calls, router.failovers) == (1, 2, 1)
+
+
+def test_router_skips_open_circuit(clock):
+    error = ProviderError("unavailable", status_code=503)
+    broken, other = FakeGenerator(error), FakeGenerator(error)
+    router = make_router(broken=broken, other=other)
+    _open_circuit(router.health["broken"])
+
+    with pytest.raises(ProviderError):
+        _route(router)
+    assert (broken.calls, other.calls) == (0, 1)
+
+    # 대기 시간이 지나면 시험 요청을 보냄
+    clock["value"] += settings.CIRCUIT_OPEN_SECONDS
+    broken.error = None
+    assert _route(router)["provider"] == "broken"
+    assert router.health["broken"].state == CIRCUIT_CLOSED
+
+
+def test_local_timeout_is_not_counted_as_provider_failure(clock):
+    timeout = ProviderError("제한 시간 초과", retryable=False, local=True)
+    router = make_router(slow=FakeGenerator(timeout))
+
+    for _ in range(settings.CIRCUIT_FAILURE_THRESHOLD + 1):
+        with pytest.raises(ProviderError):
+            _route(router)
+
+    health = router.health["slow"]
+    assert health.state == CIRCUIT_CLOSED
+    assert health.failures == 0
@@ -0,0 +1,148 @@
+"""
+재시도 정책 테스트 (Retry-After, 재시도 대상 판단, 제한 시간)
+"""
+import asyncio
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from services.admission import ProviderLimiter
+from services.retry import (
+    ProviderError,
+    RetryPolicy,
+    is_local_error,
+    is_retryable,
+    parse_retry_after,
+)
+
+
+def _policy(max_attempts: int = 3, deadline_seconds: float = 5.0) -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=max_attempts,
+        base_delay=0.01,
+        max_delay=0.02,
+        deadline_seconds=deadline_seconds
+    )
+
+
+def _flaky(errors):
+    """errors를 순서대로 발생시킨 뒤 "ok" 반환하는 코루틴 함수"""
+    calls = {"count": 0}
+
+    async def fn():
+        calls["count"] += 1
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return fn, calls
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+    seconds = parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+    assert 25 <= seconds <= 30
+
+
+def test_is_retryable():
+    assert is_retryable(ProviderError("quota", status_code=429))
+    assert is_retryable(ProviderError("unavailable", status_code=503))
+    assert not is_retryable(ProviderError("bad request", status_code=400))
+    assert not is_retryable(ProviderError("no status"))
+    assert is_retryable(ProviderError("dropped", retryable=True))
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(ValueError("bug"))
+
+
+def test_backoff_uses_retry_after():
+    policy = _policy()
+    assert policy.backoff(1, ProviderError("quota", status_code=429, retry_after=7.5)) == 7.5
+    assert 0 <= policy.backoff(5, ProviderError("quota", status_code=429)) <= policy.max_delay
+
+
+def test_retries_retryable_errors():
+    policy = _policy()
+    fn, calls = _flaky([
+        ProviderError("quota", status_code=429, retry_after=0),
+        httpx.ConnectError("refused"),
+    ])
+
+    assert asyncio.run(policy.run(fn)) == "ok"
+    assert calls["count"] == 3
+    assert policy.retries == 2
+
+
+def test_fatal_error_is_not_retried():
+    policy = _policy()
+    fn, calls = _flaky([ProviderError("bad request", status_code=400)])
+
+    with pytest.raises(ProviderError, match="bad request"):
+        asyncio.run(policy.run(fn))
+    assert calls["count"] == 1
+    assert policy.retries == 0
+
+
+def test_gives_up_after_max_attempts():
+    policy = _policy(max_attempts=2)
+    fn, calls = _flaky([ProviderError("quota", status_code=429, retry_after=0) for _ in range(5)])
+
+    with pytest.raises(ProviderError, match="quota"):
+        asyncio.run(policy.run(fn))
+    assert calls["count"] == 2
+    assert policy.gave_up == 1
+
+
+def test_retry_after_past_deadline_stops_retrying():
+    policy = _policy(deadline_seconds=1.0)
+    fn, calls = _flaky([ProviderError("quota", status_code=429, retry_after=10)])
+
+    with pytest.raises(ProviderError, match="quota"):
+        asyncio.run(policy.run(fn))
+    assert calls["count"] == 1
+    assert policy.deadline_exceeded == 1
+
+
+def test_deadline_cuts_slow_call():
+    policy = _policy(deadline_seconds=0.1)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    with pytest.raises(ProviderError, match="제한 시간") as info:
+        asyncio.run(policy.run(slow))
+    assert is_local_error(info.value)
+    assert policy.deadline_exceeded == 1
+
+
+def test_deadline_excludes_admission_wait():
+    """호출 제한기에서 기다린 시간은 제한 시간에 포함하지 않음"""
+    policy = _policy(deadline_seconds=0.5)
+    limiter = ProviderLimiter("test", max_concurrency=1, requests_per_minute=0, burst=1)
+
+    class Slot:
+        async def __aenter__(self):
+            await limiter.acquire()
+
+        async def __aexit__(self, *exc):
+            limiter.release()
+
+    async def call():
+        await asyncio.sleep(0.2)
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(
+            *[policy.run(call, admit=Slot) for _ in range(5)],
+            return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert results == ["ok"] * 5
+    assert policy.deadline_exceeded == 0
@@ -0,0 +1,123 @@
+"""
+세션 저장소 테스트 (메모리 저장소의 생성 히스토리 한도)
+"""
+import pytest
+
+from config import settings
+from services.session_backends import MemorySessionBackend
+from tests.helpers import generation_record
+
+PRESET_KEY = ("vibrant_energetic", "korean", "20s_30s")
+
+
+@pytest.fixture
+def backend():
+    backend = MemorySessionBackend()
+    backend.create_session("session-1", PRESET_KEY, 1.0)
+    return backend
+
+
+def _history_ids(backend: MemorySessionBackend) -> list:
+    return list(backend._generation_history)
+
+
+def test_memory_resave_same_generation_keeps_byte_count(backend):
+    """같은 ID를 다시 저장해도 대략적인 크기가 누적되지 않음"""
+    backend.save_generation("generation-1", generation_record("session-1"))
+    size = backend.get_history_stats()["approx_bytes"]
+    assert size > 0
+
+    for _ in range(3):
+        backend.save_generation("generation-1", generation_record("session-1"))
+
+    stats = backend.get_history_stats()
+    assert stats["entries"] == 1
+    assert stats["approx_bytes"] == size
+
+    backend.delete_session("session-1")
+    stats = backend.get_history_stats()
+    assert stats["entries"] == 0
+    assert stats["approx_bytes"] == 0
+
+
+def test_max_entries_evicts_least_recently_used(backend, monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_HISTORY_MAX_ENTRIES", 3)
+
+    for i in range(1, 4):
+        backend.save_generation(f"generation-{i}", generation_record("session-1"))
+    # 조회/갱신한 항목은 가장 최근 사용으로 이동
+    backend.get_generation("generation-1")
+    backend.update_generation("generation-2", {"status": "completed"})
+    backend.save_generation("generation-4", generation_record("session-1"))
+
+    assert _history_ids(backend) == ["generation-1", "generation-2", "generation-4"]
+    assert backend.get_generation("generation-3") is None
+
+    stats = backend.get_history_stats()
+    assert stats["entries"] == 3
+    assert stats["evictions"] == {"max_entries": 1, "max_bytes": 0, "session_expired": 0}
+
+
+def test_max_bytes_evicts_until_under_budget(backend, monkeypatch):
+    backend.save_generation("generation-1", generation_record("session-1"))
+    entry_bytes = backend.get_history_stats()["approx_bytes"]
+    monkeypatch.setattr(settings, "GENERATION_HISTORY_MAX_BYTES", entry_bytes * 3)
+
+    for i in range(2, 6):
+        backend.save_generation(f"generation-{i}", generation_record("session-1"))
+
+    stats = backend.get_history_stats()
+    assert _history_ids(backend) == ["generation-3", "generation-4", "generation-5"]
+    assert stats["approx_bytes"] <= settings.GENERATION_HISTORY_MAX_BYTES
+    assert stats["evictions"]["max_bytes"] == 2
+
+
+def test_oversized_entry_is_kept_alone(backend, monkeypatch):
+    """한도보다 큰 항목도 방금 저장했다면 유지 (다른 항목은 모두 삭제)"""
+    backend.save_generation("generation-1", generation_record("session-1"))
+    backend.save_generation("generation-2", generation_record("session-1"))
+    monkeypatch.setattr(settings, "GENERATION_HISTORY_MAX_BYTES", 10)
+
+    backend.update_generation("generation-2", {"result": {"images": ["x" * 100]}})
+
+    assert _history_ids(backend) == ["generation-2"]
+    assert backend.get_history_stats()["evictions"]["max_bytes"] == 1
+
+
+def test_approx_bytes_tracks_updates_and_removals(backend):
+    backend.save_generation("generation-1", generation_record("session-1"))
+    saved = backend.get_history_stats()["approx_bytes"]
+
+    backend.update_generation("generation-1", {"result": {"images": ["x" * 1000]}})
+    updated = backend.get_history_stats()["approx_bytes"]
+    assert updated >= saved + 1000
+
+    backend.update_generation("generation-1", {"result": {"images": []}})
+    assert backend.get_history_stats()["approx_bytes"] < updated
+
+
+def test_expired_session_drops_its_history(backend):
+    backend.create_session("session-2", PRESET_KEY, 1.0 + settings.SESSION_EXPIRY_SECONDS)
+    backend.save_generation("generation-1", generation_record("session-1"))
+    backend.save_generation("generation-2", generation_record("session-1"))
+    backend.save_generation("generation-3", generation_record("session-2"))
+
+    assert backend.cleanup_expired(2.0 + settings.SESSION_EXPIRY_SECONDS) == 1
+
+    assert _history_ids(backend) == ["generation-3"]
+    stats = backend.get_history_stats()
+    assert stats["evictions"]["session_expired"] == 2
+    assert stats["approx_bytes"] == backend._generation_history["generation-3"].size
+
+
+def test_evicted_generation_leaves_session_index(backend, monkeypatch):
+    """LRU로 삭제된 항목은 세션별 목록에서도 빠짐 (세션 만료 시 다시 세지 않음)"""
+    monkeypatch.setattr(settings, "GENERATION_HISTORY_MAX_ENTRIES", 1)
+    backend.save_generation("generation-1", generation_record("session-1"))
+    backend.save_generation("generation-2", generation_record("session-1"))
+
+    backend.delete_session("session-1")
+
+    evictions = backend.get_history_stats()["evictions"]
+    assert evictions == {"max_entries": 1, "max_bytes": 0, "session_expired": 1}
+    assert backend._generations_by_session == {}
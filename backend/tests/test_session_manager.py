@@ -0,0 +1,224 @@
+"""
+SessionManager 저장소 공통 동작 테스트 (memory, sqlite, 키-값 저장소)
+"""
+import asyncio
+import itertools
+import threading
+import time
+
+import pytest
+
+from config import settings
+from services.preset_registry import preset_registry
+from services.session_backends import (
+    InMemoryKeyValueStore,
+    KeyValueSessionBackend,
+    MemorySessionBackend,
+    SQLiteSessionBackend,
+)
+from services.session_manager import SessionManager
+from tests.helpers import generation_metadata
+
+run = asyncio.run
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def manager(request, tmp_path):
+    if request.param == "memory":
+        backend = MemorySessionBackend()
+    elif request.param == "sqlite":
+        backend = SQLiteSessionBackend(tmp_path / "sessions.db", pool_size=2)
+    else:
+        backend = KeyValueSessionBackend(InMemoryKeyValueStore(), prefix="test")
+
+    yield SessionManager(backend=backend)
+    backend.close()
+
+
+@pytest.fixture
+def preset():
+    return preset_registry.get("vibrant_energetic", "korean", "20s_30s").preset
+
+
+def test_session_round_trip(manager, preset):
+    session_id = run(manager.create_session(preset))
+
+    session = run(manager.get_session(session_id))
+    assert session.preset_key == ("vibrant_energetic", "korean", "20s_30s")
+    assert run(manager.get_preset(session_id)) == preset
+    assert run(manager.get_session("missing")) is None
+
+
+def test_generation_round_trip(manager, preset):
+    session_id = run(manager.create_session(preset))
+    run(manager.save_generation("generation-1", session_id, generation_metadata()))
+
+    generation = run(manager.get_generation("generation-1"))
+    assert generation["session_id"] == session_id
+    assert generation["metadata"] == generation_metadata()
+
+    assert run(manager.update_generation("generation-1", {"status": "completed", "result": {"images": []}}))
+    generation = run(manager.get_generation("generation-1"))
+    assert generation["status"] == "completed"
+    assert generation["result"] == {"images": []}
+    assert generation["metadata"] == generation_metadata()
+
+    assert not run(manager.update_generation("missing", {"status": "completed"}))
+    assert run(manager.get_generation("missing")) is None
+
+
+def test_resave_generation_replaces_entry(manager, preset):
+    session_id = run(manager.create_session(preset))
+    run(manager.save_generation("generation-1", session_id, {"status": "pending"}))
+    run(manager.save_generation("generation-1", session_id, generation_metadata()))
+
+    assert run(manager.get_generation("generation-1"))["metadata"] == generation_metadata()
+    if manager.backend.name != "redis":
+        assert run(manager.get_stats())["total_generations"] == 1
+
+
+def test_delete_session_drops_generations(manager, preset):
+    session_id = run(manager.create_session(preset))
+    other_session_id = run(manager.create_session(preset))
+    run(manager.save_generation("generation-1", session_id, generation_metadata()))
+    run(manager.save_generation("generation-2", other_session_id, generation_metadata()))
+
+    manager.backend.delete_session(session_id)
+
+    assert run(manager.get_session(session_id)) is None
+    assert run(manager.get_generation("generation-1")) is None
+    assert run(manager.get_generation("generation-2")) is not None
+
+
+def test_expired_session(manager, preset, monkeypatch):
+    session_id = run(manager.create_session(preset))
+    run(manager.save_generation("generation-1", session_id, generation_metadata()))
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + settings.SESSION_EXPIRY_SECONDS + 1)
+
+    assert run(manager.get_preset(session_id)) is None
+    assert run(manager.get_generation("generation-1")) is None
+
+
+def test_cleanup_expired_sessions(manager, preset, monkeypatch):
+    if manager.backend.name == "redis":
+        pytest.skip("키-값 저장소는 서버 TTL로 만료")
+
+    expired_id = run(manager.create_session(preset))
+    run(manager.save_generation("generation-1", expired_id, generation_metadata()))
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + settings.SESSION_EXPIRY_SECONDS + 1)
+    active_id = run(manager.create_session(preset))
+
+    stats = run(manager.get_stats())
+    assert stats["active_sessions"] == 1
+    assert stats["expired_sessions"] == 1
+    assert stats["generation_history"]["evictions"]["session_expired"] == 1
+    assert run(manager.get_session(active_id)) is not None
+    assert run(manager.get_generation("generation-1")) is None
+
+
+def test_history_evicts_least_recently_used(manager, preset, monkeypatch):
+    if manager.backend.name == "redis":
+        pytest.skip("키-값 저장소는 서버 maxmemory 정책으로 관리")
+
+    # sqlite는 accessed_at으로 순서를 정하므로 시각이 겹치지 않게 고정 간격으로 증가
+    clock = itertools.count(time.time())
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+    monkeypatch.setattr(settings, "GENERATION_HISTORY_MAX_ENTRIES", 2)
+    monkeypatch.setattr(settings, "SESSION_SQLITE_TOUCH_INTERVAL_SECONDS", 0)
+
+    session_id = run(manager.create_session(preset))
+    run(manager.save_generation("generation-1", session_id, generation_metadata()))
+    run(manager.save_generation("generation-2", session_id, generation_metadata()))
+    run(manager.get_generation("generation-1"))
+    run(manager.save_generation("generation-3", session_id, generation_metadata()))
+
+    assert run(manager.get_generation("generation-2")) is None
+    assert run(manager.get_generation("generation-1")) is not None
+    assert run(manager.get_generation("generation-3")) is not None
+
+    history = run(manager.get_stats())["generation_history"]
+    assert history["entries"] == 2
+    assert history["evictions"]["max_entries"] == 1
+
+
+def test_history_byte_budget(manager, preset, monkeypatch):
+    if manager.backend.name == "redis":
+        pytest.skip("키-값 저장소는 서버 maxmemory 정책으로 관리")
+
+    clock = itertools.count(time.time())
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+
+    session_id = run(manager.create_session(preset))
+    run(manager.save_generation("generation-1", session_id, generation_metadata()))
+    entry_bytes = run(manager.get_stats())["generation_history"]["approx_bytes"]
+    monkeypatch.setattr(settings, "GENERATION_HISTORY_MAX_BYTES", entry_bytes * 2)
+
+    run(manager.save_generation("generation-2", session_id, generation_metadata()))
+    run(manager.update_generation("generation-2", {"result": {"images": ["x" * entry_bytes * 2]}}))
+
+    # 방금 갱신한 항목은 한도를 넘어도 유지
+    assert run(manager.get_generation("generation-1")) is None
+    assert run(manager.get_generation("generation-2")) is not None
+    assert run(manager.get_stats())["generation_history"]["evictions"]["max_bytes"] == 1
+
+
+def test_sqlite_read_touches_access_time_lazily(tmp_path, preset, monkeypatch):
+    """조회 시각은 SESSION_SQLITE_TOUCH_INTERVAL_SECONDS가 지난 뒤에만 갱신 (폴링마다 쓰지 않음)"""
+    backend = SQLiteSessionBackend(tmp_path / "sessions.db", pool_size=1)
+    manager = SessionManager(backend=backend)
+    session_id = run(manager.create_session(preset))
+    run(manager.save_generation("generation-1", session_id, generation_metadata()))
+
+    def accessed_at():
+        with backend._connection() as conn:
+            return conn.execute("SELECT accessed_at FROM generations").fetchone()[0]
+
+    saved_at = accessed_at()
+    run(manager.get_generation("generation-1"))
+    assert accessed_at() == saved_at
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + settings.SESSION_SQLITE_TOUCH_INTERVAL_SECONDS + 1)
+    run(manager.get_generation("generation-1"))
+    assert accessed_at() > saved_at
+    backend.close()
+
+
+def test_blocking_backend_runs_off_event_loop(tmp_path, preset):
+    """sqlite 저장소는 워커 스레드에서 호출되어 이벤트 루프를 막지 않음"""
+    backend = SQLiteSessionBackend(tmp_path / "sessions.db", pool_size=1)
+    manager = SessionManager(backend=backend)
+    threads = set()
+    original = backend.get_session
+
+    def get_session(session_id):
+        threads.add(threading.get_ident())
+        return original(session_id)
+
+    backend.get_session = get_session
+
+    async def main():
+        session_id = await manager.create_session(preset)
+        await manager.get_session(session_id)
+        return threading.get_ident()
+
+    loop_thread = run(main())
+    assert threads and loop_thread not in threads
+    backend.close()
+
+
+def test_save_generation_with_status(manager, preset):
+    """작업 모드: 결과 저장 전에 다시 저장해도 진행 상태가 유지됨"""
+    session_id = run(manager.create_session(preset))
+    run(manager.save_generation("generation-1", session_id, {"request": {}}, status="queued"))
+    assert run(manager.get_generation("generation-1"))["status"] == "queued"
+
+    run(manager.save_generation("generation-1", session_id, generation_metadata(), status="running"))
+    generation = run(manager.get_generation("generation-1"))
+    assert generation["status"] == "running"
+    assert generation["metadata"] == generation_metadata()
+    assert "result" not in generation
@@ -594,7 +594,7 @@ export default function GeneratePage() {
 
   const handleDownload = (image: GeneratedImage) => {
     // base64 데이터를 Blob으로 변환하여 다운로드
-    const byteCharacters = atob(image.base64);
+    const byteCharacters = atob(image.base64 ?? '');
     const byteNumbers = new Array(byteCharacters.length);
     for (let i = 0; i < byteCharacters.length; i++) {
       byteNumbers[i] = byteCharacters.charCodeAt(i);
@@ -688,7 +688,7 @@ export default function GeneratePage() {
             >
               <div className="rounded-[20px] bg-[#EEF3FF] overflow-hidden flex items-center justify-center w-full">
                 <img
-                  src={`data:image/png;base64,${image.base64}`}
+                  src={`data:image/png;base64,${image.base64 ?? ''}`}
                   alt={`Generated ${idx + 1}`}
                   className="w-full h-auto object-contain max-h-[600px]"
                 />
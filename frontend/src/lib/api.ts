@@ -6,6 +6,7 @@ import type {
   PresetCreateResponse,
   ImageGenerationRequest,
   ImageGenerationResponse,
+  LocationSuggestResponse,
 } from '@/types';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
@@ -57,6 +58,21 @@ class ApiClient {
     return response.json();
   }
 
+  /**
+   * 장소 자동완성
+   */
+  async suggestLocations(query: string, limit: number = 8): Promise<LocationSuggestResponse> {
+    const params = new URLSearchParams({ q: query, limit: String(limit) });
+    const response = await fetch(`${this.baseUrl}/api/locations/suggest?${params}`);
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || '장소 자동완성에 실패했습니다');
+    }
+
+    return response.json();
+  }
+
   /**
    * 이미지 URL 생성
    */
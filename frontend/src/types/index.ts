@@ -34,19 +34,48 @@ export interface ImageGenerationRequest {
   time_of_day: string;
   layout: string;
   ratio: string;
+  allow_partial?: boolean;  // 일부 실패 시에도 성공한 이미지 반환 (기본 false)
+  backfill_failed?: boolean;  // 실패한 이미지 백그라운드 재생성
+  response_mode?: 'base64' | 'url';  // url: base64 대신 다운로드 URL만 반환
+  use_cache?: boolean;  // 같은 입력의 이전 생성 결과 재사용
+  output_format?: 'png' | 'webp' | 'jpeg' | 'avif';  // 기본 png
+  quality?: 'master' | 'standard' | 'preview';  // 손실 압축 품질 단계
+  include_previews?: boolean;  // 썸네일을 먼저 받고 원본은 URL로 필요할 때 다운로드
 }
 
 export interface GeneratedImage {
+  image_id: string;
+  filename: string;
+  base64?: string | null;  // response_mode=base64
+  url?: string | null;  // response_mode=url
+  etag?: string | null;
+  size?: number | null;
+  content_type?: string | null;  // image/png, image/webp 등
+  seed: number;
+}
+
+export interface ImagePreview {
   image_id: string;
   filename: string;
   base64: string;
+  url: string;
+  content_type: string;
+  size: number;
+}
+
+export interface FailedImageSlot {
+  index: number;
   seed: number;
+  error: string;
+  backfill_pending: boolean;
 }
 
 export interface ImageGenerationResponse {
   generation_id: string;
   session_id: string;
+  previews?: ImagePreview[];  // include_previews=true
   images: GeneratedImage[];
+  failed_slots: FailedImageSlot[];
   prompts: {
     positive: string;
     negative: string;
@@ -62,6 +91,22 @@ export interface ImageGenerationResponse {
   };
 }
 
+export interface LocationSuggestion {
+  id: string;
+  display_name_en: string;
+  display_name_kr: string;
+  city_en: string;
+  country_en: string;
+  type: string;
+  priority: number;
+  matched_text: string;
+}
+
+export interface LocationSuggestResponse {
+  query: string;
+  suggestions: LocationSuggestion[];
+}
+
 // ============================================
 // 프론트엔드 상태 타입
 // ============================================